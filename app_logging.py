@@ -0,0 +1,150 @@
+import logging, threading, collections
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal, Qt
+
+# Buffered log records are delivered to the UI at most this often (10Hz)
+LOG_DRAIN_INTERVAL_MS = 100
+
+class LogBuffer(QObject):
+    """
+    Collects log records from any thread and hands them to the UI in batches.
+
+    emit() has the same (message, src, dest) signature as the signals it
+    replaces, plus optional fields stored with the log record. Records are appended to a list under a short lock; only the
+    first record after a drain wakes the UI thread, which then waits
+    LOG_DRAIN_INTERVAL_MS and emits everything collected as one batch.
+    Nothing runs while no records arrive.
+    """
+    batch_ready = pyqtSignal(list)  # [(message, src, dest, fields), ...]
+    _wakeup = pyqtSignal()
+
+    def __init__(self, interval_ms=LOG_DRAIN_INTERVAL_MS, parent=None):
+        super().__init__(parent)
+        self.lock = threading.Lock()
+        self.records = []
+        self.scheduled = False
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.drain)
+        # Queued so the timer is always started from the thread that owns it
+        self._wakeup.connect(self._schedule, Qt.QueuedConnection)
+
+    def emit(self, message, src=None, dest=None, fields=None):
+        """Add a record, callable from any thread"""
+        with self.lock:
+            self.records.append((message, src, dest, fields))
+            wake = not self.scheduled
+            self.scheduled = True
+        if wake:
+            self._wakeup.emit()
+
+    def _schedule(self):
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def drain(self):
+        """Deliver everything collected so far as one batch"""
+        self.timer.stop()
+        with self.lock:
+            batch, self.records = self.records, []
+            self.scheduled = False
+        if batch:
+            self.batch_ready.emit(batch)
+
+# Parent of every logger in the app
+LOGGER_NAME = "auto_organizer"
+
+# Levels selectable in the settings, by config value
+LOG_LEVELS = {
+    "error": logging.ERROR,
+    "warning": logging.WARNING,
+    "info": logging.INFO,
+    "debug": logging.DEBUG,
+}
+DEFAULT_LOG_LEVEL = "info"
+
+# Extra attributes of a log record that are stored with it in the Logs tab,
+# e.g. extra={"checksum": ...} for a verified copy
+RECORD_FIELDS = ("checksum",)
+
+# Most recent records kept per level for dump_recent()
+RING_BUFFER_SIZE = 500
+
+def get_logger(name):
+    """
+    Return the logger for a part of the app, e.g. get_logger("worker").
+
+    Messages use %-style arguments so nothing is formatted unless the level is
+    enabled: log.debug("Skipping %s", name) costs one level check when debug
+    logging is off. Pass extra={"src": ..., "dest": ...}
+    for file moves so the Logs tab can offer undo, and any of RECORD_FIELDS to
+    store them with the record.
+    """
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+class UILogHandler(logging.Handler):
+    """Forwards enabled records to a LogBuffer for the Logs tab"""
+
+    def __init__(self, log_buffer):
+        super().__init__()
+        self.log_buffer = log_buffer
+
+    def emit(self, record):
+        try:
+            message = record.getMessage()
+        except Exception:
+            self.handleError(record)
+            return
+        fields = {name: getattr(record, name) for name in RECORD_FIELDS if hasattr(record, name)}
+        self.log_buffer.emit(message, getattr(record, "src", None), getattr(record, "dest", None), fields or None)
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the most recent records of each level in memory, formatted only when dumped"""
+
+    def __init__(self, size=RING_BUFFER_SIZE):
+        super().__init__()
+        self.buffers = {level: collections.deque(maxlen=size) for level in LOG_LEVELS.values()}
+        self.setFormatter(logging.Formatter("%(asctime)s %(levelname)-7s %(name)s: %(message)s"))
+
+    def emit(self, record):
+        buffer = self.buffers.get(record.levelno)
+        if buffer is not None:
+            buffer.append(record)
+
+    def dump(self, stream, min_level=logging.DEBUG):
+        """Write the buffered records at min_level and above to stream, oldest first"""
+        records = [record for level, buffer in self.buffers.items() if level >= min_level for record in list(buffer)]
+        records.sort(key=lambda record: record.created)
+        for record in records:
+            stream.write(self.format(record) + "\n")
+        return len(records)
+
+_ring_buffer = None
+
+def setup_logging(log_buffer, level=DEFAULT_LOG_LEVEL):
+    """
+    Send app log records to the Logs tab and the in-memory ring buffer.
+
+    The level is set on the logger, so a disabled level costs one check and
+    the ring buffer only keeps messages of the enabled levels.
+    """
+    global _ring_buffer
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.propagate = False
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    _ring_buffer = RingBufferHandler()
+    logger.addHandler(UILogHandler(log_buffer))
+    logger.addHandler(_ring_buffer)
+    set_log_level(level)
+    return _ring_buffer
+
+def set_log_level(level):
+    """Set the lowest level that is generated, shown and kept, by config value"""
+    logging.getLogger(LOGGER_NAME).setLevel(LOG_LEVELS.get(level, LOG_LEVELS[DEFAULT_LOG_LEVEL]))
+
+def dump_recent(stream, min_level=logging.DEBUG):
+    """Write the most recent records kept in memory to stream. Returns the number written"""
+    if _ring_buffer is None:
+        return 0
+    return _ring_buffer.dump(stream, min_level)
@@ -205,7 +205,8 @@ a = Analysis(
         'webbrowser',
         'datetime',
         'watchdog.observers',
-        'watchdog.events'
+        'watchdog.events',
+        'folder_watchers'
     ],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,98 @@
+import os, json, shutil, traceback
+from PyQt5.QtCore import QTimer, QCoreApplication
+
+# Changes made within this time are written together
+CONFIG_SAVE_DELAY_MS = 1000
+
+def write_atomic(path, text):
+    """
+    Replace a file with text without ever leaving it half written: the text
+    goes to a temporary file that is flushed to disk and then renamed over
+    the target, so a crash leaves either the old or the new file.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+class ConfigStore:
+    """
+    Reads and writes the settings file.
+
+    schedule_save() waits CONFIG_SAVE_DELAY_MS so that several changes in a
+    row, like toggling checkboxes or editing the table, are written once.
+    Writes are atomic, see write_atomic(), and skipped when the settings are
+    the same as the file already holds. Pending changes are written when the
+    app quits.
+    """
+
+    def __init__(self, path, delay_ms=CONFIG_SAVE_DELAY_MS):
+        self.path = path
+        self.config = None  # Settings to write when the timer fires
+        self.saved_text = None  # Content of the file as last read or written
+        self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self.flush)
+        if QCoreApplication.instance() is not None:
+            QCoreApplication.instance().aboutToQuit.connect(self.flush)
+
+    def load(self):
+        """Return the settings in the file, {} if it is missing, empty or unreadable"""
+        if not os.path.exists(self.path):
+            print(f"Config file does not exist: {self.path}")
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except Exception as e:
+            print(f"Error reading config file: {str(e)}")
+            return {}
+        if not text.strip():
+            print("Config file is empty, using defaults")
+            return {}
+        try:
+            config = json.loads(text)
+        except ValueError as e:
+            print(f"Error: Config file {self.path} is corrupted: {str(e)}")
+            # Keep the corrupted file for inspection, it is replaced on the next save
+            try:
+                shutil.copy2(self.path, self.path + ".bak")
+                print(f"Backed up corrupted config to {self.path}.bak")
+            except Exception as backup_error:
+                print(f"Error backing up config: {str(backup_error)}")
+            return {}
+        self.saved_text = text
+        return config
+
+    def schedule_save(self, config):
+        """Write config soon, together with any other change made in the meantime"""
+        self.config = config
+        self.timer.start()
+
+    def save_now(self, config):
+        """Write config right away. Returns False if it could not be written"""
+        self.config = config
+        return self.flush()
+
+    def flush(self):
+        """Write the pending settings if they changed. Returns False on error"""
+        self.timer.stop()
+        if self.config is None:
+            return True
+        try:
+            text = json.dumps(self.config)
+            if text != self.saved_text:
+                write_atomic(self.path, text)
+                self.saved_text = text
+            self.config = None
+            return True
+        except Exception as e:
+            print(f"Error saving config file: {str(e)}")
+            print(f"Error details: {traceback.format_exc()}")
+            return False
@@ -0,0 +1,263 @@
+import os, sys, json, hashlib, argparse, time
+from concurrent.futures import ProcessPoolExecutor
+from app_logging import get_logger
+
+dedupe_log = get_logger("dedupe")
+
+# Directory holding one index file per target root
+INDEX_DIR = os.path.expanduser("~/.watcher_dedupe")
+
+# Dedupe modes understood by the file processor
+DEDUPE_OFF = "off"
+DEDUPE_HARDLINK = "hardlink"
+DEDUPE_DELETE = "delete"
+DEDUPE_MODES = (DEDUPE_OFF, DEDUPE_HARDLINK, DEDUPE_DELETE)
+
+# Number of bytes hashed from the head and tail of a file for the partial hash
+PARTIAL_HASH_BYTES = 64 * 1024
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Save the index after this many unsaved changes
+SAVE_EVERY = 50
+
+def new_hash():
+    """Hash used for file content everywhere in the app"""
+    return hashlib.blake2b(digest_size=20)
+
+def partial_hash(path, size=None):
+    """Hash the first and last PARTIAL_HASH_BYTES of a file"""
+    if size is None:
+        size = os.path.getsize(path)
+    h = new_hash()
+    with open(path, 'rb') as f:
+        if size <= PARTIAL_HASH_BYTES * 2:
+            # Small files are hashed whole, so the partial hash is also the full hash
+            h.update(f.read())
+        else:
+            h.update(f.read(PARTIAL_HASH_BYTES))
+            f.seek(-PARTIAL_HASH_BYTES, os.SEEK_END)
+            h.update(f.read(PARTIAL_HASH_BYTES))
+    return h.hexdigest()
+
+def full_hash(path):
+    """Hash the whole content of a file"""
+    h = new_hash()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _index_path_for(target_root):
+    """Return the index file used for a target root"""
+    key = hashlib.blake2b(os.path.normcase(os.path.abspath(target_root)).encode('utf-8'),
+                          digest_size=10).hexdigest()
+    return os.path.join(INDEX_DIR, f"{key}.json")
+
+class DuplicateIndex:
+    """
+    Persistent size -> partial hash -> full hash index of the files in a target root.
+
+    Hashes are only computed when two files share a size, so most files are
+    indexed by a single stat call. Entries are keyed by path relative to the
+    target root and are refreshed when the file's mtime changes.
+    """
+
+    def __init__(self, target_root, index_path=None):
+        self.target_root = os.path.abspath(target_root)
+        self.index_path = index_path or _index_path_for(self.target_root)
+        # {size: {relpath: [mtime, partial_hash or None, full_hash or None]}}
+        self.by_size = {}
+        self.unsaved_changes = 0
+        self.load()
+
+    def load(self):
+        """Load the index from disk, starting empty if it is missing or unreadable"""
+        self.by_size = {}
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("root") != self.target_root:
+                return
+            for size, entries in data.get("entries", {}).items():
+                self.by_size[int(size)] = {rel: list(info) for rel, info in entries.items()}
+        except Exception as e:
+            dedupe_log.warning("Error loading duplicate index %s, starting empty: %s", self.index_path, e)
+            self.by_size = {}
+
+    def save(self):
+        """Write the index to disk atomically"""
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            data = {
+                "version": 1,
+                "root": self.target_root,
+                "entries": {str(size): entries for size, entries in self.by_size.items() if entries}
+            }
+            tmp_path = self.index_path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.index_path)
+            self.unsaved_changes = 0
+        except Exception as e:
+            dedupe_log.error("Error saving duplicate index %s: %s", self.index_path, e)
+
+    def flush(self):
+        """Save the index if it has unsaved changes"""
+        if self.unsaved_changes:
+            self.save()
+
+    def _changed(self):
+        self.unsaved_changes += 1
+        if self.unsaved_changes >= SAVE_EVERY:
+            self.save()
+
+    def _relpath(self, path):
+        return os.path.relpath(os.path.abspath(path), self.target_root)
+
+    def add(self, path, size=None, partial=None, full=None):
+        """Record a file that now lives inside the target root"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        if size is None:
+            size = st.st_size
+        self.by_size.setdefault(size, {})[self._relpath(path)] = [st.st_mtime, partial, full]
+        self._changed()
+
+    def remove(self, path, size=None):
+        """Forget a file, e.g. after it was moved out of the target root"""
+        rel = self._relpath(path)
+        sizes = [size] if size is not None else list(self.by_size)
+        for s in sizes:
+            entries = self.by_size.get(s)
+            if entries and entries.pop(rel, None) is not None:
+                self._changed()
+                return
+
+    def _check_candidate(self, size, rel, info):
+        """Return the absolute path of an indexed file, dropping or resetting stale entries"""
+        abs_path = os.path.join(self.target_root, rel)
+        try:
+            mtime = os.stat(abs_path).st_mtime
+        except OSError:
+            # File was removed from the target outside of the app
+            del self.by_size[size][rel]
+            self._changed()
+            return None
+        if mtime != info[0]:
+            # File changed since it was hashed
+            info[:] = [mtime, None, None]
+            self._changed()
+        return abs_path
+
+    def find_duplicate(self, src, size=None):
+        """
+        Look for an indexed file with the same content as src.
+
+        Returns (duplicate_path or None, src_partial_hash, src_full_hash); the
+        source hashes are None when they did not need to be computed. Candidate
+        hashes are computed lazily and cached in the index.
+        """
+        if size is None:
+            size = os.path.getsize(src)
+        entries = self.by_size.get(size)
+        if not entries:
+            return None, None, None
+
+        src_partial = None
+        src_full = None
+        for rel, info in list(entries.items()):
+            abs_path = self._check_candidate(size, rel, info)
+            if abs_path is None:
+                continue
+            if os.path.normcase(abs_path) == os.path.normcase(os.path.abspath(src)):
+                continue
+
+            try:
+                if src_partial is None:
+                    src_partial = partial_hash(src, size)
+                if info[1] is None:
+                    info[1] = partial_hash(abs_path, size)
+                    self._changed()
+                if info[1] != src_partial:
+                    continue
+
+                if src_full is None:
+                    # Files no larger than the partial window are already fully hashed
+                    src_full = src_partial if size <= PARTIAL_HASH_BYTES * 2 else full_hash(src)
+                if info[2] is None:
+                    info[2] = info[1] if size <= PARTIAL_HASH_BYTES * 2 else full_hash(abs_path)
+                    self._changed()
+                if info[2] == src_full:
+                    return abs_path, src_partial, src_full
+            except OSError as e:
+                dedupe_log.warning("Error hashing duplicate candidate %s: %s", abs_path, e)
+                continue
+        return None, src_partial, src_full
+
+def _hash_entry(args):
+    """Process pool worker: hash one file for the offline build"""
+    path, size = args
+    try:
+        partial = partial_hash(path, size)
+        full = partial if size <= PARTIAL_HASH_BYTES * 2 else full_hash(path)
+        return path, partial, full
+    except OSError:
+        return path, None, None
+
+def build_index(target_root, workers=None, progress=print):
+    """Hash every file under target_root with a process pool and save the index"""
+    index = DuplicateIndex(target_root)
+    index.by_size = {}
+
+    files = []
+    for dirpath, dirnames, filenames in os.walk(index.target_root):
+        # Skip hidden and system folders
+        dirnames[:] = [d for d in dirnames if not d.startswith('.') and not d.startswith('$')]
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            files.append((path, st.st_size))
+            index.by_size.setdefault(st.st_size, {})[index._relpath(path)] = [st.st_mtime, None, None]
+
+    progress(f"Hashing {len(files)} files in {index.target_root}")
+    started = time.time()
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for (path, size), (_, partial, full) in zip(files, pool.map(_hash_entry, files, chunksize=16)):
+            done += 1
+            if partial is not None:
+                info = index.by_size[size][index._relpath(path)]
+                info[1], info[2] = partial, full
+            if done % 1000 == 0:
+                progress(f"Hashed {done}/{len(files)} files")
+
+    index.save()
+    progress(f"Indexed {len(files)} files in {time.time() - started:.1f}s -> {index.index_path}")
+    return index
+
+def main():
+    parser = argparse.ArgumentParser(description="Auto Organizer duplicate index tools")
+    subparsers = parser.add_subparsers(dest="command")
+    build = subparsers.add_parser("build", help="Hash an existing target folder into the duplicate index")
+    build.add_argument("target", help="Target folder to index")
+    build.add_argument("--workers", type=int, default=None, help="Number of hashing processes")
+    args = parser.parse_args()
+
+    if args.command != "build":
+        parser.print_help()
+        return 1
+    if not os.path.isdir(args.target):
+        print(f"Target folder does not exist: {args.target}")
+        return 1
+    build_index(args.target, workers=args.workers)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
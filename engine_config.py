@@ -0,0 +1,125 @@
+import os
+from app_logging import get_logger
+from dedupe_index import DEDUPE_OFF
+from file_ops import VERIFY_OFF
+from io_throttle import PRIORITY_NORMAL, PRIORITY_BACKFILL, PRIORITY_LOW
+
+config_log = get_logger("config")
+
+# Names starting with these are hidden or system files and never organized
+IGNORED_PREFIXES = ('.', '$')
+
+# Seconds between rescans of a pair without its own scan_interval
+DEFAULT_SCAN_INTERVAL = 5.0
+# Shortest scan_interval a pair profile can set
+MIN_SCAN_INTERVAL = 0.25
+
+# Queue priority of rescanned files by the "priority" of a pair profile
+PAIR_PRIORITIES = {
+    "high": PRIORITY_NORMAL,  # Same as real-time watcher events
+    "normal": PRIORITY_BACKFILL,
+    "low": PRIORITY_LOW,
+}
+
+def _age_limit(hours):
+    """Age limit in seconds for a max_file_age_hours setting, None for no limit"""
+    return hours * 3600 if hours and hours > 0 else None
+
+def _pair_key(path):
+    return os.path.normcase(os.path.abspath(path))
+
+class ReadOnly:
+    """Base for snapshots whose fields are set once in __init__ and never change"""
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only, build a new one instead")
+
+    def _init(self, **fields):
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+
+class PairConfig(ReadOnly):
+    """
+    One watch folder and the target folder its files are organized into,
+    with the settings of its profile: seconds between rescans, age limit,
+    whether folders are moved, how many of its files the worker takes per
+    batch (0 for no limit) and the queue priority of its rescans.
+    """
+    __slots__ = ("watch", "target", "scan_interval", "max_age_seconds", "process_directories",
+                 "concurrency", "priority")
+
+    def __init__(self, watch, target, scan_interval=DEFAULT_SCAN_INTERVAL, max_age_seconds=None,
+                 process_directories=True, concurrency=0, priority=PRIORITY_BACKFILL):
+        self._init(watch=watch, target=target, scan_interval=scan_interval, max_age_seconds=max_age_seconds,
+                   process_directories=process_directories, concurrency=concurrency, priority=priority)
+
+    @classmethod
+    def from_profile(cls, watch, target, profile, max_age_seconds, process_directories):
+        """Pair with the settings of a pair_profiles entry, the global settings where it has none"""
+        try:
+            scan_interval = max(MIN_SCAN_INTERVAL, float(profile.get("scan_interval", DEFAULT_SCAN_INTERVAL)))
+            if "max_file_age_hours" in profile:
+                max_age_seconds = _age_limit(float(profile["max_file_age_hours"]))
+            process_directories = bool(profile.get("process_directories", process_directories))
+            concurrency = max(0, int(profile.get("concurrency", 0)))
+            priority = PAIR_PRIORITIES[profile.get("priority", "normal")]
+        except (TypeError, ValueError, KeyError, AttributeError) as e:
+            config_log.warning("Invalid profile for watch folder %s, using the global settings: %s", watch, e)
+            return cls(watch, target, max_age_seconds=max_age_seconds, process_directories=process_directories)
+        return cls(watch, target, scan_interval, max_age_seconds, process_directories, concurrency, priority)
+
+class EngineConfig(ReadOnly):
+    """
+    Settings the scanner and the file worker run with, as one read-only
+    snapshot.
+
+    Built from the config dict whenever the settings or the watch pairs
+    change, and swapped in by replacing the reference, so a scan or a batch
+    that took the snapshot sees one consistent set of settings without
+    touching the settings widgets or the config dict. Values are converted
+    up front, e.g. the age limit is in seconds and is None when there is no
+    limit. Each pair carries its own settings, from "pair_profiles" in the
+    config (keyed by watch folder) or else the global ones.
+    """
+    __slots__ = ("pairs", "pairs_by_folders", "process_directories", "max_age_seconds", "dedupe_mode",
+                 "verify_mode")
+
+    def __init__(self, pairs=(), process_directories=True, max_age_seconds=None,
+                 dedupe_mode=DEDUPE_OFF, verify_mode=VERIFY_OFF):
+        pairs = tuple(pairs)
+        self._init(pairs=pairs, pairs_by_folders={(pair.watch, pair.target): pair for pair in pairs},
+                   process_directories=process_directories, max_age_seconds=max_age_seconds,
+                   dedupe_mode=dedupe_mode, verify_mode=verify_mode)
+
+    @classmethod
+    def from_config(cls, config):
+        """Snapshot of a config dict; pairs missing a folder are left out"""
+        max_age_seconds = _age_limit(config.get("max_file_age_hours", 24))
+        process_directories = bool(config.get("process_directories", True))
+        profiles = {_pair_key(watch): profile for watch, profile in (config.get("pair_profiles") or {}).items()}
+        pairs = []
+        for watch, target in config.get("watch_pairs", []):
+            if not watch or not target:
+                continue
+            profile = profiles.get(_pair_key(watch))
+            if profile is None:
+                pairs.append(PairConfig(watch, target, max_age_seconds=max_age_seconds,
+                                        process_directories=process_directories))
+            else:
+                pairs.append(PairConfig.from_profile(watch, target, profile, max_age_seconds, process_directories))
+        return cls(
+            pairs=pairs,
+            process_directories=process_directories,
+            max_age_seconds=max_age_seconds,
+            dedupe_mode=config.get("dedupe_mode", DEDUPE_OFF),
+            verify_mode=config.get("verify_mode", VERIFY_OFF),
+        )
+
+    def pair_for(self, watch, target):
+        """Settings of the pair a queued file came from, None if it was removed since"""
+        return self.pairs_by_folders.get((watch, target))
+
+    def watch_pairs(self):
+        """Pairs as (watch, target) tuples, for the folder watchers"""
+        return [(pair.watch, pair.target) for pair in self.pairs]
@@ -0,0 +1,218 @@
+import os, errno, shutil, threading
+from dedupe_index import new_hash
+
+# Copy verification modes
+VERIFY_OFF = "off"
+VERIFY_SAMPLED = "sampled"
+VERIFY_FULL = "full"
+VERIFY_MODES = (VERIFY_OFF, VERIFY_SAMPLED, VERIFY_FULL)
+
+COPY_CHUNK_SIZE = 1024 * 1024
+# Chunks re-read from the destination by the sampled verify tier,
+# in addition to the first and last chunk
+SAMPLED_CHUNKS = 8
+
+# Filesystem calls os.makedirs(path, exist_ok=True) makes when path already
+# exists: exists() on the parent, a failing mkdir() and isdir() on the path
+MAKEDIRS_CALLS_WHEN_EXISTING = 3
+
+class DirectoryCache:
+    """
+    Per-target cache of destination directories known to exist.
+
+    ensure() only calls os.makedirs the first time a directory is seen, which
+    saves several round-trips per file on network shares. Entries are dropped
+    by invalidate() when the target reports a deletion or a move fails with
+    ENOENT, so a stale entry costs at most one failed move.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.known = {}  # {target key: set of directory keys}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _key(path):
+        return os.path.normcase(os.path.abspath(path))
+
+    @staticmethod
+    def _prefix(key):
+        """Start of every key below key, with a trailing separator so "Photos Old" is not below "Photos" """
+        return key.rstrip(os.sep) + os.sep
+
+    def ensure(self, target, path):
+        """Make sure path exists, skipping the filesystem when it is already known"""
+        target_key = self._key(target)
+        key = self._key(path)
+        with self.lock:
+            known = self.known.setdefault(target_key, set())
+            if key in known:
+                self.hits += 1
+                return
+            self.misses += 1
+
+        os.makedirs(path, exist_ok=True)
+
+        # Every directory between the target and path exists now
+        target_prefix = self._prefix(target_key)
+        with self.lock:
+            known = self.known.setdefault(target_key, set())
+            while key not in known and key.startswith(target_prefix):
+                known.add(key)
+                parent = os.path.dirname(key)
+                if parent == key:
+                    break
+                key = parent
+
+    def invalidate(self, path=None, target=None):
+        """Forget path and everything below it, or a whole target, or everything"""
+        with self.lock:
+            if path is None:
+                if target is None:
+                    self.known.clear()
+                else:
+                    self.known.pop(self._key(target), None)
+                self.invalidations += 1
+                return
+
+            key = self._key(path)
+            prefix = self._prefix(key)
+            for target_key, known in self.known.items():
+                if key != target_key and not key.startswith(self._prefix(target_key)):
+                    continue
+                if key == target_key:
+                    # The target folder itself went away
+                    known.clear()
+                    self.invalidations += 1
+                    continue
+                # Most deletions in a target are files, which are never cached
+                if key not in known:
+                    continue
+                known.difference_update([k for k in known if k == key or k.startswith(prefix)])
+                self.invalidations += 1
+
+    def saved_calls(self):
+        """Estimated filesystem calls avoided by cache hits"""
+        return self.hits * MAKEDIRS_CALLS_WHEN_EXISTING
+
+    def summary(self):
+        return (f"Directory cache: {self.hits} hits, {self.misses} misses, "
+                f"{self.invalidations} invalidations, ~{self.saved_calls()} filesystem calls saved")
+
+class VerifyError(Exception):
+    """Raised when a copied file does not match its source"""
+
+def _sample_chunks(size):
+    """Chunk indexes checked by the sampled verify tier"""
+    count = (size + COPY_CHUNK_SIZE - 1) // COPY_CHUNK_SIZE
+    if count <= SAMPLED_CHUNKS + 2:
+        return set(range(count))
+    step = count / (SAMPLED_CHUNKS + 1)
+    return {0, count - 1} | {int(step * i) for i in range(1, SAMPLED_CHUNKS + 1)}
+
+def copy_with_checksum(src, dest, samples=()):
+    """
+    Copy src to dest, hashing the bytes as they are copied.
+
+    Returns (checksum, size, sample_checksum) where sample_checksum covers the
+    chunk indexes in samples, so the destination can be verified without
+    reading the source a second time.
+    """
+    file_hash = new_hash()
+    sample_hash = new_hash()
+    size = 0
+    with open(src, 'rb') as fsrc, open(dest, 'wb') as fdest:
+        index = 0
+        while True:
+            chunk = fsrc.read(COPY_CHUNK_SIZE)
+            if not chunk:
+                break
+            file_hash.update(chunk)
+            if index in samples:
+                sample_hash.update(chunk)
+            fdest.write(chunk)
+            size += len(chunk)
+            index += 1
+        fdest.flush()
+        # Make sure the data reached the destination before it is read back
+        os.fsync(fdest.fileno())
+        drop_cached_pages(fdest.fileno())
+    return file_hash.hexdigest(), size, sample_hash.hexdigest()
+
+def drop_cached_pages(fd):
+    """
+    Ask the OS to drop the cached pages of a synced file, so the next read
+    comes from the disk instead of memory. Only done where posix_fadvise
+    exists; on Windows the read-back is served from the cache.
+    """
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+
+def hash_file_chunks(path, samples=None):
+    """Hash a whole file, or only the chunk indexes in samples"""
+    h = new_hash()
+    with open(path, 'rb') as f:
+        if samples is None:
+            for chunk in iter(lambda: f.read(COPY_CHUNK_SIZE), b''):
+                h.update(chunk)
+        else:
+            for index in sorted(samples):
+                f.seek(index * COPY_CHUNK_SIZE)
+                h.update(f.read(COPY_CHUNK_SIZE))
+    return h.hexdigest()
+
+def verified_move(src, dest, mode=VERIFY_FULL):
+    """
+    Move a file, verifying cross-device copies before the source is deleted.
+
+    Same-volume moves are plain renames and are not copied or verified.
+    Otherwise the file is copied to a temporary name next to dest while it
+    is hashed, then the copy is read back (fully, or only sampled chunks for
+    VERIFY_SAMPLED) and compared. The source is only removed on a match.
+
+    The read-back bypasses the page cache where drop_cached_pages() can;
+    elsewhere it may come from memory, which checks what was written but not
+    what the disk stored.
+    Returns the checksum of the copied content, or None for renames.
+    """
+    try:
+        os.rename(src, dest)
+        return None
+    except OSError as e:
+        # Only a cross-device move needs a copy
+        if e.errno != errno.EXDEV:
+            raise
+
+    size = os.path.getsize(src)
+    samples = _sample_chunks(size) if mode == VERIFY_SAMPLED else ()
+    temp_dest = dest + ".partial"
+    try:
+        checksum, copied, sample_checksum = copy_with_checksum(src, temp_dest, samples)
+        if copied != size or os.path.getsize(temp_dest) != size:
+            raise VerifyError(f"Size mismatch copying {src}: expected {size} bytes, copied {copied}")
+
+        if mode == VERIFY_SAMPLED:
+            matches = hash_file_chunks(temp_dest, samples) == sample_checksum
+        else:
+            matches = hash_file_chunks(temp_dest) == checksum
+        if not matches:
+            raise VerifyError(f"Checksum mismatch copying {src} to {dest}")
+
+        shutil.copystat(src, temp_dest)
+        os.replace(temp_dest, dest)
+    except BaseException:
+        # Never leave a partial copy behind, the source is still intact
+        try:
+            if os.path.exists(temp_dest):
+                os.remove(temp_dest)
+        except OSError:
+            pass
+        raise
+
+    os.remove(src)
+    return checksum
@@ -0,0 +1,135 @@
+import os
+# watchdog is slow to import, watcher_app loads this module when watching
+# first starts, see load_folder_watchers()
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
+from app_logging import get_logger
+
+watcher_log = get_logger("watcher")
+
+class FileWatcher(FileSystemEventHandler):
+    """Watches for file system changes and processes files immediately"""
+
+    def __init__(self, watch_dir, target_dir, file_queue):
+        super().__init__()  # Add super() call to properly initialize FileSystemEventHandler
+        self.watch_dir = watch_dir
+        self.target_dir = target_dir
+        self.file_queue = file_queue
+        self.observer = Observer()
+        self.observer.schedule(self, watch_dir, recursive=False)
+        self.processed_files = set()  # Track processed files to avoid duplicates
+
+    def start(self):
+        """Start watching the directory"""
+        if not self.observer.is_alive():
+            self.observer.start()
+            watcher_log.info("Started watching %s", self.watch_dir)
+
+    def stop(self):
+        """Stop watching the directory"""
+        if self.observer.is_alive():
+            self.observer.stop()
+            self.observer.join()
+            watcher_log.info("Stopped watching %s", self.watch_dir)
+
+    def on_created(self, event):
+        """Handle file creation events"""
+        if event.is_directory:
+            return
+        self._process_file(event.src_path)
+
+    def on_modified(self, event):
+        """Handle file modification events"""
+        if event.is_directory:
+            return
+        self._process_file(event.src_path)
+
+    def on_moved(self, event):
+        """Handle file move/rename events"""
+        if event.is_directory:
+            return
+        # Process the destination path since that's where the file ended up
+        self._process_file(event.dest_path)
+
+    def _process_file(self, file_path):
+        """Process a single file"""
+        try:
+            # Get just the filename
+            filename = os.path.basename(file_path)
+
+            # Create a unique identifier for this file event
+            file_id = f"{filename}_{os.path.getmtime(file_path)}"
+
+            # Skip if we've already processed this exact file event
+            if file_id in self.processed_files:
+                return
+
+            # Skip system files and files without commas
+            if filename.startswith('.') or filename.startswith('$'):
+                watcher_log.debug("Skipping system file: %s", filename)
+                return
+
+            if ',' not in filename:
+                watcher_log.debug("Skipping file without comma: %s", filename)
+                return
+
+            # Basic validation before queueing
+            try:
+                prefix, remainder = filename.split(',', 1)
+                prefix = prefix.strip()
+                remainder = remainder.strip()
+                if not prefix or not remainder:
+                    watcher_log.debug("Skipping file - invalid format (empty prefix or name): %s", filename)
+                    return
+            except:
+                watcher_log.debug("Skipping file - error splitting filename: %s", filename)
+                return
+
+            # Add to processed files set to avoid duplicates
+            self.processed_files.add(file_id)
+
+            # Limit the size of processed_files set
+            if len(self.processed_files) > 1000:
+                self.processed_files.clear()
+
+            # Queue the file for processing
+            if os.path.exists(file_path):  # Double check file still exists
+                watcher_log.info("Detected new file: %s", filename)
+                self.file_queue.put((filename, file_path, self.watch_dir, self.target_dir, None))
+
+        except Exception as e:
+            watcher_log.error("Error processing file %s: %s", file_path, e)
+
+    def __del__(self):
+        """Ensure observer is stopped when the watcher is destroyed"""
+        try:
+            if hasattr(self, 'observer'):
+                self.stop()
+        except:
+            pass
+
+class TargetWatcher(FileSystemEventHandler):
+    """Watches target folders for deletions so cached destination folders stay valid"""
+
+    def __init__(self, target_dirs, dir_cache):
+        super().__init__()
+        self.dir_cache = dir_cache
+        self.observer = Observer()
+        for target_dir in target_dirs:
+            self.observer.schedule(self, target_dir, recursive=True)
+
+    def start(self):
+        if not self.observer.is_alive():
+            self.observer.start()
+
+    def stop(self):
+        if self.observer.is_alive():
+            self.observer.stop()
+            self.observer.join()
+
+    def on_deleted(self, event):
+        # Deleted folders are not always reported as directories, the cache ignores files
+        self.dir_cache.invalidate(event.src_path)
+
+    def on_moved(self, event):
+        self.dir_cache.invalidate(event.src_path)
@@ -0,0 +1,53 @@
+from PyQt5.QtCore import QTimer
+
+# Every repeating timer of the app, by name, for wakeup_report()
+PERIODIC_TIMERS = []
+
+# Things that wake the app repeatedly without a repeating timer, for wakeup_report()
+WAKEUP_SOURCES = []
+
+def periodic_timer(name, parent=None):
+    """
+    Create a repeating QTimer and register it under name.
+
+    Each active repeating timer wakes the CPU at its rate even while the app
+    sits idle in the tray, so every one goes through here and shows up in
+    wakeup_report(). One-shot timers (debounces, delayed saves) only run
+    after something happened and are not listed.
+    """
+    timer = QTimer(parent)
+    PERIODIC_TIMERS.append((name, timer))
+    return timer
+
+def wakeup_source(name, per_minute):
+    """
+    Register something that keeps re-arming a one-shot timer, e.g. a
+    scheduler, under name. per_minute() returns how often it currently wakes
+    the app, 0 while it is stopped.
+    """
+    WAKEUP_SOURCES.append((name, per_minute))
+
+def wakeup_report():
+    """Return lines listing every periodic timer, its interval and whether it runs, and the total rate"""
+    lines = []
+    per_minute = 0.0
+    for name, timer in PERIODIC_TIMERS:
+        try:
+            active = timer.isActive()
+            interval = timer.interval()
+        except RuntimeError:
+            continue  # Deleted along with its parent
+        if not active:
+            lines.append(f"{name}: stopped")
+            continue
+        per_minute += 60000 / max(interval, 1)
+        lines.append(f"{name}: every {interval / 1000:g}s")
+    for name, source in WAKEUP_SOURCES:
+        rate = source()
+        if not rate:
+            lines.append(f"{name}: stopped")
+            continue
+        per_minute += rate
+        lines.append(f"{name}: up to {rate:.2f} per minute")
+    lines.append(f"Idle wakeups: {per_minute:.2f} per minute")
+    return lines
@@ -0,0 +1,218 @@
+import os, sys, time, threading, itertools, platform, heapq
+from queue import Empty
+from app_logging import get_logger
+
+throttle_log = get_logger("throttle")
+
+# Queue priorities, lower values are processed first
+PRIORITY_INTERACTIVE = 0  # "Organize Now" and the scan when watching is started
+PRIORITY_NORMAL = 1       # Real-time watcher events
+PRIORITY_BACKFILL = 2     # Initial scan and periodic rescans
+PRIORITY_LOW = 3          # Rescans of pairs set to low priority
+
+class FileQueue:
+    """
+    Priority queue for file processing items.
+
+    Items are the same tuples the worker always used; put() takes an optional
+    priority and items with equal priority keep their insertion order.
+
+    Each source path is queued at most once: putting a file that is already
+    waiting does nothing, or moves it up if the new priority is higher. So
+    rescans, watcher events and items put back by the worker never pile up
+    copies of the same file. A None item (the worker's stop wakeup) is
+    always queued.
+    """
+
+    def __init__(self):
+        self._heap = []  # (priority, sequence, item), may hold superseded entries
+        self._counter = itertools.count()
+        self._pending = {}  # Source path -> (priority, sequence) of its queued entry
+        self._wakeups = 0  # None items in the heap
+        self._not_empty = threading.Condition()
+
+    def put(self, item, priority=PRIORITY_NORMAL):
+        """Queue item. Returns False if its file was already waiting at the same or a higher priority"""
+        with self._not_empty:
+            sequence = next(self._counter)
+            if item is None:
+                self._wakeups += 1
+            else:
+                queued = self._pending.get(item[1])
+                if queued is not None and queued[0] <= priority:
+                    return False
+                # A lower priority entry left in the heap is skipped by get
+                self._pending[item[1]] = (priority, sequence)
+            heapq.heappush(self._heap, (priority, sequence, item))
+            self._not_empty.notify()
+            return True
+
+    def is_pending(self, src, priority=None):
+        """Whether the file at src is waiting in the queue, at priority or higher if given"""
+        with self._not_empty:
+            queued = self._pending.get(src)
+            return queued is not None and (priority is None or queued[0] <= priority)
+
+    def get_with_priority(self, block=True, timeout=None):
+        """Return (priority, item) for the next item, raising queue.Empty like queue.Queue"""
+        with self._not_empty:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while True:
+                while self._heap:
+                    priority, sequence, item = heapq.heappop(self._heap)
+                    if item is None:
+                        self._wakeups -= 1
+                        return priority, None
+                    if self._pending.get(item[1]) == (priority, sequence):
+                        del self._pending[item[1]]
+                        return priority, item
+                if not block:
+                    raise Empty
+                if deadline is None:
+                    self._not_empty.wait()
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise Empty
+                    self._not_empty.wait(remaining)
+
+    def get(self, block=True, timeout=None):
+        return self.get_with_priority(block, timeout)[1]
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def empty(self):
+        return self.qsize() == 0
+
+    def qsize(self):
+        with self._not_empty:
+            return len(self._pending) + self._wakeups
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. rate is tokens per second, 0 means unlimited.
+
+    Requests larger than the bucket are allowed to go into debt so a single
+    big file is never refused; the caller then waits until the debt is repaid.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.lock = threading.Lock()
+        self.configure(rate, burst)
+
+    def configure(self, rate, burst=None):
+        with self.lock:
+            self.rate = max(0, rate or 0)
+            self.capacity = burst if burst else self.rate
+            self.tokens = self.capacity
+            self.updated = time.monotonic()
+
+    def reserve(self, amount):
+        """Take amount tokens and return how long the caller must wait"""
+        with self.lock:
+            if not self.rate:
+                return 0.0
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= amount
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    def consume(self, amount, should_continue=None):
+        """Block until amount tokens are available. Returns the time spent waiting"""
+        wait = self.reserve(amount)
+        waited = wait
+        # Sleep in short steps so a stopping worker is not held up
+        while wait > 0:
+            if should_continue is not None and not should_continue():
+                break
+            step = min(wait, 0.25)
+            time.sleep(step)
+            wait -= step
+        return waited
+
+class TargetRateLimiter:
+    """
+    Bytes/sec and operations/sec limits for moves into each target folder.
+
+    Limits come from the config: io_bytes_per_sec and io_ops_per_sec are the
+    defaults and target_io_limits maps a target folder to its own
+    {"bytes_per_sec": ..., "ops_per_sec": ...}. 0 means unlimited.
+    """
+
+    def __init__(self, config=None):
+        self.lock = threading.Lock()
+        self.buckets = {}
+        self.default_limits = (0, 0)
+        self.target_limits = {}
+        self.configure(config or {})
+
+    def configure(self, config):
+        """Apply limits from the application config"""
+        default_limits = (config.get("io_bytes_per_sec", 0) or 0, config.get("io_ops_per_sec", 0) or 0)
+        target_limits = {}
+        for target, limits in (config.get("target_io_limits") or {}).items():
+            target_limits[os.path.normcase(os.path.abspath(target))] = (
+                limits.get("bytes_per_sec", default_limits[0]) or 0,
+                limits.get("ops_per_sec", default_limits[1]) or 0
+            )
+        with self.lock:
+            self.default_limits = default_limits
+            self.target_limits = target_limits
+            # Buckets are rebuilt with the new rates on next use
+            self.buckets = {}
+
+    def is_limited(self, target):
+        return any(self._limits_for(os.path.normcase(os.path.abspath(target))))
+
+    def _limits_for(self, key):
+        return self.target_limits.get(key, self.default_limits)
+
+    def _buckets_for(self, target):
+        key = os.path.normcase(os.path.abspath(target))
+        with self.lock:
+            buckets = self.buckets.get(key)
+            if buckets is None:
+                bytes_rate, ops_rate = self._limits_for(key)
+                buckets = (TokenBucket(bytes_rate), TokenBucket(ops_rate))
+                self.buckets[key] = buckets
+            return buckets
+
+    def acquire(self, target, nbytes=0, should_continue=None):
+        """Wait until one operation moving nbytes into target is allowed"""
+        bytes_bucket, ops_bucket = self._buckets_for(target)
+        waited = ops_bucket.consume(1, should_continue)
+        if nbytes:
+            waited += bytes_bucket.consume(nbytes, should_continue)
+        return waited
+
+def set_current_thread_background():
+    """
+    Lower the CPU and I/O priority of the calling thread.
+
+    Windows uses THREAD_MODE_BACKGROUND_BEGIN which lowers CPU, disk and
+    memory priority together. Linux sets the idle I/O class and nice 10 for
+    the thread. Other platforms are left unchanged.
+    """
+    try:
+        if platform.system() == 'Windows':
+            import ctypes
+            THREAD_MODE_BACKGROUND_BEGIN = 0x00010000
+            kernel32 = ctypes.windll.kernel32
+            return bool(kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_MODE_BACKGROUND_BEGIN))
+
+        if sys.platform.startswith('linux'):
+            import ctypes
+            tid = threading.get_native_id()
+            os.setpriority(os.PRIO_PROCESS, tid, 10)
+
+            # ioprio_set(IOPRIO_WHO_PROCESS, tid, IOPRIO_CLASS_IDLE << 13)
+            SYS_ioprio_set = {'x86_64': 251, 'aarch64': 30, 'i686': 289}.get(platform.machine())
+            if SYS_ioprio_set is not None:
+                libc = ctypes.CDLL(None, use_errno=True)
+                libc.syscall(SYS_ioprio_set, 1, tid, 3 << 13)
+            return True
+    except Exception as e:
+        throttle_log.warning("Could not lower worker thread priority: %s", e)
+    return False
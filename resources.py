@@ -0,0 +1,133 @@
+import os, sys, threading
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QIcon, QImageReader, QPixmap
+from app_logging import get_logger
+
+resource_log = get_logger("resources")
+
+# Icons shown at startup: the window and tray icon, the tab icons and the update button
+STARTUP_ICONS = (
+    "icons/icon.ico", "icons/watch.png", "icons/settings.png", "icons/logs.png", "icons/info.png",
+    "icons/update.png",
+)
+
+# Larger icon images are scaled down to this size once, when they are read
+ICON_MAX_SIZE = 256
+
+_lock = threading.Lock()
+_base_path = None
+_exists = {}  # Relative path -> whether the resource exists
+_icons = {}  # (icon path, fallback) -> QIcon, used on the main thread only
+_images = {}  # File path -> images read from it
+_loading = {}  # File path -> Event set when its preload finished
+
+def resource_base_path():
+    """Folder resources are loaded from, in both development and PyInstaller modes"""
+    global _base_path
+    if _base_path is None:
+        # PyInstaller creates a temp folder and stores path in _MEIPASS
+        _base_path = getattr(sys, '_MEIPASS', None) or os.path.abspath(".")
+        resource_log.debug("Loading resources from %s", _base_path)
+    return _base_path
+
+def get_resource_path(relative_path):
+    """Get the correct resource path in both development and PyInstaller modes"""
+    return os.path.join(resource_base_path(), relative_path)
+
+def resource_exists(relative_path):
+    """Whether a resource exists, checked once per path"""
+    exists = _exists.get(relative_path)
+    if exists is None:
+        exists = _exists[relative_path] = os.path.exists(get_resource_path(relative_path))
+    return exists
+
+def _icon_file(icon_path, fallback):
+    """File to load an icon from, the icons folder or the app icon instead if fallback, None if none exists"""
+    candidates = [icon_path]
+    if fallback:
+        candidates += [os.path.join("icons", os.path.basename(icon_path)), "icons/icon.ico"]
+    for candidate in candidates:
+        if resource_exists(candidate):
+            if candidate != icon_path:
+                resource_log.debug("Using %s for icon %s", candidate, icon_path)
+            return get_resource_path(candidate)
+    return None
+
+def _read_images(path):
+    """Read every image of an icon file, e.g. each size in an .ico. Safe on any thread"""
+    images = []
+    reader = QImageReader(path)
+    while True:
+        image = reader.read()
+        if image.isNull():
+            break
+        if image.width() > ICON_MAX_SIZE or image.height() > ICON_MAX_SIZE:
+            image = image.scaled(ICON_MAX_SIZE, ICON_MAX_SIZE, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        images.append(image)
+        if not reader.jumpToNextImage():
+            break
+    if not images:
+        resource_log.warning("Could not read icon %s: %s", path, reader.errorString())
+    return images
+
+def _preload(path, done):
+    try:
+        images = _read_images(path)
+    except Exception as e:
+        resource_log.warning("Error preloading icon %s: %s", path, e)
+        images = []
+    with _lock:
+        _images[path] = images
+    done.set()
+
+def _images_for(path):
+    """Images of an icon file, waiting for its preload if one is running"""
+    with _lock:
+        done = _loading.get(path)
+    if done is not None:
+        done.wait()
+    with _lock:
+        images = _images.get(path)
+    if images is None:
+        images = _read_images(path)
+        with _lock:
+            _images[path] = images
+    return images
+
+def preload_icons(icon_paths=STARTUP_ICONS):
+    """
+    Read icon files on background threads, one per file, so that
+    safe_icon() only has to wrap the images when they are first shown.
+
+    Decoding the large PNGs is most of the cost of an icon. Only QImages
+    are made off the main thread, QIcons and QPixmaps are not thread safe.
+    """
+    for icon_path in icon_paths:
+        path = _icon_file(icon_path, True)
+        with _lock:
+            if path is None or path in _loading or path in _images:
+                continue
+            done = _loading[path] = threading.Event()
+        threading.Thread(target=_preload, args=(path, done), daemon=True).start()
+
+def safe_icon(icon_path, fallback=True):
+    """
+    Icon of a resource, loaded once and shared by the whole app.
+
+    With fallback, a missing icon is looked up in the icons folder and then
+    replaced by the app icon; without it, or if there is none, the icon is
+    empty. Call on the main thread.
+    """
+    key = (icon_path, fallback)
+    icon = _icons.get(key)
+    if icon is not None:
+        return icon
+    icon = QIcon()
+    path = _icon_file(icon_path, fallback)
+    if path is not None:
+        for image in _images_for(path):
+            icon.addPixmap(QPixmap.fromImage(image))
+    elif fallback:
+        resource_log.warning("No icon found for %s", icon_path)
+    _icons[key] = icon
+    return icon
@@ -0,0 +1,160 @@
+import os, json, time, heapq, random, threading, itertools
+
+# Files that ran out of retries, kept across restarts
+FAILED_FILES_FILE = os.path.expanduser("~/.watcher_failed_files.json")
+
+RETRY_BASE_DELAY = 5       # Seconds before the first retry
+RETRY_MAX_DELAY = 15 * 60  # Upper bound for the backoff
+RETRY_MAX_ATTEMPTS = 6     # Failed attempts before a file is given up on
+
+class RetryScheduler:
+    """
+    Schedules retries for files that could not be moved, e.g. while they are
+    locked by another program or a virus scanner.
+
+    Each failure doubles the file's delay (with jitter so files that failed
+    together do not retry together) until RETRY_MAX_ATTEMPTS is reached, after
+    which the file is added to the persisted failed files list. Waiting files
+    live in a heap ordered by due time, so between retries they cost nothing
+    but a peek at the heap's first entry.
+    """
+
+    def __init__(self, failed_files_path=FAILED_FILES_FILE, base_delay=RETRY_BASE_DELAY,
+                 max_delay=RETRY_MAX_DELAY, max_attempts=RETRY_MAX_ATTEMPTS):
+        self.lock = threading.Lock()
+        self.failed_files_path = failed_files_path
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self.heap = []  # (due time, sequence, src)
+        self.counter = itertools.count()
+        self.entries = {}  # {src: {"item", "priority", "attempts", "due", "error"}}
+        self.failed = {}  # {src: failed file record}
+        self.load_failed_files()
+
+    def delay_for(self, attempts):
+        """Backoff delay in seconds after the given number of failed attempts"""
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempts - 1)))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def schedule_failure(self, item, priority, error):
+        """
+        Record a failed attempt for a queue item.
+
+        Returns the delay until the next attempt, or None if the file has
+        used all its attempts and was added to the failed files list.
+        """
+        src = item[1]
+        with self.lock:
+            entry = self.entries.setdefault(src, {"attempts": 0})
+            entry["attempts"] += 1
+            entry["item"] = item
+            entry["priority"] = priority
+            entry["error"] = str(error)
+
+            if entry["attempts"] >= self.max_attempts:
+                del self.entries[src]
+                self.failed[src] = {
+                    "item": item[0],
+                    "source": src,
+                    "watch": item[2],
+                    "target": item[3],
+                    "attempts": entry["attempts"],
+                    "error": str(error),
+                    "failed_at": time.strftime("%Y-%m-%d %H:%M:%S")
+                }
+                changed = True
+                delay = None
+            else:
+                delay = self.delay_for(entry["attempts"])
+                entry["due"] = time.monotonic() + delay
+                heapq.heappush(self.heap, (entry["due"], next(self.counter), src))
+                changed = False
+
+        if changed:
+            self.save_failed_files()
+        return delay
+
+    def pop_due(self, now=None):
+        """Return [(item, priority)] for every retry that is due"""
+        if now is None:
+            now = time.monotonic()
+        due = []
+        with self.lock:
+            while self.heap and self.heap[0][0] <= now:
+                due_time, _, src = heapq.heappop(self.heap)
+                entry = self.entries.get(src)
+                # Skip heap entries that were replaced or cancelled
+                if entry is None or entry.get("due") != due_time:
+                    continue
+                entry["due"] = None
+                due.append((entry["item"], entry["priority"]))
+        return due
+
+    def seconds_until_next(self):
+        """Seconds until the next retry is due, None if nothing is waiting"""
+        with self.lock:
+            if not self.heap:
+                return None
+            return max(0.0, self.heap[0][0] - time.monotonic())
+
+    def is_waiting(self, src):
+        """True if src is waiting for a retry or has been given up on"""
+        with self.lock:
+            if src in self.failed:
+                return True
+            entry = self.entries.get(src)
+            return entry is not None and entry.get("due") is not None
+
+    def attempts(self, src):
+        with self.lock:
+            entry = self.entries.get(src)
+            return entry["attempts"] if entry else 0
+
+    def succeeded(self, src):
+        """Forget the retry history of a file that was moved or disappeared"""
+        with self.lock:
+            self.entries.pop(src, None)
+
+    def failed_files(self):
+        """Return the failed file records, most recent first"""
+        with self.lock:
+            return sorted(self.failed.values(), key=lambda r: r.get("failed_at", ""), reverse=True)
+
+    def release(self, src):
+        """Remove src from the failed files list and return its record so it can be queued again"""
+        with self.lock:
+            record = self.failed.pop(src, None)
+        if record is not None:
+            self.save_failed_files()
+        return record
+
+    def clear_failed_files(self):
+        with self.lock:
+            self.failed = {}
+        self.save_failed_files()
+
+    def load_failed_files(self):
+        """Load the failed files list, starting empty if it is missing or unreadable"""
+        self.failed = {}
+        if not os.path.exists(self.failed_files_path):
+            return
+        try:
+            with open(self.failed_files_path, 'r', encoding='utf-8') as f:
+                for record in json.load(f):
+                    self.failed[record["source"]] = record
+        except Exception as e:
+            print(f"Error loading failed files list: {str(e)}")
+            self.failed = {}
+
+    def save_failed_files(self):
+        """Write the failed files list atomically"""
+        try:
+            with self.lock:
+                records = list(self.failed.values())
+            tmp_path = self.failed_files_path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(records, f, indent=2)
+            os.replace(tmp_path, self.failed_files_path)
+        except Exception as e:
+            print(f"Error saving failed files list: {str(e)}")
@@ -0,0 +1,82 @@
+import heapq, itertools, time
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from idle_audit import wakeup_source
+
+class ScanScheduler(QObject):
+    """
+    Rescans every watch pair at its own scan_interval, driven by one timer.
+
+    Pairs wait in a heap ordered by when their next rescan is due. The
+    single-shot timer is always set for the earliest one, so an hourly
+    archive pair and a sub-second inbox pair together cost one wakeup per
+    rescan that is due and nothing in between, however many pairs there
+    are. scan_due is emitted with the PairConfig of each pair whose rescan
+    is due.
+    """
+    scan_due = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.heap = []  # (due time, sequence, pair), one entry per pair
+        self.counter = itertools.count()
+        self.running = False
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.run_due)
+        wakeup_source("Pair rescans", self.wakeups_per_minute)
+
+    def set_pairs(self, pairs):
+        """Use new pair settings, keeping when each pair with an unchanged interval is due"""
+        now = time.monotonic()
+        due = {(pair.watch, pair.target): (when, pair.scan_interval) for when, _, pair in self.heap}
+        self.heap = []
+        for pair in pairs:
+            when, interval = due.get((pair.watch, pair.target), (None, None))
+            if when is None or interval != pair.scan_interval:
+                when = now + pair.scan_interval
+            self.heap.append((when, next(self.counter), pair))
+        heapq.heapify(self.heap)
+        self._arm()
+
+    def start(self):
+        """Start rescanning, each pair one interval from now (the caller scans right away)"""
+        now = time.monotonic()
+        self.heap = [(now + pair.scan_interval, next(self.counter), pair) for _, _, pair in self.heap]
+        heapq.heapify(self.heap)
+        self.running = True
+        self._arm()
+
+    def stop(self):
+        self.running = False
+        self.timer.stop()
+
+    def is_running(self):
+        return self.running
+
+    def wakeups_per_minute(self):
+        """Rescans per minute of all pairs together, fewer when several fall due at once"""
+        if not self.running:
+            return 0
+        return sum(60 / pair.scan_interval for _, _, pair in self.heap)
+
+    def run_due(self):
+        """Emit scan_due for every pair that is due and schedule its next rescan"""
+        now = time.monotonic()
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            _, _, pair = heapq.heappop(self.heap)
+            due.append(pair)
+            heapq.heappush(self.heap, (now + pair.scan_interval, next(self.counter), pair))
+        self._arm()
+        for pair in due:
+            if not self.running:
+                break
+            self.scan_due.emit(pair)
+
+    def _arm(self):
+        """Set the timer for the earliest rescan"""
+        if not self.running or not self.heap:
+            self.timer.stop()
+            return
+        delay = max(0.0, self.heap[0][0] - time.monotonic())
+        self.timer.start(int(delay * 1000))
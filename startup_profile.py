@@ -0,0 +1,41 @@
+import sys, time, threading
+
+# Taken when watcher_app starts importing its modules, before anything else
+STARTED = time.perf_counter()
+
+# Print how long each startup phase took (--profile-startup)
+ENABLED = "--profile-startup" in sys.argv
+
+_lock = threading.Lock()
+_last = STARTED
+_milestones = set()
+
+def mark(phase):
+    """
+    Record that a startup phase just ended and, with --profile-startup,
+    print how long it took and the time since startup. Phases follow each
+    other on the main thread, so each one is timed from the previous mark.
+    """
+    global _last
+    if not ENABLED:
+        return
+    now = time.perf_counter()
+    with _lock:
+        took = now - _last
+        _last = now
+    print(f"[startup] {phase}: {took * 1000:.0f} ms (at {(now - STARTED) * 1000:.0f} ms)")
+
+def milestone(name):
+    """
+    Like mark() for things reached in the background, e.g. the first
+    organized file: prints the time since startup the first time name is
+    reached and does not end a phase. Can be called from any thread.
+    """
+    if not ENABLED:
+        return
+    now = time.perf_counter()
+    with _lock:
+        if name in _milestones:
+            return
+        _milestones.add(name)
+    print(f"[startup] {name} (at {(now - STARTED) * 1000:.0f} ms)")
@@ -1,10 +1,11 @@
-import os, json, urllib.request, webbrowser, sys
+import json
 from PyQt5.QtWidgets import (
     QLabel, QPushButton, QGroupBox, QVBoxLayout, QHBoxLayout, QMessageBox
 )
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QIcon, QFont
+from PyQt5.QtGui import QFont
 from tabs.base_tab import BaseTab
+from resources import safe_icon
 
 def load_version(version_file):
     """Load version from file"""
@@ -14,31 +15,10 @@ def load_version(version_file):
     except:
         return "v0.0.0"
 
-def get_resource_path(relative_path):
-    """Get the correct resource path in both development and PyInstaller modes"""
-    try:
-        # PyInstaller creates a temp folder and stores path in _MEIPASS
-        base_path = sys._MEIPASS
-    except Exception:
-        base_path = os.path.abspath(".")
-    
-    return os.path.join(base_path, relative_path)
-
-def safe_icon(icon_path):
-    """Create a QIcon object with fallback to empty icon if file doesn't exist"""
-    path = get_resource_path(icon_path)
-    print(f"Looking for icon: {icon_path} at path: {path}")
-    if os.path.exists(path):
-        print(f"Found icon: {path}")
-        return QIcon(path)
-    # If icon doesn't exist but icon.ico does, use that instead
-    ico_path = get_resource_path("icon.ico")
-    if os.path.exists(ico_path):
-        print(f"Using fallback icon: {ico_path}")
-        return QIcon(ico_path)
-    # Last resort - empty icon
-    print(f"No icon found, returning empty QIcon")
-    return QIcon()
+def open_url(url):
+    """Open url in the default browser, importing webbrowser only when a link is clicked"""
+    import webbrowser
+    webbrowser.open(url)
 
 class AboutTab(BaseTab):
     """About tab with version information and links"""
@@ -46,7 +26,21 @@ class AboutTab(BaseTab):
     def __init__(self, parent=None, version_file=None):
         super().__init__(parent)
         self.version_file = version_file
-        self.init_ui()
+        # Built the first time the tab is shown, it is not needed for the first paint
+        self.ui_built = False
+        self.version_label = None
+        self.auto_update_status_label = None
+        self.version = None
+        self.auto_update_enabled = None
+        
+    def showEvent(self, event):
+        """Build the tab the first time it is shown"""
+        if not self.ui_built:
+            self.ui_built = True
+            self.init_ui()
+            if self.auto_update_enabled is not None:
+                self.update_auto_update_status(self.auto_update_enabled)
+        super().showEvent(event)
         
     def init_ui(self):
         """Initialize the UI components"""
@@ -55,7 +49,7 @@ class AboutTab(BaseTab):
         version_layout = QVBoxLayout()
         
         # Load version from file
-        current_version = load_version(self.version_file) if self.version_file else "N/A"
+        current_version = self.version or (load_version(self.version_file) if self.version_file else "N/A")
         
         # Create a more prominent version display
         self.version_label = QLabel(f"Version: {current_version}")
@@ -99,7 +93,7 @@ class AboutTab(BaseTab):
         # GitHub link
         github_container = QHBoxLayout()
         github_btn = QPushButton("GitHub Repository")
-        github_btn.clicked.connect(lambda: webbrowser.open("https://github.com/EyadElshaer/Auto-Organize"))
+        github_btn.clicked.connect(lambda: open_url("https://github.com/EyadElshaer/Auto-Organize"))
         github_container.addStretch()
         github_container.addWidget(github_btn)
         github_container.addStretch()
@@ -111,18 +105,21 @@ class AboutTab(BaseTab):
         
     def update_version_display(self, version):
         """Update the displayed version"""
-        if hasattr(self, 'version_label') and self.version_label:
+        self.version = version
+        if self.version_label:
             self.version_label.setText(f"Version: {version}")
             
     def update_auto_update_status(self, enabled):
         """Update the auto-update status label"""
-        if hasattr(self, 'auto_update_status_label') and self.auto_update_status_label:
+        self.auto_update_enabled = enabled
+        if self.auto_update_status_label:
             status = "Enabled" if enabled else "Disabled"
             self.auto_update_status_label.setText(f"Automatic update check: {status}")
             
     def check_for_updates(self):
         """Check for updates from GitHub"""
         try:
+            import urllib.request  # Only needed here, kept off the startup path
             with urllib.request.urlopen("https://api.github.com/repos/EyadElshaer/Auto-Organize/releases/latest") as res:
                 data = json.load(res)
                 latest_version = data["tag_name"]
@@ -145,7 +142,7 @@ class AboutTab(BaseTab):
                     msg.setModal(True)
                     
                     if msg.exec_() == QMessageBox.Yes:
-                        webbrowser.open(data["html_url"])
+                        open_url(data["html_url"])
                 else:
                     QMessageBox.information(parent, "Up to Date", f"You're using the latest version ({current_version}).")
         except Exception as e:
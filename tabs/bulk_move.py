@@ -0,0 +1,119 @@
+import os, shutil, threading
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, pyqtSignal
+
+# Folders moved from at the same time by Undo All / Redo All
+BULK_MOVE_WORKERS = 4
+
+def check_move(source, destination):
+    """Whether a move can be made without overwriting anything. Returns an error message or None"""
+    if not os.path.exists(source):
+        return f"File not found at {source}"
+    if os.path.exists(destination):
+        return f"A file already exists at {destination}"
+    return None
+
+def move_file(source, destination):
+    """
+    Move one file, creating the destination folder. Returns an error message
+    or None. An existing file at destination is never replaced, shutil.move()
+    would overwrite it on POSIX.
+    """
+    try:
+        error = check_move(source, destination)
+        if error:
+            return error
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        shutil.move(source, destination)
+        return None
+    except Exception as e:
+        return str(e)
+
+class BulkMoveWorker(QObject):
+    """
+    Moves many files for Undo All / Redo All on a thread pool.
+
+    Moves are grouped by the folder the files are in. Each folder is handled
+    by one pool thread in order, so different folders (often on different
+    drives) are worked on in parallel while moves out of one folder stay
+    sequential. cancel() stops every thread before its next file.
+
+    An atomic batch, used for undo groups, either completes fully or is
+    rolled back: every move is checked before the first file is touched, and
+    if a move still fails or the batch is cancelled, the files already moved
+    are moved back the same way.
+    """
+    progress = pyqtSignal(int, int)  # Files done, total
+    rolling_back = pyqtSignal()
+    # {move index: error message or None} for the moves that stand, whether the
+    # batch was rolled back, {move index: error} for moves that could not be rolled back
+    finished = pyqtSignal(dict, bool, dict)
+
+    def __init__(self, moves, workers=BULK_MOVE_WORKERS, atomic=False):
+        super().__init__()
+        self.moves = moves  # [(source, destination)]
+        self.workers = workers
+        self.atomic = atomic
+        self.lock = threading.Lock()
+        self.results = {}
+        self.cancelled = False
+
+    def cancel(self):
+        """Stop before the next file, callable from any thread"""
+        self.cancelled = True
+
+    def run(self):
+        if self.atomic:
+            errors = {index: error for index, error in
+                      ((index, check_move(*move)) for index, move in enumerate(self.moves)) if error}
+            if errors:
+                self.finished.emit(errors, True, {})
+                return
+        self._run_moves(self.moves, self._move_group)
+
+        rollback_errors = {}
+        rolled_back = self.atomic and (self.cancelled or any(self.results.values()))
+        if rolled_back:
+            self.rolling_back.emit()
+            moved = [index for index, error in self.results.items() if error is None]
+            back = {index: (self.moves[index][1], self.moves[index][0]) for index in moved}
+            rollback_errors = self._run_moves(back, self._move_back_group)
+            # Only the moves that could not be undone stand
+            self.results = {index: error for index, error in self.results.items()
+                            if error is not None or index in rollback_errors}
+        self.finished.emit(self.results, rolled_back, rollback_errors)
+
+    def _run_moves(self, moves, move_group):
+        """Run move_group for the indexes of moves out of each folder, in parallel"""
+        groups = {}
+        items = moves.items() if isinstance(moves, dict) else enumerate(moves)
+        for index, (source, _) in items:
+            groups.setdefault(os.path.dirname(source), []).append(index)
+        results = {}
+        if not groups:
+            return results
+        with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(groups)))) as pool:
+            for errors in pool.map(move_group, groups.values()):
+                results.update(errors or {})
+        return results
+
+    def _move_group(self, indexes):
+        for index in indexes:
+            if self.cancelled:
+                return
+            source, destination = self.moves[index]
+            error = move_file(source, destination)
+            with self.lock:
+                self.results[index] = error
+                done = len(self.results)
+            self.progress.emit(done, len(self.moves))
+
+    def _move_back_group(self, indexes):
+        """Roll back moves of one folder, returning {index: error} for the files left where they are"""
+        errors = {}
+        for index in indexes:
+            source, destination = self.moves[index]
+            error = move_file(destination, source)
+            if error:
+                errors[index] = error
+        return errors
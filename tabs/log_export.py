@@ -0,0 +1,86 @@
+import os, csv, json
+from PyQt5.QtCore import QObject, pyqtSignal
+
+# Export formats by file extension, anything else is plain text
+EXPORT_FORMATS = {".json": "json", ".jsonl": "jsonl", ".csv": "csv"}
+
+# Fields written for each entry, in this order
+EXPORT_FIELDS = ["id", "timestamp", "message", "original_source", "original_destination",
+                 "current_location", "is_undone"]
+
+def export_format(path):
+    """Format for a file name, from its extension"""
+    return EXPORT_FORMATS.get(os.path.splitext(path)[1].lower(), "text")
+
+def write_export(records, f, fmt, cancelled=None):
+    """
+    Write records to an open text file as they arrive. Returns the number
+    written, or None if cancelled() returned True on the way.
+    """
+    count = 0
+    writer = None
+    if fmt == "json":
+        f.write("[")
+    elif fmt == "csv":
+        writer = csv.DictWriter(f, fieldnames=EXPORT_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+
+    for record in records:
+        if cancelled and cancelled():
+            return None
+        if fmt == "json":
+            f.write(("\n  " if count == 0 else ",\n  ") + json.dumps(record))
+        elif fmt == "jsonl":
+            f.write(json.dumps(record) + "\n")
+        elif fmt == "csv":
+            writer.writerow(record)
+        else:
+            f.write(f"[{record.get('timestamp', '')}] {record.get('message', '')}\n")
+        count += 1
+
+    if fmt == "json":
+        f.write("\n]\n" if count else "]\n")
+    return count
+
+class LogExportWorker(QObject):
+    """
+    Exports a time range of the log store to a file, on its own thread.
+
+    Records are streamed from LogStore.query(), which only reads the blocks
+    of the range, and written one at a time to a temporary file that
+    replaces the target once the export is complete.
+    """
+    progress = pyqtSignal(int, int)  # Blocks read, total
+    finished = pyqtSignal(int, str)  # Entries written, error message or "" (-1 entries if cancelled)
+
+    def __init__(self, log_store, path, start_ts, end_ts):
+        super().__init__()
+        self.log_store = log_store
+        self.path = path
+        self.start_ts = start_ts
+        self.end_ts = end_ts
+        self.cancelled = False
+
+    def cancel(self):
+        """Stop after the current record, callable from any thread"""
+        self.cancelled = True
+
+    def run(self):
+        tmp_path = self.path + ".tmp"
+        try:
+            records = self.log_store.query(self.start_ts, self.end_ts, progress=self.progress.emit, flush=False)
+            with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+                count = write_export(records, f, export_format(self.path), lambda: self.cancelled)
+            if count is None or count == 0:
+                os.remove(tmp_path)
+                self.finished.emit(-1 if count is None else 0, "")
+                return
+            os.replace(tmp_path, self.path)
+            self.finished.emit(count, "")
+        except Exception as e:
+            try:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            except OSError:
+                pass
+            self.finished.emit(0, str(e))
@@ -0,0 +1,440 @@
+import os, time, bisect
+from array import array
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyleOptionButton, QStyle, QApplication
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QDateTime, QEvent, QObject, pyqtSignal
+from PyQt5.QtGui import QColor
+
+# Log view columns
+COL_TIME = 0
+COL_MESSAGE = 1
+COL_STATUS = 2
+COL_ACTION = 3
+COLUMN_TITLES = ["Time", "Message", "", ""]
+
+# Paths checked per batch by a full verification
+VERIFY_BATCH_SIZE = 2000
+
+class LogEntry:
+    """A single log line, with the file locations needed for undo/redo"""
+    __slots__ = ("original_source", "original_destination", "current_location", "message",
+                 "is_undone", "record_id", "timestamp", "ts")
+
+    def __init__(self, message, source=None, destination=None, timestamp=None, is_undone=False, ts=None):
+        # Store original paths
+        self.original_source = source  # Where the file was originally from
+        self.original_destination = destination  # Where the file was moved to
+        self.current_location = destination  # Current location of the file
+        self.message = message
+        self.is_undone = is_undone
+        self.record_id = None  # Id of this entry in the log store
+        self.timestamp = timestamp or QDateTime.currentDateTime().toString("yyyy-MM-dd hh:mm:ss")
+        self.ts = time.time() if ts is None else ts  # Epoch seconds
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create an entry from a log store record"""
+        entry = cls(
+            message=data.get("message", ""),
+            source=data.get("original_source"),
+            destination=data.get("original_destination"),
+            timestamp=data.get("timestamp"),
+            is_undone=data.get("is_undone", False),
+            ts=data.get("ts", 0)
+        )
+        if entry.original_source and entry.original_destination:
+            entry.current_location = data.get("current_location")
+        entry.record_id = data.get("id")
+        return entry
+
+    def has_actions(self):
+        """Only file transfers, not undo/redo messages, can be undone"""
+        return _has_actions(self.message, self.original_source, self.original_destination)
+
+    def undo_destination(self):
+        """Where an undo moves the file: the original folder, keeping the current filename"""
+        return os.path.join(os.path.dirname(self.original_source), os.path.basename(self.current_location))
+
+    def redo_destination(self):
+        """Where a redo moves the file: the organized folder, keeping the current filename"""
+        return os.path.join(os.path.dirname(self.original_destination), os.path.basename(self.current_location))
+
+    def to_dict(self):
+        """Convert log entry to a dictionary for serialization"""
+        return {
+            "message": self.message,
+            "timestamp": self.timestamp,
+            "original_source": self.original_source,
+            "original_destination": self.original_destination,
+            "current_location": self.current_location,
+            "is_undone": self.is_undone,
+            "ts": self.ts
+        }
+
+def _has_actions(message, source, destination):
+    return bool(source and destination and "(Undo)" not in message and "(Redo)" not in message)
+
+class PathTable:
+    """
+    Stores each directory once. A path is kept as the index of its directory
+    plus its file name, and the file name object is shared between the
+    source, destination and current location when they are equal.
+    """
+
+    def __init__(self):
+        self.directories = []
+        self.indexes = {}  # {directory: index}
+
+    def split(self, path):
+        """Return (directory index, file name), (-1, None) for no path"""
+        if not path:
+            return -1, None
+        directory, name = os.path.split(path)
+        index = self.indexes.get(directory)
+        if index is None:
+            index = self.indexes[directory] = len(self.directories)
+            self.directories.append(directory)
+        return index, name
+
+    def join(self, index, name):
+        if index < 0:
+            return None
+        return os.path.join(self.directories[index], name)
+
+# In-memory columns of the log model, with their array type codes (None for lists)
+MODEL_COLUMNS = (
+    ("record_ids", "q"),
+    ("times", "q"),  # Epoch seconds
+    ("flags", "B"),
+    ("messages", None),
+    ("source_dirs", "l"), ("source_names", None),
+    ("destination_dirs", "l"), ("destination_names", None),
+    ("location_dirs", "l"), ("location_names", None),
+)
+
+# Bits of the flags column
+FLAG_UNDONE = 1
+
+class LogModel(QAbstractTableModel):
+    """
+    Table model over the log entries.
+
+    Entries are kept in columns rather than as one object per entry: ids,
+    epoch-second timestamps and flags in typed arrays, and paths as an index
+    into a PathTable of directories plus a shared file name. The Time column
+    is formatted only for the rows on screen. entry(row) builds a LogEntry
+    for a row; changes to it are written back with update_entry().
+
+    The model never touches the filesystem. File status comes from
+    FileStatusChecker results passed to apply_status() and is cached by path;
+    rows whose file has not been checked yet show no status.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.paths = PathTable()
+        self.status = {}  # {path: file exists}
+        self._reset_columns()
+
+    def _reset_columns(self):
+        for name, typecode in MODEL_COLUMNS:
+            setattr(self, name, array(typecode) if typecode else [])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.record_ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMN_TITLES)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return COLUMN_TITLES[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        column = index.column()
+
+        if role == Qt.DisplayRole:
+            if column == COL_TIME:
+                return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.times[row]))
+            if column == COL_MESSAGE:
+                return self.messages[row]
+            if column == COL_STATUS:
+                exists = self.file_exists(row)
+                if exists is None:
+                    return ""
+                return "✓" if exists else "✗"
+            if column == COL_ACTION:
+                if not self.has_actions(row):
+                    return ""
+                return "Redo" if self.flags[row] & FLAG_UNDONE else "Undo"
+        elif role == Qt.ForegroundRole and column == COL_STATUS:
+            exists = self.file_exists(row)
+            if exists is not None:
+                return QColor("green") if exists else QColor("red")
+        elif role == Qt.ToolTipRole and column == COL_MESSAGE:
+            source = self.paths.join(self.source_dirs[row], self.source_names[row])
+            if source and self.destination_dirs[row] >= 0:
+                return f"{self.messages[row]}\nFrom: {source}\nNow: {self.location(row)}"
+            return self.messages[row]
+        elif role == Qt.TextAlignmentRole and column in (COL_STATUS, COL_ACTION):
+            return Qt.AlignCenter
+        return None
+
+    def location(self, row):
+        """Current location of the file of a row, None for plain messages"""
+        return self.paths.join(self.location_dirs[row], self.location_names[row])
+
+    def has_actions(self, row):
+        return _has_actions(self.messages[row], self.source_dirs[row] >= 0, self.destination_dirs[row] >= 0)
+
+    def file_exists(self, row):
+        """Whether the file of a row is at its current location, None if unknown or a plain message"""
+        location = self.location(row)
+        if not location:
+            return None
+        return self.status.get(location)
+
+    def paths_for_rows(self, first, last):
+        """Current file locations of the rows first..last"""
+        locations = (self.location(row) for row in range(max(first, 0), min(last + 1, self.rowCount())))
+        return [location for location in locations if location]
+
+    def entry(self, row):
+        """Build a LogEntry for a row"""
+        entry = LogEntry(
+            self.messages[row],
+            self.paths.join(self.source_dirs[row], self.source_names[row]),
+            self.paths.join(self.destination_dirs[row], self.destination_names[row]),
+            time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.times[row])),
+            bool(self.flags[row] & FLAG_UNDONE),
+            self.times[row]
+        )
+        entry.current_location = self.location(row)
+        record_id = self.record_ids[row]
+        entry.record_id = None if record_id < 0 else record_id
+        return entry
+
+    def update_entry(self, entry):
+        """Store the current location and undo state of an entry. Returns its row, None if not loaded"""
+        if entry.record_id is None:
+            return None
+        row = self.row_for_record(entry.record_id)
+        if row is None:
+            return None
+        self.location_dirs[row], self.location_names[row] = self.paths.split(entry.current_location)
+        if entry.is_undone:
+            self.flags[row] |= FLAG_UNDONE
+        else:
+            self.flags[row] &= ~FLAG_UNDONE
+        self.entry_changed(row)
+        return row
+
+    def row_for_record(self, record_id):
+        """Row of the entry with a log store id, None if it is not loaded. Rows are in id order"""
+        row = bisect.bisect_left(self.record_ids, record_id)
+        if row < len(self.record_ids) and self.record_ids[row] == record_id:
+            return row
+        return None
+
+    def _pack(self, entries):
+        """Turn entries into {column name: values} ready to be added to the columns"""
+        columns = {name: array(typecode) if typecode else [] for name, typecode in MODEL_COLUMNS}
+        split = self.paths.split
+        for entry in entries:
+            columns["record_ids"].append(-1 if entry.record_id is None else entry.record_id)
+            columns["times"].append(int(entry.ts or 0))
+            columns["flags"].append(FLAG_UNDONE if entry.is_undone else 0)
+            columns["messages"].append(entry.message)
+            source_dir, source_name = split(entry.original_source)
+            destination_dir, destination_name = split(entry.original_destination)
+            location_dir, location_name = split(entry.current_location)
+            # Share one file name object when the names are the same
+            if destination_name == source_name:
+                destination_name = source_name
+            if location_name == destination_name:
+                location_name = destination_name
+            elif location_name == source_name:
+                location_name = source_name
+            columns["source_dirs"].append(source_dir)
+            columns["source_names"].append(source_name)
+            columns["destination_dirs"].append(destination_dir)
+            columns["destination_names"].append(destination_name)
+            columns["location_dirs"].append(location_dir)
+            columns["location_names"].append(location_name)
+        return columns
+
+    def append_entry(self, entry):
+        self.append_entries([entry])
+
+    def append_entries(self, entries):
+        """Add entries at the end with a single row insertion"""
+        if not entries:
+            return
+        columns = self._pack(entries)
+        first = self.rowCount()
+        self.beginInsertRows(QModelIndex(), first, first + len(entries) - 1)
+        for name, _ in MODEL_COLUMNS:
+            getattr(self, name).extend(columns[name])
+        self.endInsertRows()
+
+    def prepend_entries(self, entries):
+        """Add older entries at the top with a single row insertion"""
+        if not entries:
+            return
+        columns = self._pack(entries)
+        self.beginInsertRows(QModelIndex(), 0, len(entries) - 1)
+        for name, _ in MODEL_COLUMNS:
+            getattr(self, name)[0:0] = columns[name]
+        self.endInsertRows()
+
+    def set_entries(self, entries):
+        self.beginResetModel()
+        self.paths = PathTable()
+        self.status = {}
+        self._reset_columns()
+        columns = self._pack(entries)
+        for name, _ in MODEL_COLUMNS:
+            getattr(self, name).extend(columns[name])
+        self.endResetModel()
+
+    def clear(self):
+        self.set_entries([])
+
+    def entry_changed(self, row):
+        """Refresh a row after its entry was undone or redone"""
+        self.dataChanged.emit(self.index(row, COL_STATUS), self.index(row, COL_ACTION))
+
+    def entries_changed(self):
+        """Refresh the status and action columns of every row, only visible rows are repainted"""
+        if self.rowCount():
+            self.dataChanged.emit(self.index(0, COL_STATUS), self.index(self.rowCount() - 1, COL_ACTION))
+
+    def apply_status(self, results):
+        """Store a batch of {path: exists} results, repainting only if something changed"""
+        changed = False
+        for path, exists in results.items():
+            if self.status.get(path) != exists:
+                self.status[path] = exists
+                changed = True
+        if changed:
+            self.entries_changed()
+        return changed
+
+def check_paths(paths):
+    """
+    Return {path: exists} for paths, with one directory listing per folder.
+
+    Logged files are usually organized into a few folders, so listing each
+    folder once is much cheaper than a stat per file on network drives.
+    """
+    by_directory = {}
+    for path in paths:
+        by_directory.setdefault(os.path.dirname(path), []).append(path)
+
+    results = {}
+    for directory, directory_paths in by_directory.items():
+        try:
+            with os.scandir(directory) as entries:
+                names = {os.path.normcase(entry.name) for entry in entries}
+        except OSError:
+            # Missing or unreadable folder, none of its files are there
+            names = set()
+        for path in directory_paths:
+            results[path] = os.path.normcase(os.path.basename(path)) in names
+    return results
+
+class FileStatusChecker(QObject):
+    """
+    Checks whether logged files still exist, on its own thread.
+
+    Requests are queued through the check_requested and verify_requested
+    signals of the owner; results come back in batches through results_ready.
+    """
+    results_ready = pyqtSignal(dict)  # {path: exists}
+    verify_progress = pyqtSignal(int, int)  # Paths checked, total
+    verify_finished = pyqtSignal(int, int)  # Paths checked, files missing
+
+    def check(self, paths):
+        """Check a few paths, e.g. the visible rows"""
+        if paths:
+            self.results_ready.emit(check_paths(set(paths)))
+
+    def verify(self, paths):
+        """Check many paths in batches, reporting progress"""
+        paths = sorted(set(paths))
+        missing = 0
+        for start in range(0, len(paths), VERIFY_BATCH_SIZE):
+            results = check_paths(paths[start:start + VERIFY_BATCH_SIZE])
+            missing += sum(1 for exists in results.values() if not exists)
+            self.results_ready.emit(results)
+            self.verify_progress.emit(min(start + VERIFY_BATCH_SIZE, len(paths)), len(paths))
+        self.verify_finished.emit(len(paths), missing)
+
+class HistorySeekWorker(QObject):
+    """
+    Reads older pages of history on its own thread until a record is
+    reached, so jumping to an old search result does not block the UI.
+
+    Everything read is handed back, oldest first, even when cancelled: the
+    reader has moved past it, so it has to be shown to keep the view whole.
+    """
+    progress = pyqtSignal(int, int)  # Entries read, entries expected
+    finished = pyqtSignal(list, bool)  # [LogEntry], oldest first; whether the record was found
+
+    def __init__(self, history, record_id, oldest_loaded_id, page_size):
+        super().__init__()
+        self.history = history
+        self.record_id = record_id
+        self.expected = max(oldest_loaded_id - record_id, 1)
+        self.page_size = page_size
+        self.cancelled = False
+
+    def cancel(self):
+        """Stop after the current page, callable from any thread"""
+        self.cancelled = True
+
+    def run(self):
+        pages = []
+        read = 0
+        found = False
+        while not self.cancelled and self.history.has_more():
+            page = self.history.read_page(self.page_size)
+            if not page:
+                continue
+            pages.append(page)
+            read += len(page)
+            self.progress.emit(read, self.expected)
+            # Pages are in id order, so nothing older is needed once the record is passed
+            if page[0].get("id", -1) <= self.record_id:
+                found = any(record.get("id") == self.record_id for record in page)
+                break
+        self.finished.emit([LogEntry.from_dict(record) for page in reversed(pages) for record in page], found)
+
+class LogActionDelegate(QStyledItemDelegate):
+    """Draws the Undo/Redo button of a row without creating a widget for it"""
+    action_clicked = pyqtSignal(int)
+
+    def _button_rect(self, option):
+        return option.rect.adjusted(4, 3, -4, -3)
+
+    def paint(self, painter, option, index):
+        text = index.data(Qt.DisplayRole)
+        if not text:
+            super().paint(painter, option, index)
+            return
+        button = QStyleOptionButton()
+        button.rect = self._button_rect(option)
+        button.text = text
+        button.state = QStyle.State_Enabled | QStyle.State_Raised
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.CE_PushButton, button, painter, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            if index.data(Qt.DisplayRole) and self._button_rect(option).contains(event.pos()):
+                self.action_clicked.emit(index.row())
+                return True
+        return super().editorEvent(event, model, option, index)
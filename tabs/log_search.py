@@ -0,0 +1,182 @@
+import os, re, sqlite3, threading
+
+# Search index of the log, next to the log segments
+SEARCH_DB_NAME = "search.db"
+
+# Records indexed per transaction while catching up with the log
+INDEX_BATCH_SIZE = 5000
+
+# Most results returned by a search
+MAX_SEARCH_RESULTS = 200
+
+# Words shorter than this are ignored, they would match most of the history
+MIN_TERM_LENGTH = 2
+
+class LogSearchIndex:
+    """
+    Full-text index over log messages and file paths, in SQLite.
+
+    Uses an FTS5 table keyed by the log record id. Every search word is
+    matched as a prefix, so "repo" finds "report_2024.pdf", and paths are
+    split into words by the tokenizer, so any folder or file name in a path
+    can be searched for.
+    New log entries are added as they are logged and updated after an undo
+    or redo; catch_up() indexes whatever the log store has that the index
+    does not, e.g. on first start. If SQLite was built without FTS5 a plain
+    table with LIKE queries is used instead, which is slower but works.
+    """
+
+    def __init__(self, path):
+        self.lock = threading.Lock()
+        self.path = path
+        self.fts = True
+        self.connection = None
+        self.caught_up = False  # Every record up to the newest is indexed
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self.connection = sqlite3.connect(path, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.create_table()
+        except Exception as e:
+            print(f"Error opening search index {path}: {str(e)}")
+            self.connection = None
+
+    def create_table(self):
+        # Id up to which every record of the log is indexed
+        self.connection.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value INTEGER)")
+        try:
+            self.connection.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS entries USING fts5("
+                "message, source, destination, location UNINDEXED, timestamp UNINDEXED)")
+        except sqlite3.OperationalError:
+            self.fts = False
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries_plain ("
+                "id INTEGER PRIMARY KEY, message TEXT, source TEXT, destination TEXT, "
+                "location TEXT, timestamp TEXT)")
+        self.connection.commit()
+
+    @property
+    def table(self):
+        return "entries" if self.fts else "entries_plain"
+
+    @property
+    def id_column(self):
+        return "rowid" if self.fts else "id"
+
+    def add(self, records):
+        """Index log store records, replacing any already indexed with the same id"""
+        if self.connection is None or not records:
+            return
+        rows = [(record["id"], record.get("message", ""), record.get("original_source") or "",
+                 record.get("original_destination") or "", record.get("current_location") or "",
+                 record.get("timestamp", ""))
+                for record in records if isinstance(record.get("id"), int)]
+        try:
+            with self.lock:
+                self.connection.executemany(
+                    f"INSERT OR REPLACE INTO {self.table} ({self.id_column}, message, source, destination, "
+                    "location, timestamp) VALUES (?, ?, ?, ?, ?, ?)", rows)
+                if self.caught_up and rows:
+                    self._set_indexed_through(rows[-1][0])
+                self.connection.commit()
+        except Exception as e:
+            print(f"Error updating search index: {str(e)}")
+
+    def update_location(self, record_id, location):
+        """Record where the file of an entry is now, after an undo or redo"""
+        self.update_locations([(record_id, location)])
+
+    def update_locations(self, locations):
+        """Record [(record id, location)] in one transaction"""
+        rows = [(location or "", record_id) for record_id, location in locations if record_id is not None]
+        if self.connection is None or not rows:
+            return
+        try:
+            with self.lock:
+                self.connection.executemany(
+                    f"UPDATE {self.table} SET location = ? WHERE {self.id_column} = ?", rows)
+                self.connection.commit()
+        except Exception as e:
+            print(f"Error updating search index: {str(e)}")
+
+    def indexed_through(self):
+        """Id up to which every record is indexed, -1 if none are"""
+        if self.connection is None:
+            return -1
+        with self.lock:
+            row = self.connection.execute("SELECT value FROM state WHERE key = 'indexed_through'").fetchone()
+        return row[0] if row else -1
+
+    def _set_indexed_through(self, record_id):
+        self.connection.execute("INSERT OR REPLACE INTO state (key, value) VALUES ('indexed_through', ?)",
+                                (record_id,))
+
+    def catch_up(self, log_store):
+        """Index records the log store has and the index does not, dropping ones deleted from the log"""
+        if self.connection is None:
+            return
+        try:
+            with self.lock:
+                self.connection.execute(f"DELETE FROM {self.table} WHERE {self.id_column} < ?",
+                                        (log_store.first_id(),))
+                self.connection.commit()
+            batch = []
+            for record in log_store.records_after(self.indexed_through(), flush=False):
+                batch.append(record)
+                if len(batch) >= INDEX_BATCH_SIZE:
+                    self._add_caught_up(batch)
+                    batch = []
+            self._add_caught_up(batch)
+            # Entries logged from now on keep the index complete
+            self.caught_up = True
+        except Exception as e:
+            print(f"Error building search index: {str(e)}")
+
+    def _add_caught_up(self, records):
+        """Index a batch read from the log and remember how far the log is indexed"""
+        self.add(records)
+        if records:
+            with self.lock:
+                self._set_indexed_through(records[-1]["id"])
+                self.connection.commit()
+
+    def search(self, text, limit=MAX_SEARCH_RESULTS):
+        """Return [(record id, timestamp, message, location)] matching every word of text, newest first"""
+        if self.connection is None:
+            return []
+        terms = [term for term in text.split() if len(term) >= MIN_TERM_LENGTH]
+        if not terms:
+            return []
+        try:
+            with self.lock:
+                if self.fts:
+                    # Each word is a quoted prefix phrase, so punctuation and paths are matched literally
+                    query = " ".join('"' + term.replace('"', '""') + '"*' for term in terms)
+                    return self.connection.execute(
+                        "SELECT rowid, timestamp, message, location FROM entries WHERE entries MATCH ? "
+                        "ORDER BY rowid DESC LIMIT ?", (query, limit)).fetchall()
+                conditions = " AND ".join(
+                    "(message LIKE ? ESCAPE '\\' OR source LIKE ? ESCAPE '\\' OR destination LIKE ? ESCAPE '\\')"
+                    for _ in terms)
+                params = []
+                for term in terms:
+                    pattern = "%" + re.sub(r"([%_\\])", r"\\\1", term) + "%"
+                    params.extend([pattern] * 3)
+                return self.connection.execute(
+                    f"SELECT id, timestamp, message, location FROM entries_plain WHERE {conditions} "
+                    "ORDER BY id DESC LIMIT ?", params + [limit]).fetchall()
+        except sqlite3.OperationalError as e:
+            # e.g. a query made only of punctuation
+            print(f"Search error: {str(e)}")
+            return []
+
+    def clear(self):
+        if self.connection is None:
+            return
+        with self.lock:
+            self.connection.execute(f"DELETE FROM {self.table}")
+            self.connection.commit()
+        self.caught_up = True
+
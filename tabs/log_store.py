@@ -0,0 +1,686 @@
+import os, re, json, gzip, time, threading
+
+# Directory holding the append-only log
+LOGS_DIR = os.path.expanduser("~/.watcher_logs")
+
+# Single log file written before the log was split into segments
+LOG_FILE_NAME = "log.jsonl"
+
+# Log file used before the append-only store, migrated on first start
+LEGACY_LOGS_FILE = os.path.expanduser("~/.watcher_logs.json")
+
+# Flush right away once this many lines are waiting
+MAX_PENDING_LINES = 200
+
+# Bytes read at a time when reading the log backwards
+READ_BLOCK_SIZE = 64 * 1024
+
+# A new segment is started once the current one reaches this size
+SEGMENT_MAX_BYTES = 4 * 1024 * 1024
+
+# Lines per compressed block of a closed segment, one index entry each
+INDEX_INTERVAL = 256
+
+# Closed segments are deleted, oldest first, beyond these limits
+RETENTION_MAX_BYTES = 200 * 1024 * 1024  # Compressed size on disk
+RETENTION_MAX_DAYS = 365
+
+SEGMENT_PATTERN = re.compile(r"^log-(\d+)\.jsonl(\.gz)?$")
+
+class LogSegment:
+    """
+    One file of the log, named after the id of its first record.
+
+    The newest segment is a plain JSON lines file that is appended to. Closed
+    segments are gzip compressed in blocks of INDEX_INTERVAL lines, each block
+    its own gzip member, so any block can be decompressed on its own. The
+    .idx file next to it lists every block with its time range and offsets,
+    which is all that is needed to find the blocks of a time range.
+    Uncompressed offsets are the same as in the plain file, so readers created
+    before a segment was compressed keep working.
+    """
+
+    def __init__(self, directory, first_id):
+        self.first_id = first_id
+        base = os.path.join(directory, f"log-{first_id:08d}")
+        self.path = base + ".jsonl"
+        self.gz_path = self.path + ".gz"
+        self.index_path = base + ".idx"
+        self.index = None  # Loaded on first use, closed segments only
+        self.cached_block = (None, b"")  # Last decompressed block
+
+    def is_compressed(self):
+        return not os.path.exists(self.path) and os.path.exists(self.gz_path)
+
+    def load_index(self):
+        """Return the block index of a compressed segment, None if there is none"""
+        if self.index is None and os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self.index = json.load(f)
+            except Exception as e:
+                print(f"Error loading log index {self.index_path}: {str(e)}")
+        return self.index
+
+    def size(self):
+        """Uncompressed size in bytes"""
+        if not self.is_compressed():
+            return _file_size(self.path)
+        index = self.load_index()
+        return index["size"] if index else 0
+
+    def disk_size(self):
+        return _file_size(self.path) + _file_size(self.gz_path) + _file_size(self.index_path)
+
+    def time_range(self):
+        """(first ts, last ts) of the records, last is None while the segment is written"""
+        if self.is_compressed():
+            index = self.load_index()
+            return (index["first_ts"], index["last_ts"]) if index else (0, 0)
+        for line in _forward_lines(self.path):
+            record = _parse_line(line)
+            if record is not None and record.get("op") != "update":
+                return record.get("ts", 0), None
+        return None, None
+
+    def overlaps(self, start_ts, end_ts):
+        first_ts, last_ts = self.time_range()
+        if first_ts is None:
+            return False
+        if start_ts is not None and last_ts is not None and last_ts < start_ts:
+            return False
+        return end_ts is None or first_ts <= end_ts
+
+    def last_id(self):
+        """Id of the newest record, None if the segment has none"""
+        if self.is_compressed():
+            index = self.load_index()
+            return index["last_id"] if index else None
+        for line in _reverse_lines(self, self.size()):
+            record = _parse_line(line)
+            if record is not None and record.get("op") != "update" and isinstance(record.get("id"), int):
+                return record["id"]
+        return None
+
+    def read_range(self, start, size):
+        """Return size bytes of the uncompressed segment from offset start"""
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(start)
+                return f.read(size)
+        except FileNotFoundError:
+            pass  # Compressed since the reader was created
+        index = self.load_index()
+        if not index:
+            return b""
+        data = []
+        end = start + size
+        for number, block in enumerate(index["blocks"]):
+            block_start, block_end = block["offset"], block["offset"] + block["size"]
+            if block_end <= start or block_start >= end:
+                continue
+            text = self.read_block(number)
+            data.append(text[max(start - block_start, 0):end - block_start])
+        return b"".join(data)
+
+    def read_block(self, number):
+        """Decompress one block of a compressed segment"""
+        if self.cached_block[0] == number:
+            return self.cached_block[1]
+        index = self.load_index()
+        block = index["blocks"][number]
+        with open(self.gz_path, 'rb') as f:
+            f.seek(block["gz_offset"])
+            text = gzip.decompress(f.read(block["gz_size"]))
+        self.cached_block = (number, text)
+        return text
+
+    def records(self, start_ts=None, end_ts=None):
+        """Yield the records in a time range, oldest first, without applying updates"""
+        if self.is_compressed():
+            index = self.load_index()
+            if not index:
+                return
+            numbers = [number for number, block in enumerate(index["blocks"])
+                       if (start_ts is None or block["max_ts"] >= start_ts)
+                       and (end_ts is None or block["min_ts"] <= end_ts)]
+            lines = (line for number in numbers for line in self.read_block(number).split(b"\n"))
+        else:
+            lines = _forward_lines(self.path)
+        for line in lines:
+            record = _parse_line(line)
+            if record is None or record.get("op") == "update":
+                continue
+            ts = record.get("ts", 0)
+            if (start_ts is None or ts >= start_ts) and (end_ts is None or ts <= end_ts):
+                yield record
+
+    def block_count(self, start_ts=None, end_ts=None):
+        """Number of blocks records() will read for a time range, for progress reporting"""
+        if not self.is_compressed():
+            return max(1, self.size() // READ_BLOCK_SIZE)
+        index = self.load_index() or {"blocks": []}
+        return sum(1 for block in index["blocks"]
+                   if (start_ts is None or block["max_ts"] >= start_ts)
+                   and (end_ts is None or block["min_ts"] <= end_ts))
+
+    def updates(self):
+        """{record id: changed fields} from the update lines of this segment, later lines winning"""
+        if self.is_compressed():
+            index = self.load_index()
+            return {int(record_id): fields for record_id, fields in (index or {}).get("updates", {}).items()}
+        updates = {}
+        for line in _forward_lines(self.path):
+            # Cheap test first, update lines are rare
+            if b'"op": "update"' not in line:
+                continue
+            record = _parse_line(line)
+            if record is not None and record.pop("op", None) == "update":
+                updates.setdefault(record.pop("id", None), {}).update(record)
+        return updates
+
+    def compress(self):
+        """Write the gzip file and index of a closed segment, then remove the plain file"""
+        with open(self.path, 'rb') as f:
+            lines = f.read().split(b"\n")
+        if lines and lines[-1] == b"":
+            lines.pop()
+
+        index = {"first_id": None, "last_id": None, "first_ts": None, "last_ts": None,
+                 "count": 0, "size": 0, "blocks": [], "updates": {}}
+        gz_offset = 0
+        tmp_gz_path = self.gz_path + ".tmp"
+        with open(tmp_gz_path, 'wb') as gz_file:
+            for start in range(0, len(lines), INDEX_INTERVAL):
+                block_lines = lines[start:start + INDEX_INTERVAL]
+                text = b"\n".join(block_lines) + b"\n"
+                block = {"offset": index["size"], "size": len(text), "min_ts": None, "max_ts": None}
+                for line in block_lines:
+                    record = _parse_line(line)
+                    if record is None:
+                        continue
+                    if record.pop("op", None) == "update":
+                        index["updates"].setdefault(str(record.pop("id", None)), {}).update(record)
+                        continue
+                    ts = record.get("ts", 0)
+                    block["min_ts"] = ts if block["min_ts"] is None else min(block["min_ts"], ts)
+                    block["max_ts"] = ts if block["max_ts"] is None else max(block["max_ts"], ts)
+                    if index["first_id"] is None:
+                        index["first_id"], index["first_ts"] = record.get("id"), ts
+                    index["last_id"], index["last_ts"] = record.get("id"), ts
+                    index["count"] += 1
+                if block["min_ts"] is None:
+                    # Only update lines, never part of a time range
+                    block["min_ts"] = block["max_ts"] = -1
+                data = gzip.compress(text, mtime=0)
+                block["gz_offset"], block["gz_size"] = gz_offset, len(data)
+                gz_file.write(data)
+                gz_offset += len(data)
+                index["size"] += len(text)
+                index["blocks"].append(block)
+            gz_file.flush()
+            os.fsync(gz_file.fileno())
+
+        if index["first_ts"] is None:
+            index["first_ts"] = index["last_ts"] = 0
+        tmp_index_path = self.index_path + ".tmp"
+        with open(tmp_index_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        os.replace(tmp_index_path, self.index_path)
+        os.replace(tmp_gz_path, self.gz_path)
+        self.index = index
+        os.remove(self.path)
+
+    def delete(self):
+        for path in (self.path, self.gz_path, self.index_path):
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+            except OSError as e:
+                print(f"Error deleting log segment {path}: {str(e)}")
+
+class LogStore:
+    """
+    Append-only JSON lines log, split into segments.
+
+    Every record gets a monotonic "id" and a "ts" (epoch seconds). Changes
+    to a record (e.g. after an undo) are appended as {"op": "update", "id":
+    ..., fields} lines and applied when the log is read, so nothing is ever
+    rewritten. Appends are buffered in memory and written by flush(), which
+    the owner calls on a timer; one append costs the same no matter how long
+    the history is.
+
+    Once the current segment reaches SEGMENT_MAX_BYTES a new one is started
+    and the closed one is compressed and indexed on a background thread.
+    Closed segments beyond RETENTION_MAX_BYTES or older than
+    RETENTION_MAX_DAYS are deleted, oldest first.
+    """
+
+    def __init__(self, directory=LOGS_DIR, legacy_file=LEGACY_LOGS_FILE,
+                 segment_max_bytes=SEGMENT_MAX_BYTES, retention_max_bytes=RETENTION_MAX_BYTES,
+                 retention_max_days=RETENTION_MAX_DAYS):
+        self.lock = threading.Lock()
+        # Held by flush() from taking the pending lines until they are written
+        # and the segment is rotated, so flushes from different threads never
+        # interleave or write to a segment that is already closed
+        self.flush_lock = threading.Lock()
+        self.maintenance_lock = threading.Lock()
+        self.directory = directory
+        self.legacy_file = legacy_file
+        self.segment_max_bytes = segment_max_bytes
+        self.retention_max_bytes = retention_max_bytes
+        self.retention_max_days = retention_max_days
+        self.pending = []  # Serialized lines not written yet
+        self.maintenance_running = False
+        self.maintenance_requested = False
+        self.segment_cache = {}  # {first id: LogSegment}, keeps loaded indexes
+        self.migrate_legacy()
+        self.migrate_single_file()
+
+        segments = self.segments()
+        self.next_id = self._last_id(segments) + 1
+        newest = segments[-1] if segments else None
+        if newest is not None and not newest.is_compressed() and newest.size() < self.segment_max_bytes:
+            self.active = newest
+        else:
+            self.active = self.segment(self.next_id)
+        self.active_size = self.active.size()
+        # A crash may have left a partial last line, checked before the next write
+        self.check_tail = True
+
+        # Finish compressing segments closed by an earlier run, and apply retention
+        if any(not segment.is_compressed() for segment in segments if segment is not self.active):
+            self.start_maintenance()
+
+    @property
+    def path(self):
+        """File currently appended to"""
+        return self.active.path
+
+    def migrate_legacy(self):
+        """Copy the old ~/.watcher_logs.json into the store once"""
+        if not self.legacy_file or not os.path.exists(self.legacy_file):
+            return
+        if os.path.exists(os.path.join(self.directory, LOG_FILE_NAME)) or self.segments():
+            return
+        try:
+            with open(self.legacy_file, 'r') as f:
+                records = json.load(f)
+            os.makedirs(self.directory, exist_ok=True)
+            path = self.segment(0).path
+            tmp_path = path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for record_id, record in enumerate(records):
+                    record = dict(record)
+                    record["id"] = record_id
+                    record.setdefault("ts", _parse_timestamp(record.get("timestamp")))
+                    f.write(json.dumps(record) + "\n")
+            os.replace(tmp_path, path)
+            # Keep the old file around instead of deleting the user's history
+            os.replace(self.legacy_file, self.legacy_file + ".migrated")
+            print(f"Migrated {len(records)} log entries to {path}")
+        except Exception as e:
+            print(f"Error migrating logs from {self.legacy_file}: {str(e)}")
+
+    def migrate_single_file(self):
+        """Turn the single log.jsonl of earlier versions into the first segment"""
+        path = os.path.join(self.directory, LOG_FILE_NAME)
+        if not os.path.exists(path):
+            return
+        first_id = 0
+        for line in _forward_lines(path):
+            record = _parse_line(line)
+            if record is not None and isinstance(record.get("id"), int):
+                first_id = record["id"]
+                break
+        try:
+            os.replace(path, self.segment(first_id).path)
+        except OSError as e:
+            print(f"Error migrating {path}: {str(e)}")
+
+    def segment(self, first_id):
+        with self.lock:
+            segment = self.segment_cache.get(first_id)
+            if segment is None:
+                segment = self.segment_cache[first_id] = LogSegment(self.directory, first_id)
+            return segment
+
+    def segments(self):
+        """Return the segments on disk, oldest first"""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        first_ids = set()
+        for name in names:
+            match = SEGMENT_PATTERN.match(name)
+            if match:
+                first_ids.add(int(match.group(1)))
+        return [self.segment(first_id) for first_id in sorted(first_ids)]
+
+    def _last_id(self, segments):
+        """Id of the newest record, read from the end of the log. -1 if it is empty"""
+        for segment in reversed(segments):
+            last_id = segment.last_id()
+            if last_id is not None:
+                return last_id
+        return -1
+
+    def page_reader(self):
+        """Return a LogPageReader over the records written so far, newest first"""
+        self.flush()
+        return LogPageReader([(segment, segment.size()) for segment in reversed(self.segments())])
+
+    def query(self, start_ts=None, end_ts=None, progress=None, flush=True):
+        """
+        Yield the records with start_ts <= ts <= end_ts, oldest first, with
+        their updates applied. Only the blocks of closed segments that overlap
+        the range are read. progress(done, total) is called with the number
+        of blocks read. Pass flush=False from other threads and flush first
+        on the thread that appends.
+        """
+        if flush:
+            self.flush()
+        segments = self.segments()
+        selected = [segment for segment in segments if segment.overlaps(start_ts, end_ts)]
+        if not selected:
+            return
+
+        # Updates follow the record they change, so only later segments matter
+        updates = {}
+        for segment in segments[segments.index(selected[0]):]:
+            for record_id, fields in segment.updates().items():
+                updates.setdefault(record_id, {}).update(fields)
+
+        total = sum(segment.block_count(start_ts, end_ts) for segment in selected)
+        done = 0
+        for segment in selected:
+            for record in segment.records(start_ts, end_ts):
+                record.update(updates.get(record.get("id"), {}))
+                yield record
+            done += segment.block_count(start_ts, end_ts)
+            if progress:
+                progress(done, total)
+
+    def records_after(self, record_id, flush=True):
+        """Yield the records with an id above record_id, oldest first, with their updates applied"""
+        if flush:
+            self.flush()
+        segments = self.segments()
+        # A segment holds the ids from its own first id up to the next segment's
+        first = 0
+        for number in range(1, len(segments)):
+            if segments[number].first_id <= record_id + 1:
+                first = number
+        segments = segments[first:]
+
+        updates = {}
+        for segment in segments:
+            for update_id, fields in segment.updates().items():
+                updates.setdefault(update_id, {}).update(fields)
+
+        for segment in segments:
+            for record in segment.records():
+                if isinstance(record.get("id"), int) and record["id"] > record_id:
+                    record.update(updates.get(record["id"], {}))
+                    yield record
+
+    def first_id(self):
+        """Id of the oldest record still kept, next_id if the log is empty"""
+        segments = self.segments()
+        return segments[0].first_id if segments else self.next_id
+
+    def load(self):
+        """Return all records in order with their updates applied"""
+        return list(self.query())
+
+    def append(self, record):
+        """Add a record and return its id"""
+        with self.lock:
+            record["id"] = self.next_id
+            self.next_id += 1
+            record.setdefault("ts", time.time())
+            self.pending.append(json.dumps(record))
+            flush_now = len(self.pending) >= MAX_PENDING_LINES
+        if flush_now:
+            self.flush()
+        return record["id"]
+
+    def update(self, record_id, **fields):
+        """Record changed fields of an existing record"""
+        if record_id is None:
+            return
+        line = dict(fields, op="update", id=record_id)
+        with self.lock:
+            self.pending.append(json.dumps(line))
+
+    def has_pending(self):
+        return bool(self.pending)
+
+    def flush(self):
+        """
+        Write buffered lines to disk, starting a new segment when the current
+        one is full. Callable from any thread. Lines that could not be written
+        are kept for the next flush.
+        """
+        with self.flush_lock:
+            with self.lock:
+                if not self.pending:
+                    return
+                lines, self.pending = self.pending, []
+                # Every id below this is in lines or already written
+                unwritten_id = self.next_id
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                data = ("\n".join(lines) + "\n").encode('utf-8')
+                if self.check_tail and not _ends_with_newline(self.active.path):
+                    # End the partial line, so the first new record is not lost with it
+                    data = b"\n" + data
+                with open(self.active.path, 'ab') as f:
+                    f.write(data)
+                self.check_tail = False
+                self.active_size += len(data)
+            except Exception as e:
+                print(f"Error saving logs: {str(e)}")
+                with self.lock:
+                    self.pending[:0] = lines
+                # Drop whatever part was written, the lines are written again with the next flush
+                try:
+                    if _file_size(self.active.path) > self.active_size:
+                        os.truncate(self.active.path, self.active_size)
+                except OSError:
+                    pass
+                self.check_tail = True
+                return
+            if self.active_size >= self.segment_max_bytes:
+                self.rotate(unwritten_id)
+
+    def rotate(self, first_id):
+        """Close the current segment and compress it in the background. Call with flush_lock held"""
+        self.active = self.segment(first_id)
+        self.active_size = self.active.size()
+        self.start_maintenance()
+
+    def start_maintenance(self):
+        """Run maintain() on a background thread, or once more if it is already running"""
+        with self.lock:
+            self.maintenance_requested = True
+            if self.maintenance_running:
+                return
+            self.maintenance_running = True
+        threading.Thread(target=self._maintenance_loop, daemon=True).start()
+
+    def _maintenance_loop(self):
+        while True:
+            with self.lock:
+                if not self.maintenance_requested:
+                    self.maintenance_running = False
+                    return
+                self.maintenance_requested = False
+            self.maintain()
+
+    def maintain(self):
+        """Compress closed segments and delete the ones beyond the retention limits"""
+        with self.maintenance_lock:
+            closed = [segment for segment in self.segments() if segment is not self.active]
+            for segment in closed:
+                if not segment.is_compressed():
+                    try:
+                        segment.compress()
+                    except Exception as e:
+                        print(f"Error compressing log segment {segment.path}: {str(e)}")
+            self.apply_retention(closed)
+
+    def apply_retention(self, closed):
+        total = sum(segment.disk_size() for segment in closed)
+        cutoff = time.time() - self.retention_max_days * 24 * 3600
+        for segment in closed:
+            _, last_ts = segment.time_range()
+            if total <= self.retention_max_bytes and (last_ts is None or last_ts >= cutoff):
+                break
+            total -= segment.disk_size()
+            segment.delete()
+            with self.lock:
+                self.segment_cache.pop(segment.first_id, None)
+
+    def clear(self):
+        """Delete every record. Ids keep counting up"""
+        with self.flush_lock:
+            with self.lock:
+                self.pending = []
+            with self.maintenance_lock:
+                for segment in self.segments():
+                    segment.delete()
+                with self.lock:
+                    self.segment_cache = {}
+            self.active = self.segment(self.next_id)
+            self.active_size = 0
+            self.check_tail = False
+
+class LogPageReader:
+    """
+    Reads the log backwards one page of records at a time.
+
+    Only the blocks needed for the requested page are read, so showing the
+    most recent entries costs the same however long the history is. Update
+    lines always follow the record they change, so they are collected on the
+    way back and applied when the record itself is reached.
+    """
+
+    def __init__(self, segments):
+        self.segments = list(segments)  # [(segment, end offset)], newest first
+        self.position = self.segments[0][1] if self.segments else 0  # Everything before this is unread
+        self.remainder = b""  # Start of a line cut by the last block read
+        self.lines = []  # Lines of the last block read not returned yet, oldest first
+        self.updates = {}  # {record id: changed fields} for records not read yet
+
+    def has_more(self):
+        return bool(self.segments or self.lines)
+
+    def read_page(self, count):
+        """
+        Return up to count older records, oldest first. Lines of a block
+        beyond count are kept for the next page.
+        """
+        page = []
+        try:
+            while len(page) < count and self.has_more():
+                if not self.lines:
+                    self.lines = self._read_block()
+                    self.lines.reverse()
+                    continue
+                record = self._parse(self.lines.pop())
+                if record is not None:
+                    page.append(record)
+        except OSError as e:
+            print(f"Error reading logs: {str(e)}")
+            self.segments, self.position, self.remainder, self.lines = [], 0, b"", []
+        page.reverse()
+        return page
+
+    def _read_block(self):
+        """Return the complete lines of the next block back, newest first"""
+        segment = self.segments[0][0]
+        if self.position == 0:
+            # Start of the segment, move on to the one before it
+            line, self.remainder = self.remainder, b""
+            self.segments.pop(0)
+            self.position = self.segments[0][1] if self.segments else 0
+            return [line] if line else []
+        size = min(READ_BLOCK_SIZE, self.position)
+        self.position -= size
+        data = segment.read_range(self.position, size)
+        if len(data) != size:
+            # Deleted by retention since the reader was created
+            self.position, self.remainder = 0, b""
+            return []
+        lines = (data + self.remainder).split(b"\n")
+        # The first piece may be the end of a line that starts in an earlier block
+        self.remainder = lines.pop(0)
+        return [line for line in reversed(lines) if line]
+
+    def _parse(self, line):
+        record = _parse_line(line)
+        if record is None:
+            return None
+        record_id = record.get("id")
+        if record.pop("op", None) == "update":
+            # Older update lines lose to newer ones seen first
+            fields = self.updates.setdefault(record_id, {})
+            for key, value in record.items():
+                fields.setdefault(key, value)
+            return None
+        record.update(self.updates.pop(record_id, {}))
+        return record
+
+def _parse_line(line):
+    try:
+        return json.loads(line)
+    except ValueError:
+        # Partial last line after a crash
+        return None
+
+def _forward_lines(path):
+    """Yield the lines of a file from the start"""
+    try:
+        with open(path, 'rb') as f:
+            for line in f:
+                line = line.rstrip(b"\n")
+                if line:
+                    yield line
+    except OSError:
+        return
+
+def _reverse_lines(segment, end):
+    """Yield the lines of a segment before offset end, last line first"""
+    reader = LogPageReader([(segment, end)])
+    try:
+        while reader.has_more():
+            yield from reader._read_block()
+    except OSError:
+        return
+
+def _ends_with_newline(path):
+    """Whether a file is empty, missing or ends with a complete line"""
+    try:
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return True
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+    except OSError:
+        return True
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+def _parse_timestamp(timestamp):
+    """Epoch seconds for a "yyyy-MM-dd hh:mm:ss" timestamp, 0 if it cannot be parsed"""
+    try:
+        return time.mktime(time.strptime(timestamp, "%Y-%m-%d %H:%M:%S"))
+    except (TypeError, ValueError):
+        return 0
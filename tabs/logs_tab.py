@@ -1,187 +1,50 @@
-import os, json, shutil, datetime
+import os, shutil, datetime, threading
 from PyQt5.QtWidgets import (
-    QLabel, QPushButton, QScrollArea, QVBoxLayout,
-    QHBoxLayout, QFrame, QWidget, QMessageBox,
-    QDialog, QDateTimeEdit, QFormLayout, QDialogButtonBox, QFileDialog
+    QPushButton, QVBoxLayout, QHBoxLayout, QMessageBox,
+    QDialog, QDateTimeEdit, QFormLayout, QDialogButtonBox, QFileDialog, QProgressDialog,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QApplication, QTableView,
+    QLineEdit, QListWidget, QListWidgetItem, QTreeWidget, QTreeWidgetItem
 )
-from PyQt5.QtCore import Qt, QDateTime, pyqtSignal, QTimer
+from PyQt5.QtCore import Qt, QDateTime, QTimer, QThread, pyqtSignal
+from app_logging import dump_recent
+from idle_audit import periodic_timer
+from startup_profile import milestone as startup_milestone
 
 # When running directly
 try:
     from tabs.base_tab import BaseTab
+    from tabs.log_store import LogStore
+    from tabs.log_export import LogExportWorker
+    from tabs.bulk_move import BulkMoveWorker
+    from tabs.undo_history import UndoRedoManager, UNDO_DB_NAME, UNDO_STACK, REDO_STACK
+    from tabs.log_search import LogSearchIndex, SEARCH_DB_NAME
+    from tabs.log_model import LogEntry, LogModel, LogActionDelegate, FileStatusChecker, HistorySeekWorker, COL_TIME, COL_MESSAGE, COL_STATUS, COL_ACTION
 except ModuleNotFoundError:
     from base_tab import BaseTab  # For direct execution
+    from log_store import LogStore
+    from log_export import LogExportWorker
+    from bulk_move import BulkMoveWorker
+    from undo_history import UndoRedoManager, UNDO_DB_NAME, UNDO_STACK, REDO_STACK
+    from log_search import LogSearchIndex, SEARCH_DB_NAME
+    from log_model import LogEntry, LogModel, LogActionDelegate, FileStatusChecker, HistorySeekWorker, COL_TIME, COL_MESSAGE, COL_STATUS, COL_ACTION
 
-# Path for log storage
-LOGS_FILE = os.path.expanduser("~/.watcher_logs.json")
+# Buffered log lines are written at most this often
+LOG_FLUSH_INTERVAL_MS = 500
 
-class UndoRedoManager:
-    """Manages the undo/redo operations globally"""
-    def __init__(self):
-        self.undo_stack = []  # [(source, destination, entry), ...]
-        self.redo_stack = []
-        
-    def push_action(self, source, destination, log_entry):
-        """Add a new action to undo stack"""
-        self.undo_stack.append((source, destination, log_entry))
-        # Clear redo stack when new action is performed
-        self.redo_stack.clear()
-        
-    def can_undo(self):
-        return len(self.undo_stack) > 0
-        
-    def can_redo(self):
-        return len(self.redo_stack) > 0
-        
-    def undo(self):
-        """Undo the last action"""
-        if not self.can_undo():
-            return None
-        action = self.undo_stack.pop()
-        self.redo_stack.append(action)
-        return action
-        
-    def redo(self):
-        """Redo the last undone action"""
-        if not self.can_redo():
-            return None
-        action = self.redo_stack.pop()
-        self.undo_stack.append(action)
-        return action
-        
-    def clear(self):
-        """Clear all undo/redo history"""
-        self.undo_stack.clear()
-        self.redo_stack.clear()
+# Entries read from the history at a time, newest first
+LOG_PAGE_SIZE = 500
 
-class LogEntry(QFrame):
-    """A log entry widget with undo/redo functionality"""
-    undo_requested = pyqtSignal(str, str)
-    redo_requested = pyqtSignal(str, str)
+# Visible rows are checked again this often while the tab is shown
+STATUS_CHECK_INTERVAL_MS = 10000
 
-    def __init__(self, message, source=None, destination=None, timestamp=None, is_undone=False, parent=None):
-        super().__init__(parent)
-        # Store original paths
-        self.original_source = source  # Where the file was originally from
-        self.original_destination = destination  # Where the file was moved to
-        self.current_location = destination  # Current location of the file
-        self.message = message
-        self.is_undone = is_undone
-        self.timestamp = timestamp or QDateTime.currentDateTime().toString("yyyy-MM-dd hh:mm:ss")
-
-        layout = QHBoxLayout()
-        
-        # Message label
-        self.message_label = QLabel(f"[{self.timestamp}] {message}")
-        layout.addWidget(self.message_label)
-        
-        # Status label to show if files exist
-        self.status_label = QLabel()
-        self.update_file_status()
-        layout.addWidget(self.status_label)
-
-        # Only show undo/redo buttons for file transfers
-        if source and destination and not ("(Undo)" in message or "(Redo)" in message):
-            # Undo button
-            self.undo_btn = QPushButton("Undo")
-            self.undo_btn.setFixedWidth(60)
-            self.undo_btn.clicked.connect(self.handle_undo)
-            layout.addWidget(self.undo_btn)
-
-            # Redo button (initially hidden)
-            self.redo_btn = QPushButton("Redo")
-            self.redo_btn.setFixedWidth(60)
-            self.redo_btn.clicked.connect(self.handle_redo)
-            self.redo_btn.hide()
-            layout.addWidget(self.redo_btn)
-
-            # Set initial button states
-            if self.is_undone:
-                self.undo_btn.hide()
-                self.redo_btn.show()
-
-        layout.addStretch()  # Add stretch to keep buttons right-aligned
-        self.setLayout(layout)
-        self.setFrameShape(QFrame.StyledPanel)
-
-    def update_file_status(self):
-        """Check and update the status of files in this log entry"""
-        if not hasattr(self, 'status_label') or not self.status_label:
-            return
-            
-        if not self.original_source and not self.original_destination:
-            self.status_label.clear()
-            return
-            
-        if self.is_undone:
-            # Check if the undone file exists
-            if os.path.exists(self.current_location):
-                self.status_label.setText("✓")
-                self.status_label.setStyleSheet("color: green")
-            else:
-                self.status_label.setText("✗")
-                self.status_label.setStyleSheet("color: red")
-        else:
-            # Check if the destination file exists
-            if os.path.exists(self.current_location):
-                self.status_label.setText("✓")
-                self.status_label.setStyleSheet("color: green")
-            else:
-                self.status_label.setText("✗")
-                self.status_label.setStyleSheet("color: red")
-
-    def handle_undo(self):
-        """Handle undo button click"""
-        if not self.is_undone and os.path.exists(self.current_location):
-            # Move back to original directory but keep the filename
-            filename = os.path.basename(self.current_location)
-            original_dir = os.path.dirname(self.original_source)
-            undo_destination = os.path.join(original_dir, filename)
-            
-            # Emit signal to perform undo
-            self.undo_requested.emit(self.current_location, undo_destination)
-            # Update current location after successful undo
-            self.current_location = undo_destination
-            self.is_undone = True
-            
-            # Update button visibility
-            self.undo_btn.hide()
-            self.redo_btn.show()
-            
-            # Update status
-            self.update_file_status()
-
-    def handle_redo(self):
-        """Handle redo button click"""
-        if self.is_undone and os.path.exists(self.current_location):
-            # Move back to organized location but keep the filename
-            filename = os.path.basename(self.current_location)
-            destination_dir = os.path.dirname(self.original_destination)
-            redo_destination = os.path.join(destination_dir, filename)
-            
-            # Emit signal to perform redo
-            self.redo_requested.emit(self.current_location, redo_destination)
-            # Update current location after successful redo
-            self.current_location = redo_destination
-            self.is_undone = False
-            
-            # Update button visibility
-            self.redo_btn.hide()
-            self.undo_btn.show()
-            
-            # Update status
-            self.update_file_status()
-
-    def to_dict(self):
-        """Convert log entry to a dictionary for serialization"""
-        return {
-            "message": self.message,
-            "timestamp": self.timestamp,
-            "original_source": self.original_source,
-            "original_destination": self.original_destination,
-            "current_location": self.current_location,
-            "is_undone": self.is_undone
-        }
+# Wait for scrolling to settle before checking the rows that came into view
+SCROLL_CHECK_DELAY_MS = 200
+
+# Wait for typing to pause before searching
+SEARCH_DELAY_MS = 200
+
+# Files listed when an undo group is expanded
+UNDO_GROUP_PREVIEW = 500
 
 class DateRangeDialog(QDialog):
     """Dialog to select a date range for log export"""
@@ -216,27 +79,242 @@ class DateRangeDialog(QDialog):
         layout.addRow(buttons)
         
     def get_range(self):
-        """Return the selected date range as strings"""
-        return (
-            self.start_date.dateTime().toString("yyyy-MM-dd hh:mm:ss"),
-            self.end_date.dateTime().toString("yyyy-MM-dd hh:mm:ss")
-        )
+        """Return the selected date range as QDateTimes"""
+        return self.start_date.dateTime(), self.end_date.dateTime()
+
+class FailedFilesDialog(QDialog):
+    """Dialog listing files that could not be moved after all retries"""
+
+    def __init__(self, retry_scheduler, parent=None):
+        super().__init__(parent)
+        self.parent_window = parent
+        self.retry_scheduler = retry_scheduler
+        self.setWindowTitle("Failed Files")
+        self.resize(800, 350)
+        self.setModal(True)
+
+        layout = QVBoxLayout(self)
+
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["File", "Attempts", "Last Error", "Failed At"])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        buttons_layout = QHBoxLayout()
+        self.retry_btn = QPushButton("Retry Selected")
+        self.retry_btn.clicked.connect(self.retry_selected)
+        buttons_layout.addWidget(self.retry_btn)
+
+        self.clear_btn = QPushButton("Clear List")
+        self.clear_btn.clicked.connect(self.clear_list)
+        buttons_layout.addWidget(self.clear_btn)
+
+        buttons_layout.addStretch()
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        buttons_layout.addWidget(close_btn)
+        layout.addLayout(buttons_layout)
+
+        self.refresh()
+
+    def refresh(self):
+        """Reload the table from the retry scheduler"""
+        records = self.retry_scheduler.failed_files()
+        self.table.setRowCount(len(records))
+        for row, record in enumerate(records):
+            file_item = QTableWidgetItem(record.get("source", ""))
+            file_item.setData(Qt.UserRole, record.get("source"))
+            self.table.setItem(row, 0, file_item)
+            self.table.setItem(row, 1, QTableWidgetItem(str(record.get("attempts", ""))))
+            self.table.setItem(row, 2, QTableWidgetItem(record.get("error", "")))
+            self.table.setItem(row, 3, QTableWidgetItem(record.get("failed_at", "")))
+        self.retry_btn.setEnabled(bool(records))
+        self.clear_btn.setEnabled(bool(records))
+
+    def retry_selected(self):
+        """Queue the selected files again"""
+        rows = sorted({index.row() for index in self.table.selectedIndexes()})
+        if not rows:
+            rows = range(self.table.rowCount())
+        for row in rows:
+            src = self.table.item(row, 0).data(Qt.UserRole)
+            if self.parent_window and hasattr(self.parent_window, 'retry_failed_file'):
+                self.parent_window.retry_failed_file(src)
+            else:
+                self.retry_scheduler.release(src)
+        self.refresh()
+
+    def clear_list(self):
+        """Forget every failed file"""
+        self.retry_scheduler.clear_failed_files()
+        self.refresh()
+
+class UndoGroupsDialog(QDialog):
+    """Dialog listing undo groups as collapsible rows, to undo or redo a whole group at once"""
+
+    def __init__(self, logs_tab, parent=None):
+        super().__init__(parent)
+        self.logs_tab = logs_tab
+        self.manager = logs_tab.undo_redo_manager
+        self.setWindowTitle("Undo Groups")
+        self.resize(800, 450)
+        self.setModal(True)
+
+        layout = QVBoxLayout(self)
+
+        self.tree = QTreeWidget()
+        self.tree.setColumnCount(3)
+        self.tree.setHeaderLabels(["Started", "Files", "State"])
+        self.tree.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.tree.itemExpanded.connect(self.load_group_files)
+        self.tree.currentItemChanged.connect(self.update_buttons)
+        layout.addWidget(self.tree)
+
+        buttons_layout = QHBoxLayout()
+        self.undo_btn = QPushButton("Undo Group")
+        self.undo_btn.clicked.connect(lambda: self.run_group(undo=True))
+        buttons_layout.addWidget(self.undo_btn)
+
+        self.redo_btn = QPushButton("Redo Group")
+        self.redo_btn.clicked.connect(lambda: self.run_group(undo=False))
+        buttons_layout.addWidget(self.redo_btn)
+
+        buttons_layout.addStretch()
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        buttons_layout.addWidget(close_btn)
+        layout.addLayout(buttons_layout)
+
+        self.refresh()
+
+    def refresh(self):
+        """Reload the groups, collapsed, from the undo history"""
+        self.tree.clear()
+        for group in self.manager.groups():
+            if group.undoable == group.count:
+                state = "Moved"
+            elif group.redoable == group.count:
+                state = "Undone"
+            elif group.undoable or group.redoable:
+                state = f"{group.undoable} moved, {group.redoable} undone"
+            else:
+                state = "Changed since"
+            item = QTreeWidgetItem([group.started().strftime("%Y-%m-%d %H:%M:%S"), str(group.count), state])
+            item.setData(0, Qt.UserRole, group)
+            # Files are only listed when the group is expanded
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+            self.tree.addTopLevelItem(item)
+        self.update_buttons()
+
+    def load_group_files(self, item):
+        """List the files of a group the first time it is expanded"""
+        group = item.data(0, Qt.UserRole)
+        if group is None or item.childCount():
+            return
+        for _, _, entry in self.manager.group_actions(group.group_id, limit=UNDO_GROUP_PREVIEW):
+            location = entry.current_location or entry.original_destination
+            state = "Undone" if entry.is_undone else "Moved"
+            child = QTreeWidgetItem([os.path.basename(location), "", state])
+            child.setToolTip(0, location)
+            item.addChild(child)
+        if group.count > UNDO_GROUP_PREVIEW:
+            item.addChild(QTreeWidgetItem([f"... and {group.count - UNDO_GROUP_PREVIEW} more", "", ""]))
+
+    def selected_group(self):
+        item = self.tree.currentItem()
+        while item is not None and item.parent() is not None:
+            item = item.parent()
+        return item.data(0, Qt.UserRole) if item is not None else None
+
+    def update_buttons(self, *args):
+        group = self.selected_group()
+        busy = self.logs_tab.bulk_thread is not None
+        self.undo_btn.setEnabled(bool(group and group.undoable) and not busy)
+        self.redo_btn.setEnabled(bool(group and group.redoable) and not busy)
+
+    def run_group(self, undo):
+        """Undo or redo the selected group in the background and close the dialog"""
+        group = self.selected_group()
+        if group is None:
+            return
+        self.accept()
+        self.logs_tab.start_bulk_move(undo, group=group)
 
 class LogsTab(BaseTab):
     """Logs tab for showing application activity"""
+    check_requested = pyqtSignal(list)  # Paths for the status checker
+    verify_requested = pyqtSignal(list)
+    history_indexed = pyqtSignal()  # Search index and undo history caught up with the log
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent_window = parent
-        self.log_entries = []  # Store log entries for saving
-        self.undo_redo_manager = UndoRedoManager()
+        self.log_store = LogStore()
+
+        # Search index and undo history, brought up to date with the log in the background
+        self.search_index = LogSearchIndex(os.path.join(self.log_store.directory, SEARCH_DB_NAME))
+        self.undo_redo_manager = UndoRedoManager(os.path.join(self.log_store.directory, UNDO_DB_NAME))
+        self.history_indexed.connect(self.update_undo_redo_buttons)
+        threading.Thread(target=self.catch_up_history, daemon=True).start()
+
+        # Log lines are written in batches instead of on every message
+        self.flush_timer = QTimer()
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.timeout.connect(self.save_logs)
+        if QApplication.instance() is not None:
+            QApplication.instance().aboutToQuit.connect(self.save_logs)
+
         self.init_ui()
-        self.load_logs()
+
+        # History is read page by page once the tab is first shown. The reader
+        # is created now so entries logged from here on are not read twice
+        self.history = self.log_store.page_reader()
+        self.history_loaded = False
         
-        # Timer to periodically check file status
-        self.status_timer = QTimer()
-        self.status_timer.timeout.connect(self.check_all_file_status)
-        self.status_timer.start(10000)  # Check every 10 seconds
+        # File status is checked on a background thread, one folder listing
+        # per directory, and only for the rows on screen
+        self.status_thread = QThread()
+        self.status_checker = FileStatusChecker()
+        self.status_checker.moveToThread(self.status_thread)
+        self.check_requested.connect(self.status_checker.check)
+        self.verify_requested.connect(self.status_checker.verify)
+        self.status_checker.results_ready.connect(self.logs_model.apply_status)
+        self.status_checker.verify_progress.connect(self.on_verify_progress)
+        self.status_checker.verify_finished.connect(self.on_verify_finished)
+        self.status_thread.start()
+        if QApplication.instance() is not None:
+            QApplication.instance().aboutToQuit.connect(self.stop_status_checker)
+
+        # Timer to periodically check the visible rows, only runs while the tab is shown
+        self.status_timer = periodic_timer("Logs tab file status")
+        self.status_timer.setInterval(STATUS_CHECK_INTERVAL_MS)
+        self.status_timer.timeout.connect(self.check_visible_file_status)
+
+        self.scroll_check_timer = QTimer()
+        self.scroll_check_timer.setSingleShot(True)
+        self.scroll_check_timer.timeout.connect(self.check_visible_file_status)
+
+        # Running export, if any
+        self.export_thread = None
+        self.export_worker = None
+        self.export_progress = None
+
+        # Running jump to an entry that is not loaded yet, if any
+        self.seek_thread = None
+        self.seek_worker = None
+        self.seek_progress = None
+
+        # Running Undo All / Redo All, if any
+        self.bulk_thread = None
+        self.bulk_worker = None
+        self.bulk_progress = None
+        self.bulk_actions = None
+
+        # Moves from earlier runs can be undone right away
+        self.update_undo_redo_buttons()
 
     def init_ui(self):
         """Initialize the UI components"""
@@ -250,7 +328,8 @@ class LogsTab(BaseTab):
         
         # Verify button
         self.verify_btn = QPushButton("Verify Files")
-        self.verify_btn.clicked.connect(self.check_all_file_status)
+        self.verify_btn.setToolTip("Check every loaded entry in the background")
+        self.verify_btn.clicked.connect(self.verify_all_files)
         buttons_layout.addWidget(self.verify_btn)
         
         # Export logs button
@@ -269,95 +348,422 @@ class LogsTab(BaseTab):
         self.redo_all_btn.clicked.connect(self.redo_all)
         self.redo_all_btn.setEnabled(False)
         buttons_layout.addWidget(self.redo_all_btn)
+
+        # Undo groups button
+        self.undo_groups_btn = QPushButton("Undo Groups")
+        self.undo_groups_btn.setToolTip("Undo or redo all the moves of one scan or burst at once")
+        self.undo_groups_btn.clicked.connect(self.show_undo_groups)
+        buttons_layout.addWidget(self.undo_groups_btn)
+
+        # Failed files button
+        self.failed_files_btn = QPushButton("Failed Files")
+        self.failed_files_btn.clicked.connect(self.show_failed_files)
+        buttons_layout.addWidget(self.failed_files_btn)
+
+        # Save the recent messages kept in memory, of the enabled levels
+        self.dump_btn = QPushButton("Save Recent Log")
+        self.dump_btn.setToolTip("Save the most recent messages of each enabled level to a text file")
+        self.dump_btn.clicked.connect(self.dump_recent_log)
+        buttons_layout.addWidget(self.dump_btn)
         
         self.main_layout.addLayout(buttons_layout)
 
-        # Logs scroll area
-        self.logs_area = QScrollArea()
-        self.logs_area.setWidgetResizable(True)
-        self.logs_container = QWidget()
-        self.logs_container_layout = QVBoxLayout()
-        self.logs_container_layout.setAlignment(Qt.AlignTop)
-        self.logs_container.setLayout(self.logs_container_layout)
-        self.logs_area.setWidget(self.logs_container)
-        self.main_layout.addWidget(self.logs_area)
+        # Search over the whole move history
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search moved files by name, folder or message...")
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.textChanged.connect(self.on_search_text_changed)
+        self.main_layout.addWidget(self.search_box)
+
+        self.search_results = QListWidget()
+        self.search_results.setMaximumHeight(160)
+        self.search_results.itemActivated.connect(self.on_search_result_activated)
+        self.search_results.itemClicked.connect(self.on_search_result_activated)
+        self.search_results.hide()
+        self.main_layout.addWidget(self.search_results)
+
+        self.search_timer = QTimer()
+        self.search_timer.setSingleShot(True)
+        self.search_timer.timeout.connect(self.run_search)
+
+        # Logs view, only the visible rows are ever created or painted
+        self.logs_model = LogModel(self)
+        self.logs_view = QTableView()
+        self.logs_view.setModel(self.logs_model)
+        self.action_delegate = LogActionDelegate(self.logs_view)
+        self.action_delegate.action_clicked.connect(self.handle_row_action)
+        self.logs_view.setItemDelegateForColumn(COL_ACTION, self.action_delegate)
+
+        # Fixed row heights and column widths so Qt never measures every row
+        self.logs_view.verticalHeader().hide()
+        self.logs_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.logs_view.verticalHeader().setDefaultSectionSize(28)
+        header = self.logs_view.horizontalHeader()
+        header.setSectionResizeMode(COL_TIME, QHeaderView.Fixed)
+        header.setSectionResizeMode(COL_MESSAGE, QHeaderView.Stretch)
+        header.setSectionResizeMode(COL_STATUS, QHeaderView.Fixed)
+        header.setSectionResizeMode(COL_ACTION, QHeaderView.Fixed)
+        self.logs_view.setColumnWidth(COL_TIME, 140)
+        self.logs_view.setColumnWidth(COL_STATUS, 30)
+        self.logs_view.setColumnWidth(COL_ACTION, 70)
+        self.logs_view.setWordWrap(False)
+        self.logs_view.setShowGrid(False)
+        self.logs_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.logs_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.logs_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.logs_view.verticalScrollBar().valueChanged.connect(self.on_logs_scrolled)
+        self.main_layout.addWidget(self.logs_view)
+
+    def catch_up_history(self):
+        """Index log entries written while the indexes were not, runs on a background thread"""
+        self.search_index.catch_up(self.log_store)
+        self.undo_redo_manager.catch_up(self.log_store)
+        startup_milestone("log history indexed")
+        self.history_indexed.emit()
+
+    def on_search_text_changed(self, text):
+        self.search_timer.start(SEARCH_DELAY_MS)
+
+    def run_search(self):
+        """Show the entries matching the search box, newest first"""
+        text = self.search_box.text().strip()
+        self.search_results.clear()
+        if not text:
+            self.search_results.hide()
+            return
+        results = self.search_index.search(text)
+        for record_id, timestamp, message, location in results:
+            item = QListWidgetItem(f"[{timestamp}] {message}")
+            item.setData(Qt.UserRole, record_id)
+            if location:
+                item.setToolTip(f"Now: {location}")
+            self.search_results.addItem(item)
+        if not results:
+            item = QListWidgetItem("No matching entries")
+            item.setFlags(Qt.NoItemFlags)
+            self.search_results.addItem(item)
+        self.search_results.show()
+
+    def on_search_result_activated(self, item):
+        record_id = item.data(Qt.UserRole)
+        if record_id is not None:
+            self.jump_to_record(record_id)
+
+    def jump_to_record(self, record_id):
+        """Select and show the entry with a log store id, loading older history in the background as needed"""
+        if self.seek_thread is not None:
+            return  # Already loading history for another entry
+        if not self.history_loaded:
+            self.history_loaded = True
+            self.load_logs()
+        if self.select_record(record_id):
+            return
+        # Entries deleted by retention are known from the segment names alone
+        if self.history is None or not self.history.has_more() or record_id < self.log_store.first_id():
+            self.show_record_missing()
+            return
+
+        oldest_loaded_id = self.logs_model.record_ids[0] if self.logs_model.rowCount() else self.log_store.next_id
+        self.seek_thread = QThread()
+        self.seek_worker = HistorySeekWorker(self.history, record_id, oldest_loaded_id, LOG_PAGE_SIZE)
+        self.seek_worker.moveToThread(self.seek_thread)
+        self.seek_thread.started.connect(self.seek_worker.run)
+        self.seek_worker.progress.connect(self.on_seek_progress)
+        self.seek_worker.finished.connect(self.on_seek_finished)
+
+        parent = self.parent_window if self.parent_window else self
+        self.seek_progress = QProgressDialog("Loading older log entries...", "Cancel", 0, 0, parent)
+        self.seek_progress.setWindowTitle("Go to Entry")
+        self.seek_progress.setMinimumDuration(300)
+        self.seek_progress.canceled.connect(self.seek_worker.cancel)
+        self.seek_thread.start()
+
+    def on_seek_progress(self, done, total):
+        if self.seek_progress is not None:
+            self.seek_progress.setMaximum(max(total, done))
+            self.seek_progress.setValue(done)
+
+    def on_seek_finished(self, entries, found):
+        """Show the history read while seeking and select the entry if it was found"""
+        self.seek_thread.quit()
+        self.seek_thread.wait()
+        history = self.seek_worker.history
+        record_id = self.seek_worker.record_id
+        cancelled = self.seek_worker.cancelled
+        self.seek_thread = None
+        self.seek_worker = None
+        self.seek_progress.canceled.disconnect()
+        self.seek_progress.close()
+        self.seek_progress = None
+
+        if history is not self.history:
+            return  # The logs were cleared in the meantime
+        self.prepend_history(entries)
+        if found:
+            self.select_record(record_id)
+        elif not cancelled:
+            self.show_record_missing()
+
+    def select_record(self, record_id):
+        """Select and show a loaded entry. Returns False if it is not loaded"""
+        row = self.logs_model.row_for_record(record_id)
+        if row is None:
+            return False
+        index = self.logs_model.index(row, COL_MESSAGE)
+        self.logs_view.selectRow(row)
+        self.logs_view.scrollTo(index, QAbstractItemView.PositionAtCenter)
+        return True
+
+    def show_record_missing(self):
+        if self.parent_window and hasattr(self.parent_window, 'statusBar'):
+            self.parent_window.statusBar().showMessage("This entry is no longer in the log", 5000)
+
+    def dump_recent_log(self):
+        """Write the in-memory ring buffer of recent log records to a file"""
+        parent = self.parent_window if self.parent_window else self
+        file_path, _ = QFileDialog.getSaveFileName(
+            parent,
+            "Save Recent Log",
+            os.path.expanduser("~/auto_organizer_recent.log"),
+            "Log Files (*.log);;Text Files (*.txt);;All Files (*.*)"
+        )
+        if not file_path:
+            return
+        try:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                count = dump_recent(f)
+            QMessageBox.information(self, "Log Saved", f"Saved {count} recent messages to {file_path}")
+        except Exception as e:
+            QMessageBox.warning(self, "Save Error", f"Failed to save log: {str(e)}")
+
+    def show_failed_files(self):
+        """Show the files that could not be moved after all retries"""
+        file_processor = getattr(self.parent_window, 'file_processor', None)
+        if file_processor is None:
+            return
+        dialog = FailedFilesDialog(file_processor.retry_scheduler, self.parent_window)
+        dialog.exec_()
+
+    def show_undo_groups(self):
+        """Show the undo groups, to undo or redo one as a whole"""
+        dialog = UndoGroupsDialog(self, self.parent_window if self.parent_window else self)
+        dialog.exec_()
+
+    def handle_row_action(self, row):
+        """Undo or redo the file move of a row from its button"""
+        entry = self.logs_model.entry(row)
+        if not entry.has_actions() or not entry.current_location:
+            return
+
+        if entry.is_undone:
+            destination = entry.redo_destination()
+            if not self.handle_redo(entry.current_location, destination):
+                return
+            entry.is_undone = False
+        else:
+            destination = entry.undo_destination()
+            if not self.handle_undo(entry.current_location, destination):
+                return
+            entry.is_undone = True
+
+        # Update current location after a successful undo/redo
+        entry.current_location = destination
+        self.store_entry_state(entry)
+        self.check_file_status([destination])
 
     def update_undo_redo_buttons(self):
         """Update the state of undo/redo buttons"""
+        if self.bulk_thread is not None:
+            return  # Enabled again when Undo All / Redo All finishes
         self.undo_all_btn.setEnabled(self.undo_redo_manager.can_undo())
         self.redo_all_btn.setEnabled(self.undo_redo_manager.can_redo())
 
     def undo_all(self):
-        """Undo all actions in the undo stack"""
-        while self.undo_redo_manager.can_undo():
-            source, destination, entry = self.undo_redo_manager.undo()
-            try:
-                if os.path.exists(source):
-                    # Move the file back to its original location
-                    shutil.move(source, destination)
-                    entry.current_location = destination
-                    entry.is_undone = True
-                    self.log(f"Moved back to original location: {os.path.basename(destination)} (Undo)", 
-                            destination, source)
-            except Exception as e:
-                self.log(f"Undo error: {str(e)} (Undo)")
-        
-        self.update_undo_redo_buttons()
-        self.check_all_file_status()
+        """Undo all actions in the undo stack in the background"""
+        self.start_bulk_move(undo=True)
 
     def redo_all(self):
-        """Redo all undone actions"""
-        while self.undo_redo_manager.can_redo():
-            source, destination, entry = self.undo_redo_manager.redo()
-            try:
-                if os.path.exists(source):
-                    # Move the file back to its destination
-                    shutil.move(source, destination)
-                    entry.current_location = destination
-                    entry.is_undone = False
-                    self.log(f"Restored to: {os.path.dirname(destination)} (Redo)", 
-                            source, destination)
-            except Exception as e:
-                self.log(f"Redo error: {str(e)} (Redo)")
-        
+        """Redo all undone actions in the background"""
+        self.start_bulk_move(undo=False)
+
+    def start_bulk_move(self, undo, group=None):
+        """
+        Move the files of every undo (or redo) action on a thread pool with a
+        progress dialog. With an undo group, only its actions are moved and
+        the group is rolled back unless every file can be moved.
+        """
+        if self.bulk_thread is not None:
+            return
+        if group is not None:
+            actions = self.undo_redo_manager.group_actions(group.group_id, UNDO_STACK if undo else REDO_STACK)
+        elif undo:
+            actions = self.undo_redo_manager.take_all_undo()
+        else:
+            actions = self.undo_redo_manager.take_all_redo()
+        if not actions:
+            return
+
+        # Actions are (organized location, original location, entry)
+        if undo:
+            moves = [(entry.current_location or organized, original) for organized, original, entry in actions]
+        else:
+            moves = [(entry.current_location or original, organized) for organized, original, entry in actions]
+        self.bulk_actions = (undo, actions, moves, group)
+
+        self.bulk_thread = QThread()
+        self.bulk_worker = BulkMoveWorker(moves, atomic=group is not None)
+        self.bulk_worker.moveToThread(self.bulk_thread)
+        self.bulk_thread.started.connect(self.bulk_worker.run)
+        self.bulk_worker.progress.connect(self.on_bulk_progress)
+        self.bulk_worker.rolling_back.connect(self.on_bulk_rolling_back)
+        self.bulk_worker.finished.connect(self.on_bulk_finished)
+
+        parent = self.parent_window if self.parent_window else self
+        label = "Undoing moves..." if undo else "Redoing moves..."
+        self.bulk_progress = QProgressDialog(label, "Cancel", 0, len(moves), parent)
+        if group is not None:
+            self.bulk_progress.setWindowTitle("Undo Group" if undo else "Redo Group")
+        else:
+            self.bulk_progress.setWindowTitle("Undo All" if undo else "Redo All")
+        self.bulk_progress.setMinimumDuration(300)
+        self.bulk_progress.canceled.connect(self.bulk_worker.cancel)
+        self.undo_all_btn.setEnabled(False)
+        self.redo_all_btn.setEnabled(False)
+        self.bulk_thread.start()
+
+    def on_bulk_progress(self, done, total):
+        if self.bulk_progress is not None:
+            self.bulk_progress.setValue(done)
+
+    def on_bulk_rolling_back(self):
+        if self.bulk_progress is not None:
+            self.bulk_progress.setLabelText("Not every file could be moved, moving the others back...")
+            self.bulk_progress.setCancelButton(None)
+
+    def on_bulk_finished(self, results, rolled_back, rollback_errors):
+        """Apply the outcome of Undo All / Redo All or of an undo group and log it as one batch"""
+        self.bulk_thread.quit()
+        self.bulk_thread.wait()
+        self.bulk_thread = None
+        self.bulk_worker = None
+        self.bulk_progress.canceled.disconnect()
+        self.bulk_progress.close()
+        self.bulk_progress = None
+
+        undo, actions, moves, group = self.bulk_actions
+        self.bulk_actions = None
+        tag = "(Undo)" if undo else "(Redo)"
+        changed, records = [], []
+        for index, action in enumerate(actions):
+            if index in results and results[index] is None:
+                entry = action[2]
+                entry.current_location = moves[index][1]
+                entry.is_undone = undo
+                changed.append(entry)
+            elif results.get(index):
+                records.append((f"{'Undo' if undo else 'Redo'} error: {results[index]} {tag}", None, None))
+        for index, error in rollback_errors.items():
+            records.append((f"Rollback error: {error} {tag}", None, None))
+
+        # Moved entries change stacks in store_entry_states(), the rest stay where they are
+        if group is not None:
+            name = f"{'Undo' if undo else 'Redo'} group from {group.started().strftime('%Y-%m-%d %H:%M:%S')}"
+            if not rolled_back:
+                summary = f"{name}: moved {len(changed)} files {tag}"
+            elif rollback_errors:
+                summary = f"{name} failed, {len(rollback_errors)} files could not be moved back {tag}"
+            else:
+                summary = f"{name} rolled back, no files were changed {tag}"
+        elif undo:
+            summary = f"Undo All: moved {len(changed)} files back to their original folders {tag}"
+        else:
+            summary = f"Redo All: moved {len(changed)} files back to their organized folders {tag}"
+        skipped = len(actions) - len(results)
+        if skipped and group is None:
+            summary = summary[:-len(tag)] + f"- cancelled, {skipped} not moved {tag}"
+
+        self.store_entry_states(changed)
+        self.log_batch([(summary, None, None)] + records)
         self.update_undo_redo_buttons()
-        self.check_all_file_status()
+        self.check_visible_file_status()
 
     def log(self, message, source=None, destination=None):
         """Add a new log entry"""
+        self.log_batch([(message, source, destination)])
+
+    def log_batch(self, records):
+        """
+        Add several (message, source, destination) log entries with one view
+        update. A record may have a fourth item, a dict of extra fields stored
+        with it, e.g. the checksum of a verified copy.
+        """
         timestamp = QDateTime.currentDateTime().toString("yyyy-MM-dd hh:mm:ss")
-        
-        if source is not None and destination is not None:
-            # Check if this is an original move message
-            is_original_move = not ("Moved back" in message or "(Undo)" in message or "(Redo)" in message)
-            
-            # Create log entry
-            log_entry = LogEntry(message, source, destination, timestamp)
-            
-            # Connect undo/redo signals
-            log_entry.undo_requested.connect(self.handle_undo)
-            log_entry.redo_requested.connect(self.handle_redo)
-            
+        entries = []
+        store_records = []  # As written to the log store, for the search index
+        undo_moves = []  # Added to the undo history together, in one transaction
+
+        for message, source, destination, *fields in records:
+            if source and destination:
+                # Check if this is an original move message
+                is_original_move = not ("Moved back" in message or "(Undo)" in message or "(Redo)" in message)
+
+                # Create log entry
+                log_entry = LogEntry(message, source, destination, timestamp)
+            else:
+                # Create simple log entry for messages without source/destination
+                log_entry = LogEntry(message, timestamp=timestamp)
+                is_original_move = False
+
+            record = log_entry.to_dict()
+            if fields and fields[0]:
+                record.update(fields[0])
+            if is_original_move:
+                # Moves of one scan or burst are undone together
+                record["group"] = self.undo_redo_manager.group_for(log_entry.ts)
+            log_entry.record_id = self.log_store.append(record)
             if is_original_move:
                 # Add to undo stack for original moves
-                self.undo_redo_manager.push_action(destination, source, log_entry)
-                self.update_undo_redo_buttons()
-            
-            self.log_entries.append(log_entry.to_dict())
-            self.logs_container_layout.addWidget(log_entry)
-        else:
-            # Create simple log entry for messages without source/destination
-            log_entry = LogEntry(message, timestamp=timestamp)
-            self.log_entries.append(log_entry.to_dict())
-            self.logs_container_layout.addWidget(log_entry)
-            
-        # Auto-scroll to bottom
-        self.logs_area.verticalScrollBar().setValue(
-            self.logs_area.verticalScrollBar().maximum()
-        )
+                undo_moves.append((destination, source, log_entry, record["group"]))
+            entries.append(log_entry)
+            store_records.append(record)
+
+        if undo_moves:
+            self.undo_redo_manager.push_actions(undo_moves)
+            self.update_undo_redo_buttons()
+
+        # Auto-scroll to bottom, unless the user scrolled up to read older entries
+        scroll_bar = self.logs_view.verticalScrollBar()
+        at_bottom = scroll_bar.value() >= scroll_bar.maximum()
+        self.logs_model.append_entries(entries)
+        if at_bottom:
+            self.logs_view.scrollToBottom()
+
+        # Check the files that were just moved
+        self.check_file_status([entry.current_location for entry in entries if entry.current_location])
         
-        # Save logs after each new entry
-        self.save_logs()
+        # Write the new entries with the next batch
+        self.schedule_save()
+        self.search_index.add(store_records)
+
+    def schedule_save(self):
+        """Flush the log store soon, batching entries logged in the meantime"""
+        if not self.flush_timer.isActive():
+            self.flush_timer.start(LOG_FLUSH_INTERVAL_MS)
+
+    def store_entry_state(self, entry):
+        """Persist the location and undo state of an entry after an undo or redo"""
+        self.store_entry_states([entry])
+
+    def store_entry_states(self, entries):
+        """Persist the location and undo state of several entries at once"""
+        for entry in entries:
+            self.logs_model.update_entry(entry)
+            self.log_store.update(entry.record_id,
+                                  current_location=entry.current_location,
+                                  is_undone=entry.is_undone)
+        self.schedule_save()
+        self.search_index.update_locations([(entry.record_id, entry.current_location) for entry in entries])
+        self.undo_redo_manager.set_state(entries)
 
     def clear_logs(self):
         """Clear all log entries"""
@@ -369,24 +775,59 @@ class LogsTab(BaseTab):
         )
         
         if confirm == QMessageBox.Yes:
-            for i in reversed(range(self.logs_container_layout.count())):
-                widget = self.logs_container_layout.itemAt(i).widget()
-                if widget:
-                    widget.setParent(None)
-            self.log_entries = []
+            if self.seek_worker is not None:
+                self.seek_worker.cancel()
+            self.logs_model.clear()
+            self.history = None
             self.undo_redo_manager.clear()
             self.update_undo_redo_buttons()
-            self.save_logs()
-
-    def check_all_file_status(self):
-        """Check status of all files in log entries"""
-        for i in range(self.logs_container_layout.count()):
-            widget = self.logs_container_layout.itemAt(i).widget()
-            if isinstance(widget, LogEntry):
-                widget.update_file_status()
+            self.log_store.clear()
+            self.search_index.clear()
+
+    def check_file_status(self, paths):
+        """Check the given files in the background"""
+        if paths:
+            self.check_requested.emit(paths)
+
+    def check_visible_file_status(self):
+        """Check the files of the rows on screen in the background"""
+        if not self.isVisible() or not self.logs_model.rowCount():
+            return
+        first = self.logs_view.rowAt(0)
+        last = self.logs_view.rowAt(self.logs_view.viewport().height() - 1)
+        if first < 0:
+            return
+        if last < 0:
+            last = self.logs_model.rowCount() - 1
+        self.check_file_status(self.logs_model.paths_for_rows(first, last))
+
+    def verify_all_files(self):
+        """Check every loaded entry in the background"""
+        paths = self.logs_model.paths_for_rows(0, self.logs_model.rowCount() - 1)
+        if not paths:
+            return
+        self.verify_btn.setEnabled(False)
+        self.verify_btn.setText("Verifying...")
+        self.verify_requested.emit(paths)
+
+    def on_verify_progress(self, done, total):
+        self.verify_btn.setText(f"Verifying {done * 100 // total}%")
+
+    def on_verify_finished(self, checked, missing):
+        self.verify_btn.setText("Verify Files")
+        self.verify_btn.setEnabled(True)
+        if self.parent_window and hasattr(self.parent_window, 'statusBar'):
+            self.parent_window.statusBar().showMessage(
+                f"Verified {checked} files, {missing} missing", 5000)
+
+    def stop_status_checker(self):
+        """Stop the status checker thread before the app exits"""
+        self.status_timer.stop()
+        self.status_thread.quit()
+        self.status_thread.wait(2000)
         
     def handle_undo(self, source, destination):
-        """Handle undo request from log entry"""
+        """Handle undo request from log entry. Returns True if the file was moved"""
         try:
             if os.path.exists(source):
                 # Ensure the destination directory exists
@@ -397,15 +838,17 @@ class LogsTab(BaseTab):
                 self.log(f"Moved back to original location: {os.path.basename(destination)} (Undo)", 
                         destination, source)
                 
-                # Update all file statuses
-                self.check_all_file_status()
+                # The file left its old location
+                self.check_file_status([source])
+                return True
             else:
                 self.log(f"Undo failed: File not found at {source} (Undo)")
         except Exception as e:
             self.log(f"Undo error: {str(e)} (Undo)")
+        return False
 
     def handle_redo(self, source, destination):
-        """Handle redo request from log entry"""
+        """Handle redo request from log entry. Returns True if the file was moved"""
         try:
             if os.path.exists(source):
                 # Ensure the destination directory exists
@@ -416,119 +859,142 @@ class LogsTab(BaseTab):
                 self.log(f"Restored to: {os.path.dirname(destination)} (Redo)", 
                         source, destination)
                 
-                # Update all file statuses
-                self.check_all_file_status()
+                # The file left its old location
+                self.check_file_status([source])
+                return True
             else:
                 self.log(f"Redo failed: File not found at {source} (Redo)")
         except Exception as e:
             self.log(f"Redo error: {str(e)} (Redo)")
+        return False
             
     def save_logs(self):
-        """Save logs to file"""
-        try:
-            with open(LOGS_FILE, 'w') as f:
-                json.dump(self.log_entries, f)
-        except Exception as e:
-            print(f"Error saving logs: {str(e)}")
+        """Write buffered log entries to the log store"""
+        self.flush_timer.stop()
+        self.log_store.flush()
             
+    def showEvent(self, event):
+        """Load the most recent history the first time the tab is shown"""
+        super().showEvent(event)
+        if not self.history_loaded:
+            self.history_loaded = True
+            self.load_logs()
+            self.logs_view.scrollToBottom()
+        self.scroll_check_timer.start(0)
+        self.status_timer.start()
+
+    def hideEvent(self, event):
+        """Stop checking files while the tab is hidden, e.g. in the tray"""
+        super().hideEvent(event)
+        self.status_timer.stop()
+
+    def on_logs_scrolled(self, value):
+        """Fetch an older page of history when scrolled to the top"""
+        if self.history_loaded and value == self.logs_view.verticalScrollBar().minimum():
+            self.load_logs()
+        self.scroll_check_timer.start(SCROLL_CHECK_DELAY_MS)
+
     def load_logs(self):
-        """Load logs from file"""
-        if not os.path.exists(LOGS_FILE):
-            return
-            
+        """Load the next older page of logs from the log store. Returns the number of entries added"""
+        if self.history is None or self.seek_thread is not None or not self.history.has_more():
+            return 0
         try:
-            with open(LOGS_FILE, 'r') as f:
-                logs_data = json.load(f)
-                
-            for log_data in logs_data:
-                log_entry = LogEntry(
-                    message=log_data.get("message", ""),
-                    source=log_data.get("original_source"),
-                    destination=log_data.get("original_destination"),
-                    timestamp=log_data.get("timestamp"),
-                    is_undone=log_data.get("is_undone", False)
-                )
-                
-                if log_data.get("original_source") and log_data.get("original_destination"):
-                    log_entry.current_location = log_data.get("current_location")
-                    log_entry.undo_requested.connect(self.handle_undo)
-                    log_entry.redo_requested.connect(self.handle_redo)
-                    
-                self.logs_container_layout.addWidget(log_entry)
-                
-            self.log_entries = logs_data
-            self.check_all_file_status()
+            logs_data = self.history.read_page(LOG_PAGE_SIZE)
+            if not logs_data:
+                return 0
+            self.prepend_history([LogEntry.from_dict(log_data) for log_data in logs_data])
+            return len(logs_data)
                 
         except Exception as e:
             print(f"Error loading logs: {str(e)}")
+            self.history = None
             self.log(f"Error loading previous logs: {str(e)}")
+            return 0
+
+    def prepend_history(self, entries):
+        """Add older entries above the loaded ones, keeping the rows the user is looking at in place"""
+        if not entries:
+            return
+        scroll_bar = self.logs_view.verticalScrollBar()
+        position = scroll_bar.value()
+        self.logs_model.prepend_entries(entries)
+        self.logs_view.updateGeometries()
+        scroll_bar.setValue(position + len(entries) * self.logs_view.verticalHeader().defaultSectionSize())
 
     def export_logs(self):
-        """Export logs to a file within a date range"""
+        """Export the logs of a date range to a file in the background"""
+        if self.export_thread is not None:
+            return  # An export is already running
+
         # Use the main application window as parent
-        dialog = DateRangeDialog(self.parent_window if self.parent_window else self)
+        parent = self.parent_window if self.parent_window else self
+        dialog = DateRangeDialog(parent)
         if dialog.exec_() != QDialog.Accepted:
             return
-            
         start_date, end_date = dialog.get_range()
-        start_date_str = start_date.toString("yyyy-MM-dd hh:mm:ss")
-        end_date_str = end_date.toString("yyyy-MM-dd hh:mm:ss")
-        
-        # Filter logs based on date range
-        filtered_logs = []
-        try:
-            for log_entry in self.log_entries:
-                log_dict = log_entry.to_dict()
-                log_time = QDateTime.fromString(log_dict["timestamp"], "yyyy-MM-dd hh:mm:ss")
-                if start_date <= log_time <= end_date:
-                    filtered_logs.append(log_dict)
-                else:
-                    continue
-        except ValueError as e:
-            QMessageBox.warning(self, "Date Format Error", f"Error parsing date range: {str(e)}")
+        if start_date > end_date:
+            QMessageBox.warning(self, "Invalid Date Range", "The start date must be before the end date.")
             return
-        
-        if not filtered_logs:
-            QMessageBox.information(
-                self, 
-                "No Logs in Range", 
-                f"No logs found between {start_date_str} and {end_date_str}."
-            )
-            return
-            
-        # Ask user for save location - use parent window to prevent flashing
-        parent = self.parent_window if self.parent_window else self
+
         file_path, _ = QFileDialog.getSaveFileName(
             parent,
             "Save Logs",
             os.path.expanduser("~/logs_export.json"),
-            "JSON Files (*.json);;Text Files (*.txt);;All Files (*.*)"
+            "JSON Files (*.json);;JSON Lines Files (*.jsonl);;CSV Files (*.csv);;Text Files (*.txt);;All Files (*.*)"
         )
-        
         if not file_path:
             return  # User cancelled
-            
-        try:
-            # Determine format based on extension
-            if file_path.lower().endswith('.json'):
-                # Save as JSON
-                with open(file_path, 'w') as f:
-                    json.dump(filtered_logs, f, indent=2)
-            else:
-                # Save as plain text
-                with open(file_path, 'w') as f:
-                    for log in filtered_logs:
-                        f.write(f"[{log.get('timestamp', '')}] {log.get('message', '')}\n")
-                        
+
+        self.export_range = (start_date.toString("yyyy-MM-dd hh:mm:ss"), end_date.toString("yyyy-MM-dd hh:mm:ss"))
+        # Whole seconds are shown, so the end second is included
+        start_ts = start_date.toSecsSinceEpoch()
+        end_ts = end_date.toSecsSinceEpoch() + 0.999999
+
+        # Write pending entries here, the export thread only reads
+        self.save_logs()
+        self.export_thread = QThread()
+        self.export_worker = LogExportWorker(self.log_store, file_path, start_ts, end_ts)
+        self.export_worker.moveToThread(self.export_thread)
+        self.export_thread.started.connect(self.export_worker.run)
+        self.export_worker.progress.connect(self.on_export_progress)
+        self.export_worker.finished.connect(self.on_export_finished)
+
+        self.export_progress = QProgressDialog("Exporting logs...", "Cancel", 0, 0, parent)
+        self.export_progress.setWindowTitle("Export Logs")
+        self.export_progress.setMinimumDuration(300)
+        self.export_progress.canceled.connect(self.export_worker.cancel)
+        self.export_btn.setEnabled(False)
+        self.export_thread.start()
+
+    def on_export_progress(self, done, total):
+        if self.export_progress is not None:
+            self.export_progress.setMaximum(total)
+            self.export_progress.setValue(done)
+
+    def on_export_finished(self, count, error):
+        """Clean up after an export and report the result"""
+        self.export_thread.quit()
+        self.export_thread.wait()
+        file_path = self.export_worker.path
+        self.export_thread = None
+        self.export_worker = None
+        self.export_progress.canceled.disconnect()
+        self.export_progress.close()
+        self.export_progress = None
+        self.export_btn.setEnabled(True)
+
+        start_date_str, end_date_str = self.export_range
+        if error:
+            QMessageBox.warning(self, "Export Error", f"Failed to export logs: {error}")
+        elif count == 0:
             QMessageBox.information(
-                self, 
-                "Export Successful", 
-                f"Exported {len(filtered_logs)} logs to {file_path}"
+                self,
+                "No Logs in Range",
+                f"No logs found between {start_date_str} and {end_date_str}."
+            )
+        elif count > 0:
+            QMessageBox.information(
+                self,
+                "Export Successful",
+                f"Exported {count} logs to {file_path}"
             )
-                
-        except Exception as e:
-            QMessageBox.warning(
-                self, 
-                "Export Error", 
-                f"Failed to export logs: {str(e)}"
-            )
\ No newline at end of file
@@ -1,25 +1,11 @@
-import os
 from PyQt5.QtWidgets import (
     QLabel, QPushButton, QTableWidget, QTableWidgetItem,
     QAbstractItemView, QHeaderView, QHBoxLayout, QFileDialog
 )
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QIcon
 from tabs.base_tab import BaseTab
-
-# Import functions from main app
-try:
-    from watcher_app import get_resource_path, safe_icon
-except ImportError:
-    # Fallback implementations for when running the tab directly
-    def get_resource_path(relative_path):
-        return os.path.join(os.path.dirname(__file__), '..', relative_path)
-
-    def safe_icon(icon_path):
-        path = get_resource_path(icon_path)
-        if os.path.exists(path):
-            return QIcon(path)
-        return QIcon()
+from theme_styles import START_BUTTON_STYLE, set_style_sheet
+from resources import safe_icon
 
 class MainTab(BaseTab):
     """Main tab with watcher pairs functionality"""
@@ -55,7 +41,7 @@ class MainTab(BaseTab):
         buttons = QHBoxLayout()
 
         self.btn_add = QPushButton("Add Folder Pair")
-        self.btn_add.setIcon(safe_icon("icons/add.png") if os.path.exists(get_resource_path("icons/add.png")) else QIcon())
+        self.btn_add.setIcon(safe_icon("icons/add.png", fallback=False))
         self.btn_add.setMinimumHeight(30)
         self.btn_add.setStyleSheet("""
             QPushButton {
@@ -79,7 +65,7 @@ class MainTab(BaseTab):
         self.btn_add.clicked.connect(self.add_pair)
 
         self.btn_remove = QPushButton("Remove Selected")
-        self.btn_remove.setIcon(safe_icon("icons/remove.png") if os.path.exists(get_resource_path("icons/remove.png")) else QIcon())
+        self.btn_remove.setIcon(safe_icon("icons/remove.png", fallback=False))
         self.btn_remove.setMinimumHeight(30)
         self.btn_remove.setStyleSheet("""
             QPushButton {
@@ -109,29 +95,36 @@ class MainTab(BaseTab):
         # Action button with improved appearance
         actions = QHBoxLayout()
         self.toggle_btn = QPushButton("Start Watching")
-        self.toggle_btn.setIcon(safe_icon("icons/play.png") if os.path.exists(get_resource_path("icons/play.png")) else QIcon())
+        self.toggle_btn.setIcon(safe_icon("icons/play.png", fallback=False))
         self.toggle_btn.setMinimumHeight(36)  # Make button taller
-        self.toggle_btn.setStyleSheet("""
+        self.toggle_btn.setStyleSheet(START_BUTTON_STYLE)
+        actions.addWidget(self.toggle_btn)
+
+        # Organize now button - queues everything in the watch folders ahead of background scans
+        self.organize_now_btn = QPushButton("Organize Now")
+        self.organize_now_btn.setToolTip("Organize all matching files in the watch folders right away")
+        self.organize_now_btn.setMinimumHeight(36)
+        self.organize_now_btn.setStyleSheet("""
             QPushButton {
-                background-color: #2196F3;
+                background-color: #607D8B;
                 color: white;
                 font-weight: bold;
                 font-size: 14px;
                 border-radius: 4px;
                 padding: 8px 16px;
-                border: 2px solid #1976D2;
+                border: 2px solid #455A64;
                 outline: none;
             }
             QPushButton:hover {
-                background-color: #0b7dda;
-                border: 2px solid #0D47A1;
+                background-color: #546E7A;
+                border: 2px solid #37474F;
             }
             QPushButton:pressed {
-                background-color: #1565C0;
-                border: 2px solid #0D47A1;
+                background-color: #455A64;
+                border: 2px solid #263238;
             }
         """)
-        actions.addWidget(self.toggle_btn)
+        actions.addWidget(self.organize_now_btn)
         self.main_layout.addLayout(actions)
 
         # Status label - styling will be set by update_status_style
@@ -213,7 +206,7 @@ class MainTab(BaseTab):
         """Update table styling based on current theme"""
         if self.is_dark_mode:
             # Dark mode styling
-            self.table.setStyleSheet("""
+            set_style_sheet(self.table, """
                 QTableWidget {
                     gridline-color: #3a3a3a;
                     border: 1px solid #505050;
@@ -240,7 +233,7 @@ class MainTab(BaseTab):
             """)
         else:
             # Light mode styling
-            self.table.setStyleSheet("""
+            set_style_sheet(self.table, """
                 QTableWidget {
                     gridline-color: #d0d0d0;
                     border: 1px solid #c0c0c0;
@@ -275,7 +268,7 @@ class MainTab(BaseTab):
 
         if "Watching" in text:
             if self.is_dark_mode:
-                self.status.setStyleSheet("""
+                set_style_sheet(self.status, """
                     QLabel {
                         font-weight: bold;
                         font-size: 14px;
@@ -288,7 +281,7 @@ class MainTab(BaseTab):
                     }
                 """)
             else:
-                self.status.setStyleSheet("""
+                set_style_sheet(self.status, """
                     QLabel {
                         font-weight: bold;
                         font-size: 14px;
@@ -302,7 +295,7 @@ class MainTab(BaseTab):
                 """)
         elif "❗" in text:
             if self.is_dark_mode:
-                self.status.setStyleSheet("""
+                set_style_sheet(self.status, """
                     QLabel {
                         font-weight: bold;
                         font-size: 14px;
@@ -315,7 +308,7 @@ class MainTab(BaseTab):
                     }
                 """)
             else:
-                self.status.setStyleSheet("""
+                set_style_sheet(self.status, """
                     QLabel {
                         font-weight: bold;
                         font-size: 14px;
@@ -329,7 +322,7 @@ class MainTab(BaseTab):
                 """)
         else:
             if self.is_dark_mode:
-                self.status.setStyleSheet("""
+                set_style_sheet(self.status, """
                     QLabel {
                         font-weight: bold;
                         font-size: 14px;
@@ -342,7 +335,7 @@ class MainTab(BaseTab):
                     }
                 """)
             else:
-                self.status.setStyleSheet("""
+                set_style_sheet(self.status, """
                     QLabel {
                         font-weight: bold;
                         font-size: 14px;
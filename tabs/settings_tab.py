@@ -161,6 +161,61 @@ class SettingsTab(BaseTab):
         theme_container.addStretch()
         g_layout.addLayout(theme_container)
 
+        # Duplicate handling selector
+        dedupe_container = QHBoxLayout()
+        dedupe_label = QLabel("Duplicate files:")
+        dedupe_label.setStyleSheet(theme_label.styleSheet())
+
+        self.dedupe_combo = QComboBox()
+        self.dedupe_combo.addItem("Keep both", "off")
+        self.dedupe_combo.addItem("Hardlink duplicates", "hardlink")
+        self.dedupe_combo.addItem("Delete duplicates", "delete")
+        self.dedupe_combo.setMinimumHeight(30)
+        self.dedupe_combo.setToolTip("What to do when an identical file is already stored in the target folder")
+        self.dedupe_combo.currentIndexChanged.connect(self.on_dedupe_mode_changed)
+
+        dedupe_container.addWidget(dedupe_label)
+        dedupe_container.addWidget(self.dedupe_combo)
+        dedupe_container.addStretch()
+        g_layout.addLayout(dedupe_container)
+
+        # Copy verification selector
+        verify_container = QHBoxLayout()
+        verify_label = QLabel("Verify copies:")
+        verify_label.setStyleSheet(theme_label.styleSheet())
+
+        self.verify_combo = QComboBox()
+        self.verify_combo.addItem("Off", "off")
+        self.verify_combo.addItem("Sampled", "sampled")
+        self.verify_combo.addItem("Full", "full")
+        self.verify_combo.setMinimumHeight(30)
+        self.verify_combo.setToolTip("Checksum files copied to another drive before the original is deleted")
+        self.verify_combo.currentIndexChanged.connect(self.on_verify_mode_changed)
+
+        verify_container.addWidget(verify_label)
+        verify_container.addWidget(self.verify_combo)
+        verify_container.addStretch()
+        g_layout.addLayout(verify_container)
+
+        # Log level selector
+        log_level_container = QHBoxLayout()
+        log_level_label = QLabel("Log level:")
+        log_level_label.setStyleSheet(theme_label.styleSheet())
+
+        self.log_level_combo = QComboBox()
+        self.log_level_combo.addItem("Errors", "error")
+        self.log_level_combo.addItem("Warnings", "warning")
+        self.log_level_combo.addItem("Info", "info")
+        self.log_level_combo.addItem("Debug", "debug")
+        self.log_level_combo.setMinimumHeight(30)
+        self.log_level_combo.setToolTip("Lowest level of messages shown in the Logs tab")
+        self.log_level_combo.currentIndexChanged.connect(self.on_log_level_changed)
+
+        log_level_container.addWidget(log_level_label)
+        log_level_container.addWidget(self.log_level_combo)
+        log_level_container.addStretch()
+        g_layout.addLayout(log_level_container)
+
         group.setLayout(g_layout)
         self.main_layout.addWidget(group)
 
@@ -202,6 +257,10 @@ class SettingsTab(BaseTab):
         config["auto_update_check"] = self.auto_update_chk.isChecked()
         config["show_notifications"] = self.notifications_chk.isChecked()
         config["theme"] = self.theme_combo.currentText()
+        config["dedupe_mode"] = self.dedupe_combo.currentData()
+        config["verify_mode"] = self.verify_combo.currentData()
+        config["log_level"] = self.log_level_combo.currentData()
+        config["verbose_logging"] = config["log_level"] == "debug"
 
     def set_dark_mode(self, is_dark):
         """Set dark mode and update styling"""
@@ -212,7 +271,7 @@ class SettingsTab(BaseTab):
     def update_theme_selector_style(self):
         """Update theme selector styling based on current theme"""
         if self.is_dark_mode:
-            self.theme_combo.setStyleSheet("""
+            combo_style = """
                 QComboBox {
                     font-size: 13px;
                     padding: 5px 10px;
@@ -263,9 +322,9 @@ class SettingsTab(BaseTab):
                 QComboBox QAbstractItemView::item:hover {
                     background-color: rgba(0, 120, 215, 0.4);
                 }
-            """)
+            """
         else:
-            self.theme_combo.setStyleSheet("""
+            combo_style = """
                 QComboBox {
                     font-size: 13px;
                     padding: 5px 10px;
@@ -313,7 +372,13 @@ class SettingsTab(BaseTab):
                 QComboBox QAbstractItemView::item:hover {
                     background-color: rgba(0, 120, 215, 0.2);
                 }
-            """)
+            """
+
+        # Apply the style to all selectors
+        self.theme_combo.setStyleSheet(combo_style)
+        self.dedupe_combo.setStyleSheet(combo_style)
+        self.verify_combo.setStyleSheet(combo_style)
+        self.log_level_combo.setStyleSheet(combo_style)
 
     def on_theme_changed(self, theme):
         """Handle theme changes and emit signal"""
@@ -324,6 +389,27 @@ class SettingsTab(BaseTab):
             # Show a message in the status bar
             self.parent_window.statusBar().showMessage(f"Theme changed to: {theme}", 3000)
 
+    def on_dedupe_mode_changed(self, index):
+        """Handle duplicate handling changes and trigger auto-save"""
+        if not self.is_initializing and self.parent_window:
+            self.parent_window.auto_save_settings()
+            self.parent_window.statusBar().showMessage(
+                f"Duplicate files: {self.dedupe_combo.itemText(index)}", 3000)
+
+    def on_verify_mode_changed(self, index):
+        """Handle copy verification changes and trigger auto-save"""
+        if not self.is_initializing and self.parent_window:
+            self.parent_window.auto_save_settings()
+            self.parent_window.statusBar().showMessage(
+                f"Verify copies: {self.verify_combo.itemText(index)}", 3000)
+
+    def on_log_level_changed(self, index):
+        """Handle log level changes and trigger auto-save"""
+        if not self.is_initializing and self.parent_window:
+            self.parent_window.auto_save_settings()
+            self.parent_window.statusBar().showMessage(
+                f"Log level: {self.log_level_combo.itemText(index)}", 3000)
+
     def on_checkbox_changed(self, checkbox, state):
         """Handle checkbox state changes and trigger auto-save"""
         if not self.is_initializing and self.parent_window:
@@ -424,6 +510,15 @@ class SettingsTab(BaseTab):
             }.get(current_theme, 0)
             self.theme_combo.setCurrentIndex(theme_index)
 
+            dedupe_index = self.dedupe_combo.findData(config.get("dedupe_mode", "off"))
+            self.dedupe_combo.setCurrentIndex(max(dedupe_index, 0))
+
+            verify_index = self.verify_combo.findData(config.get("verify_mode", "off"))
+            self.verify_combo.setCurrentIndex(max(verify_index, 0))
+
+            log_level_index = self.log_level_combo.findData(config.get("log_level", "info"))
+            self.log_level_combo.setCurrentIndex(log_level_index if log_level_index >= 0 else 2)
+
             # Reconnect signals
             if self.parent_window:
                 self.start_launch_chk.stateChanged.connect(lambda state: self.on_checkbox_changed(self.start_launch_chk, state))
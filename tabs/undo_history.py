@@ -0,0 +1,328 @@
+import os, sqlite3, threading, datetime
+
+# Undo/redo stacks, next to the log segments
+UNDO_DB_NAME = "undo.db"
+
+# Records read from the log per transaction while catching up
+UNDO_BATCH_SIZE = 5000
+
+# Stacks an action can be on
+UNDO_STACK = 0
+REDO_STACK = 1
+NO_STACK = 2  # Cannot be undone or redone as a whole any more
+
+# Moves read from the log are placed below every action pushed by the app,
+# in log order, by offsetting their record id
+CAUGHT_UP_SEQ_OFFSET = 2 ** 40
+
+# Moves less than this many seconds apart are one undo group, so a scan or
+# a burst of downloads is undone or redone as a single transaction
+UNDO_GROUP_GAP_SECONDS = 60
+
+# Most recent groups listed in the Undo Groups dialog
+MAX_UNDO_GROUPS = 200
+
+class UndoAction:
+    """A file move that can be undone, as stored in the undo history"""
+    __slots__ = ("record_id", "original_source", "original_destination", "current_location", "is_undone")
+
+    def __init__(self, record_id, source, destination, location, is_undone):
+        self.record_id = record_id
+        self.original_source = source
+        self.original_destination = destination
+        self.current_location = location
+        self.is_undone = is_undone
+
+class UndoGroup:
+    """Summary of the moves of one undo group, as listed by UndoRedoManager.groups()"""
+    __slots__ = ("group_id", "count", "undoable", "redoable")
+
+    def __init__(self, group_id, count, undoable, redoable):
+        self.group_id = group_id
+        self.count = count
+        self.undoable = undoable  # Moves on the undo stack
+        self.redoable = redoable  # Moves on the redo stack
+
+    def started(self):
+        """When the first move of the group was made"""
+        return datetime.datetime.fromtimestamp(self.group_id / 1000)
+
+class UndoGrouper:
+    """Assigns moves to undo groups by time: a gap longer than UNDO_GROUP_GAP_SECONDS starts a new one"""
+
+    def __init__(self):
+        self.group_id = None
+        self.last_ts = None
+
+    def group_for(self, ts):
+        """Group of a move made at ts (epoch seconds), moves must come in time order"""
+        if self.group_id is None or ts - self.last_ts > UNDO_GROUP_GAP_SECONDS:
+            # Named after when the group started, in milliseconds
+            self.group_id = int(ts * 1000)
+        self.last_ts = ts
+        return self.group_id
+
+class UndoRedoManager:
+    """
+    Undo and redo stacks of file moves, kept in SQLite so they survive restarts.
+
+    Every undoable move in the log has a row keyed by its log record id,
+    with the stack it is on and its position there. Nothing is loaded into
+    memory: the top of a stack, whether it is empty and the move whose file
+    is at a given path are single indexed lookups. catch_up() adds the moves
+    the log has and the history does not, e.g. on first start, on a
+    background thread.
+
+    Actions are returned as (organized location, original location, entry)
+    tuples; after an entry was undone or redone, pass it to set_state().
+
+    Each move also belongs to an undo group, the moves made within
+    UNDO_GROUP_GAP_SECONDS of each other, e.g. one scan or one burst of
+    downloads, so they can be undone or redone together.
+    """
+
+    def __init__(self, path):
+        self.lock = threading.Lock()
+        self.path = path
+        self.connection = None
+        self.caught_up = False  # Every move up to the newest is in the history
+        self.grouper = UndoGrouper()  # Groups of the moves made by this session
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self.connection = sqlite3.connect(path, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            # Id up to which every move of the log is in the history
+            self.connection.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value INTEGER)")
+            columns = [row[1] for row in self.connection.execute("PRAGMA table_info(actions)")]
+            if columns and "group_id" not in columns:
+                # History from before undo groups, rebuilt from the log by catch_up()
+                self.connection.execute("DROP TABLE actions")
+                self.connection.execute("DELETE FROM state")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS actions ("
+                "id INTEGER PRIMARY KEY, source TEXT NOT NULL, destination TEXT NOT NULL, "
+                "location TEXT, stack INTEGER NOT NULL, seq INTEGER NOT NULL, group_id INTEGER NOT NULL)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS actions_stack ON actions (stack, seq)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS actions_location ON actions (location)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS actions_group ON actions (group_id, stack, seq)")
+            self.connection.commit()
+            row = self.connection.execute("SELECT MAX(seq) FROM actions").fetchone()
+            self.next_seq = max(row[0] or 0, 0) + 1
+        except Exception as e:
+            print(f"Error opening undo history {path}: {str(e)}")
+            self.connection = None
+            self.next_seq = 1
+
+    def _execute(self, sql, params=(), many=False):
+        """Run a statement and commit, returning the cursor. None if the history is unavailable"""
+        if self.connection is None:
+            return None
+        try:
+            with self.lock:
+                if many:
+                    cursor = self.connection.executemany(sql, params)
+                else:
+                    cursor = self.connection.execute(sql, params)
+                self.connection.commit()
+                return cursor
+        except Exception as e:
+            print(f"Error updating undo history: {str(e)}")
+            return None
+
+    def _query(self, sql, params=()):
+        if self.connection is None:
+            return []
+        with self.lock:
+            return self.connection.execute(sql, params).fetchall()
+
+    def _take_seq(self, count=1):
+        with self.lock:
+            first = self.next_seq
+            self.next_seq += count
+        return first
+
+    def group_for(self, ts):
+        """Undo group for a move made now at ts, to store with its log record"""
+        return self.grouper.group_for(ts)
+
+    def push_action(self, source, destination, log_entry, group_id=None):
+        """Add a new move (organized location, original location) to the undo stack"""
+        self.push_actions([(source, destination, log_entry, group_id)])
+
+    def push_actions(self, moves):
+        """
+        Add new moves to the undo stack in one transaction, e.g. the moves of
+        one log batch. moves are (organized location, original location,
+        log entry, group id or None) tuples, oldest first.
+        """
+        moves = [move for move in moves if move[2].record_id is not None]
+        if not moves or self.connection is None:
+            return
+        seq = self._take_seq(len(moves))
+        rows = []
+        for number, (source, destination, log_entry, group_id) in enumerate(moves):
+            if group_id is None:
+                group_id = self.group_for(log_entry.ts)
+            rows.append((log_entry.record_id, destination, source, source, UNDO_STACK, seq + number, group_id))
+        try:
+            with self.lock:
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO actions (id, source, destination, location, stack, seq, group_id) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                # Clear redo stack when new actions are performed, and forget any
+                # earlier move whose file was just organized again
+                self.connection.execute("UPDATE actions SET stack = ? WHERE stack = ?", (NO_STACK, REDO_STACK))
+                self.connection.executemany(
+                    "UPDATE actions SET stack = ? WHERE location = ? AND id < ?",
+                    [(NO_STACK, destination, log_entry.record_id) for _, destination, log_entry, _ in moves])
+                if self.caught_up:
+                    self.connection.execute("INSERT OR REPLACE INTO state (key, value) VALUES ('indexed_through', ?)",
+                                            (moves[-1][2].record_id,))
+                self.connection.commit()
+        except Exception as e:
+            print(f"Error updating undo history: {str(e)}")
+            try:
+                self.connection.rollback()
+            except Exception:
+                pass
+
+    def can_undo(self):
+        return bool(self._query("SELECT 1 FROM actions WHERE stack = ? LIMIT 1", (UNDO_STACK,)))
+
+    def can_redo(self):
+        return bool(self._query("SELECT 1 FROM actions WHERE stack = ? LIMIT 1", (REDO_STACK,)))
+
+    def _actions(self, rows):
+        actions = []
+        for record_id, source, destination, location, stack in rows:
+            entry = UndoAction(record_id, source, destination, location, stack == REDO_STACK)
+            actions.append((destination, source, entry))
+        return actions
+
+    def _stack(self, stack, limit=-1):
+        return self._actions(self._query(
+            "SELECT id, source, destination, location, stack FROM actions WHERE stack = ? "
+            "ORDER BY seq DESC LIMIT ?", (stack, limit)))
+
+    def undo(self):
+        """Move the last action to the redo stack and return it"""
+        actions = self._stack(UNDO_STACK, 1)
+        if not actions:
+            return None
+        actions[0][2].is_undone = True
+        self.set_state([actions[0][2]])
+        return actions[0]
+
+    def redo(self):
+        """Move the last undone action back to the undo stack and return it"""
+        actions = self._stack(REDO_STACK, 1)
+        if not actions:
+            return None
+        actions[0][2].is_undone = False
+        self.set_state([actions[0][2]])
+        return actions[0]
+
+    def take_all_undo(self):
+        """Return every undo action, most recent first, for Undo All"""
+        return self._stack(UNDO_STACK)
+
+    def take_all_redo(self):
+        """Return every redo action, most recent first, for Redo All"""
+        return self._stack(REDO_STACK)
+
+    def groups(self, limit=MAX_UNDO_GROUPS):
+        """Return the most recent undo groups, newest first, as UndoGroups"""
+        rows = self._query(
+            "SELECT group_id, COUNT(*), SUM(stack = ?), SUM(stack = ?) FROM actions "
+            "GROUP BY group_id ORDER BY group_id DESC LIMIT ?", (UNDO_STACK, REDO_STACK, limit))
+        return [UndoGroup(*row) for row in rows]
+
+    def group_actions(self, group_id, stack=None, limit=-1):
+        """Return the actions of a group, most recent first, only those on stack if given"""
+        if stack is None:
+            rows = self._query(
+                "SELECT id, source, destination, location, stack FROM actions WHERE group_id = ? "
+                "ORDER BY id DESC LIMIT ?", (group_id, limit))
+        else:
+            rows = self._query(
+                "SELECT id, source, destination, location, stack FROM actions WHERE group_id = ? AND stack = ? "
+                "ORDER BY seq DESC LIMIT ?", (group_id, stack, limit))
+        return self._actions(rows)
+
+    def set_state(self, entries):
+        """
+        Record where the files of entries are now and put undone ones on the
+        redo stack and redone ones on the undo stack, in the given order.
+        """
+        entries = [entry for entry in entries if entry.record_id is not None]
+        if not entries:
+            return
+        seq = self._take_seq(len(entries))
+        rows = [(entry.current_location, REDO_STACK if entry.is_undone else UNDO_STACK, seq + number, entry.record_id)
+                for number, entry in enumerate(entries)]
+        self._execute("UPDATE actions SET location = ?, stack = ?, seq = ? WHERE id = ?", rows, many=True)
+
+    def find_by_location(self, path):
+        """Return the action whose file is at path, None if there is none"""
+        actions = self._actions(self._query(
+            "SELECT id, source, destination, location, stack FROM actions WHERE location = ? "
+            "ORDER BY id DESC LIMIT 1", (path,)))
+        return actions[0] if actions else None
+
+    def indexed_through(self):
+        """Id up to which every move of the log is in the history, -1 if none are"""
+        rows = self._query("SELECT value FROM state WHERE key = 'indexed_through'")
+        return rows[0][0] if rows else -1
+
+    def catch_up(self, log_store):
+        """Add the moves the log store has and the history does not, dropping ones deleted from the log"""
+        if self.connection is None:
+            return
+        try:
+            self._execute("DELETE FROM actions WHERE id < ?", (log_store.first_id(),))
+            batch = []
+            # Records logged before undo groups are grouped by time here
+            grouper = UndoGrouper()
+            for record in log_store.records_after(self.indexed_through(), flush=False):
+                batch.append(record)
+                if len(batch) >= UNDO_BATCH_SIZE:
+                    self._add_records(batch, grouper)
+                    batch = []
+            self._add_records(batch, grouper)
+            # Moves logged from now on are pushed as they happen
+            self.caught_up = True
+        except Exception as e:
+            print(f"Error building undo history: {str(e)}")
+
+    def _add_records(self, records, grouper):
+        """Add the undoable moves among log records read by catch_up()"""
+        if not records:
+            return
+        rows = []
+        for record in records:
+            message = record.get("message", "")
+            source, destination = record.get("original_source"), record.get("original_destination")
+            if not source or not destination or "(Undo)" in message or "(Redo)" in message:
+                continue
+            stack = REDO_STACK if record.get("is_undone") else UNDO_STACK
+            group_id = record.get("group")
+            if group_id is None:
+                group_id = grouper.group_for(record.get("ts", 0))
+            rows.append((record["id"], source, destination, record.get("current_location"), stack,
+                         record["id"] - CAUGHT_UP_SEQ_OFFSET, group_id))
+        with self.lock:
+            if self.connection is None:
+                return
+            # Moves pushed or changed since the app started are newer than the log
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO actions (id, source, destination, location, stack, seq, group_id) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self.connection.execute("INSERT OR REPLACE INTO state (key, value) VALUES ('indexed_through', ?)",
+                                    (records[-1]["id"],))
+            self.connection.commit()
+
+    def clear(self):
+        """Clear all undo/redo history"""
+        self._execute("DELETE FROM actions")
+        self.caught_up = True
@@ -0,0 +1,36 @@
+import io, logging
+from app_logging import get_logger, setup_logging, set_log_level, dump_recent, LOGGER_NAME
+
+class Buffer:
+    def __init__(self):
+        self.records = []
+
+    def emit(self, message, src=None, dest=None, fields=None):
+        self.records.append((message, src, dest, fields))
+
+def test_disabled_levels_are_not_generated(monkeypatch):
+    buffer = Buffer()
+    setup_logging(buffer, "warning")
+    created = []
+    monkeypatch.setattr(logging.Logger, "makeRecord", lambda self, *args, **kwargs: created.append(args))
+    get_logger("test").debug("Skipping %s", "a")
+    get_logger("test").info("Moved %s", "a")
+    assert created == []
+    assert buffer.records == []
+
+def test_enabled_levels_are_shown_and_kept():
+    buffer = Buffer()
+    setup_logging(buffer, "info")
+    log = get_logger("test")
+    log.debug("hidden")
+    log.info("Moved: %s", "a.txt", extra={"src": "/in/a.txt", "dest": "/out/a.txt", "checksum": "abc"})
+    assert buffer.records == [("Moved: a.txt", "/in/a.txt", "/out/a.txt", {"checksum": "abc"})]
+    set_log_level("debug")
+    log.debug("shown")
+    assert buffer.records[-1][0] == "shown"
+    assert logging.getLogger(LOGGER_NAME).level == logging.DEBUG
+
+    stream = io.StringIO()
+    assert dump_recent(stream) == 2
+    assert "INFO    auto_organizer.test: Moved: a.txt" in stream.getvalue()
+    assert "hidden" not in stream.getvalue()
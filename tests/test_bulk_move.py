@@ -0,0 +1,35 @@
+import os
+from tabs.bulk_move import BulkMoveWorker, move_file
+
+def write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(data)
+    return path
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+def test_move_file_never_overwrites(tmp_path):
+    source = write(str(tmp_path / "out" / "a.txt"), "moved")
+    destination = write(str(tmp_path / "in" / "a.txt"), "already there")
+    assert "already exists" in move_file(source, destination)
+    assert read(source) == "moved"
+    assert read(destination) == "already there"
+    assert move_file(str(tmp_path / "missing.txt"), destination).startswith("File not found")
+
+def test_conflicts_fail_in_a_non_atomic_batch(tmp_path):
+    moves = [(write(str(tmp_path / "out" / "a.txt"), "a"), str(tmp_path / "in" / "a.txt")),
+             (write(str(tmp_path / "out" / "b.txt"), "b"), write(str(tmp_path / "in" / "b.txt"), "other b"))]
+    worker = BulkMoveWorker(moves)
+    finished = []
+    worker.finished.connect(lambda *args: finished.append(args))
+    worker.run()
+    [(results, rolled_back, rollback_errors)] = finished
+    assert results[0] is None
+    assert "already exists" in results[1]
+    assert not rolled_back
+    assert read(str(tmp_path / "in" / "a.txt")) == "a"
+    assert read(str(tmp_path / "in" / "b.txt")) == "other b"
+    assert read(str(tmp_path / "out" / "b.txt")) == "b"
@@ -0,0 +1,48 @@
+import json, os
+import pytest
+from PyQt5.QtCore import QCoreApplication
+from config_store import ConfigStore, write_atomic
+
+@pytest.fixture(scope="module")
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+def test_write_atomic_replaces_the_file(tmp_path):
+    path = str(tmp_path / "settings" / "config.json")
+    write_atomic(path, "old")
+    write_atomic(path, "new")
+    assert open(path).read() == "new"
+    assert os.listdir(tmp_path / "settings") == ["config.json"]
+
+def test_missing_empty_and_corrupted_files_load_as_empty(app, tmp_path):
+    path = tmp_path / "config.json"
+    store = ConfigStore(str(path))
+    assert store.load() == {}
+    path.write_text(" ")
+    assert store.load() == {}
+    path.write_text("{not json")
+    assert store.load() == {}
+    # The corrupted file is kept for inspection
+    assert (tmp_path / "config.json.bak").read_text() == "{not json"
+
+def test_schedule_save_writes_once(app, tmp_path):
+    path = tmp_path / "config.json"
+    store = ConfigStore(str(path), delay_ms=60000)
+    store.schedule_save({"theme": "dark"})
+    store.schedule_save({"theme": "light"})
+    assert not path.exists()
+    assert store.timer.isActive()
+    assert store.flush()
+    assert json.loads(path.read_text()) == {"theme": "light"}
+    assert not store.timer.isActive()
+
+def test_unchanged_settings_are_not_written(app, tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"theme": "dark"}))
+    store = ConfigStore(str(path))
+    config = store.load()
+    os.utime(path, (1, 1))
+    assert store.save_now(config)
+    assert os.path.getmtime(path) == 1
+    assert store.save_now(dict(config, theme="light"))
+    assert json.loads(path.read_text()) == {"theme": "light"}
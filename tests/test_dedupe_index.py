@@ -0,0 +1,65 @@
+import os
+from dedupe_index import DuplicateIndex, partial_hash, full_hash, PARTIAL_HASH_BYTES
+
+def write(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+    return str(path)
+
+def test_small_files_partial_hash_is_full_hash(tmp_path):
+    path = write(tmp_path / "a.txt", b"hello")
+    assert partial_hash(path) == full_hash(path)
+
+def test_large_files_partial_hash_only_reads_the_ends(tmp_path):
+    middle = b"x" * PARTIAL_HASH_BYTES
+    a = write(tmp_path / "a.bin", b"s" * PARTIAL_HASH_BYTES + middle + b"e" * PARTIAL_HASH_BYTES)
+    b = write(tmp_path / "b.bin", b"s" * PARTIAL_HASH_BYTES + b"y" * PARTIAL_HASH_BYTES + b"e" * PARTIAL_HASH_BYTES)
+    assert partial_hash(a) == partial_hash(b)
+    assert full_hash(a) != full_hash(b)
+
+def test_find_duplicate_by_content(tmp_path):
+    target = tmp_path / "target"
+    target.mkdir()
+    index = DuplicateIndex(str(target), index_path=str(tmp_path / "index.json"))
+    index.add(write(target / "kept.txt", b"same content"))
+    index.add(write(target / "other.txt", b"else content"))
+
+    duplicate, partial, full = index.find_duplicate(write(tmp_path / "new.txt", b"same content"))
+    assert duplicate == str(target / "kept.txt")
+    assert partial == full
+    assert index.find_duplicate(write(tmp_path / "new2.txt", b"diff content"))[0] is None
+    # Nothing of another size is hashed
+    assert index.find_duplicate(write(tmp_path / "new3.txt", b"short")) == (None, None, None)
+
+def test_removed_and_changed_files_are_not_duplicates(tmp_path):
+    target = tmp_path / "target"
+    target.mkdir()
+    index = DuplicateIndex(str(target), index_path=str(tmp_path / "index.json"))
+    gone = write(target / "gone.txt", b"content")
+    index.add(gone)
+    os.remove(gone)
+    src = write(tmp_path / "new.txt", b"content")
+    assert index.find_duplicate(src)[0] is None
+    assert index.by_size[len(b"content")] == {}
+
+    changed = write(target / "changed.txt", b"content")
+    index.add(changed)
+    assert index.find_duplicate(src)[0] == changed
+    # The hashes cached by the last lookup are stale once the file changed
+    write(changed, b"CONTENT")
+    os.utime(changed, (1, 1))
+    assert index.find_duplicate(src)[0] is None
+
+def test_index_survives_a_restart(tmp_path):
+    target = tmp_path / "target"
+    target.mkdir()
+    index_path = str(tmp_path / "index.json")
+    index = DuplicateIndex(str(target), index_path=index_path)
+    index.add(write(target / "kept.txt", b"same content"))
+    index.flush()
+    reopened = DuplicateIndex(str(target), index_path=index_path)
+    assert reopened.find_duplicate(write(tmp_path / "new.txt", b"same content"))[0] == str(target / "kept.txt")
+    # An index written for another target is ignored
+    other = tmp_path / "other"
+    other.mkdir()
+    assert DuplicateIndex(str(other), index_path=index_path).by_size == {}
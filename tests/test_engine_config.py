@@ -0,0 +1,38 @@
+import pytest
+from engine_config import EngineConfig, PairConfig, DEFAULT_SCAN_INTERVAL, MIN_SCAN_INTERVAL
+from io_throttle import PRIORITY_NORMAL, PRIORITY_BACKFILL, PRIORITY_LOW
+
+def test_global_settings_are_converted():
+    config = EngineConfig.from_config({"watch_pairs": [["in", "out"], ["", "out"], ["in2", None]],
+                                       "max_file_age_hours": 2, "process_directories": False,
+                                       "verify_mode": "full"})
+    assert config.watch_pairs() == [("in", "out")]
+    pair = config.pair_for("in", "out")
+    assert (pair.scan_interval, pair.max_age_seconds, pair.process_directories) == (DEFAULT_SCAN_INTERVAL, 7200, False)
+    assert config.verify_mode == "full"
+    assert EngineConfig.from_config({"max_file_age_hours": 0}).max_age_seconds is None
+    assert config.pair_for("gone", "out") is None
+
+def test_pair_profiles_override_global_settings():
+    config = EngineConfig.from_config({
+        "watch_pairs": [["in", "out"], ["archive", "out"], ["broken", "out"]],
+        "max_file_age_hours": 24,
+        "pair_profiles": {
+            "in": {"scan_interval": 0.01, "priority": "high", "concurrency": 4},
+            "archive": {"scan_interval": 3600, "priority": "low", "max_file_age_hours": 0},
+            "broken": {"scan_interval": "often"},
+        },
+    })
+    inbox, archive, broken = config.pairs
+    assert (inbox.scan_interval, inbox.priority, inbox.concurrency) == (MIN_SCAN_INTERVAL, PRIORITY_NORMAL, 4)
+    assert (archive.scan_interval, archive.priority, archive.max_age_seconds) == (3600, PRIORITY_LOW, None)
+    # An invalid profile falls back to the global settings
+    assert (broken.scan_interval, broken.priority, broken.max_age_seconds) == (DEFAULT_SCAN_INTERVAL, PRIORITY_BACKFILL, 86400)
+
+def test_snapshots_are_read_only():
+    config = EngineConfig.from_config({"watch_pairs": [["in", "out"]]})
+    with pytest.raises(AttributeError):
+        config.dedupe_mode = "delete"
+    with pytest.raises(AttributeError):
+        config.pairs[0].scan_interval = 1
+    assert not hasattr(PairConfig("in", "out"), "__dict__")
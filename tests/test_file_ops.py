@@ -0,0 +1,83 @@
+import errno, os
+import pytest
+import file_ops
+from file_ops import DirectoryCache, VerifyError, verified_move, VERIFY_FULL, VERIFY_SAMPLED, COPY_CHUNK_SIZE
+
+@pytest.fixture
+def cross_device(monkeypatch):
+    """Make every rename fail as if src and dest were on different drives"""
+    def rename(src, dest):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+    monkeypatch.setattr(file_ops.os, "rename", rename)
+
+def write(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+
+def test_rename_is_not_verified(tmp_path):
+    write(tmp_path / "a.txt", b"data")
+    assert verified_move(str(tmp_path / "a.txt"), str(tmp_path / "b.txt")) is None
+    assert (tmp_path / "b.txt").read_bytes() == b"data"
+
+@pytest.mark.parametrize("mode", [VERIFY_FULL, VERIFY_SAMPLED])
+def test_cross_device_copy_is_verified(tmp_path, cross_device, mode):
+    data = os.urandom(COPY_CHUNK_SIZE * 3 + 10)
+    src, dest = str(tmp_path / "a.bin"), str(tmp_path / "b.bin")
+    write(src, data)
+    checksum = verified_move(src, dest, mode)
+    expected = file_ops.new_hash()
+    expected.update(data)
+    assert checksum == expected.hexdigest()
+    assert not os.path.exists(src)
+    assert not os.path.exists(dest + ".partial")
+    assert open(dest, 'rb').read() == data
+
+def test_mismatch_keeps_source(tmp_path, cross_device, monkeypatch):
+    src, dest = str(tmp_path / "a.bin"), str(tmp_path / "b.bin")
+    write(src, b"data")
+    monkeypatch.setattr(file_ops, "hash_file_chunks", lambda path, samples=None: "bad")
+    with pytest.raises(VerifyError):
+        verified_move(src, dest)
+    assert os.path.exists(src)
+    assert not os.path.exists(dest)
+    assert not os.path.exists(dest + ".partial")
+
+def test_directory_cache_skips_known_directories(tmp_path):
+    cache = DirectoryCache()
+    target = str(tmp_path / "Photos")
+    cache.ensure(target, os.path.join(target, "2024", "May"))
+    assert os.path.isdir(os.path.join(target, "2024", "May"))
+    cache.ensure(target, os.path.join(target, "2024", "May"))
+    cache.ensure(target, os.path.join(target, "2024"))
+    assert (cache.hits, cache.misses) == (2, 1)
+
+def test_directory_cache_invalidate_below_path(tmp_path):
+    cache = DirectoryCache()
+    target = str(tmp_path / "Photos")
+    may, june = os.path.join(target, "2024", "May"), os.path.join(target, "2024", "June")
+    cache.ensure(target, may)
+    cache.ensure(target, june)
+    cache.invalidate(may)
+    cache.ensure(target, june)
+    assert cache.hits == 1
+    cache.ensure(target, may)
+    assert cache.misses == 3
+
+def test_directory_cache_invalidate_needs_a_separator(tmp_path):
+    cache = DirectoryCache()
+    photos, photos_old = str(tmp_path / "Photos"), str(tmp_path / "Photos Old")
+    cache.ensure(photos, os.path.join(photos, "2024"))
+    cache.ensure(photos_old, os.path.join(photos_old, "2024"))
+    # A sibling folder whose name starts with the target's is not inside it
+    cache.invalidate(photos_old)
+    cache.invalidate(photos + "2024")
+    cache.ensure(photos, os.path.join(photos, "2024"))
+    assert cache.hits == 1
+    cache.ensure(photos_old, os.path.join(photos_old, "2024"))
+    assert cache.hits == 1
+
+def test_directory_cache_only_records_paths_inside_the_target(tmp_path):
+    cache = DirectoryCache()
+    photos = str(tmp_path / "Photos")
+    cache.ensure(photos, str(tmp_path / "Photos Old" / "2024"))
+    assert cache.known[cache._key(photos)] == set()
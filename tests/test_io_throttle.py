@@ -0,0 +1,79 @@
+import queue, threading
+import pytest
+from io_throttle import FileQueue, TokenBucket, PRIORITY_INTERACTIVE, PRIORITY_NORMAL, PRIORITY_BACKFILL, PRIORITY_LOW
+
+def item(src):
+    return (src, src, "watch", "target", None)
+
+def drain(file_queue):
+    items = []
+    while not file_queue.empty():
+        items.append(file_queue.get_with_priority(block=False))
+    return items
+
+def test_priority_then_insertion_order():
+    file_queue = FileQueue()
+    file_queue.put(item("a"), PRIORITY_BACKFILL)
+    file_queue.put(item("b"), PRIORITY_NORMAL)
+    file_queue.put(item("c"), PRIORITY_BACKFILL)
+    assert [entry[1][1] for entry in drain(file_queue)] == ["b", "a", "c"]
+
+def test_same_file_is_queued_once():
+    file_queue = FileQueue()
+    assert file_queue.put(item("a"), PRIORITY_BACKFILL)
+    for _ in range(100):
+        assert not file_queue.put(item("a"), PRIORITY_BACKFILL)
+    assert not file_queue.put(item("a"), PRIORITY_LOW)
+    assert file_queue.qsize() == 1
+    assert file_queue.is_pending("a")
+    assert drain(file_queue) == [(PRIORITY_BACKFILL, item("a"))]
+    assert not file_queue.is_pending("a")
+
+def test_is_pending_at_priority():
+    file_queue = FileQueue()
+    file_queue.put(item("a"), PRIORITY_NORMAL)
+    assert file_queue.is_pending("a", PRIORITY_BACKFILL)
+    assert file_queue.is_pending("a", PRIORITY_NORMAL)
+    # "Organize Now" can still move it up
+    assert not file_queue.is_pending("a", PRIORITY_INTERACTIVE)
+    assert not file_queue.is_pending("b")
+
+def test_higher_priority_moves_a_file_up():
+    file_queue = FileQueue()
+    file_queue.put(item("a"), PRIORITY_BACKFILL)
+    file_queue.put(item("b"), PRIORITY_BACKFILL)
+    assert file_queue.put(item("b"), PRIORITY_INTERACTIVE)
+    assert file_queue.qsize() == 2
+    assert drain(file_queue) == [(PRIORITY_INTERACTIVE, item("b")), (PRIORITY_BACKFILL, item("a"))]
+
+def test_file_can_be_queued_again_once_taken():
+    file_queue = FileQueue()
+    file_queue.put(item("a"), PRIORITY_BACKFILL)
+    priority, taken = file_queue.get_with_priority()
+    # The worker puts back what it could not handle in this batch
+    assert file_queue.put(taken, priority)
+    assert file_queue.qsize() == 1
+
+def test_wakeups_are_never_deduplicated():
+    file_queue = FileQueue()
+    file_queue.put(None, PRIORITY_INTERACTIVE)
+    file_queue.put(None, PRIORITY_INTERACTIVE)
+    assert file_queue.qsize() == 2
+    assert file_queue.get() is None
+    assert file_queue.get() is None
+    assert file_queue.empty()
+
+def test_get_times_out_and_wakes_on_put():
+    file_queue = FileQueue()
+    with pytest.raises(queue.Empty):
+        file_queue.get(timeout=0.05)
+    with pytest.raises(queue.Empty):
+        file_queue.get_nowait()
+    threading.Timer(0.05, file_queue.put, args=(item("a"),)).start()
+    assert file_queue.get(timeout=5) == item("a")
+
+def test_token_bucket_unlimited_and_debt():
+    assert TokenBucket(0).reserve(10 ** 9) == 0.0
+    bucket = TokenBucket(100)
+    assert bucket.reserve(100) == 0.0
+    assert bucket.reserve(50) == pytest.approx(0.5, abs=0.05)
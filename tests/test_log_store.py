@@ -0,0 +1,116 @@
+import os, time, threading
+from tabs.log_store import LogStore, READ_BLOCK_SIZE
+
+# Record timestamps, recent enough to be kept by retention
+START_TS = int(time.time()) - 10000
+
+def make_store(tmp_path, count, **kwargs):
+    store = LogStore(directory=str(tmp_path / "logs"), legacy_file=None, **kwargs)
+    for number in range(count):
+        store.append({"message": f"Moved file {number:05d} " + "x" * 80, "ts": START_TS + number})
+        if number % 50 == 49:
+            store.flush()
+    store.flush()
+    return store
+
+def read_all(reader, count):
+    pages = []
+    while reader.has_more():
+        page = reader.read_page(count)
+        if page:
+            pages.append(page)
+    return pages
+
+def test_read_page_returns_at_most_count(tmp_path):
+    store = make_store(tmp_path, 2000)
+    # Many records fit in one block, the rest are kept for the next page
+    assert READ_BLOCK_SIZE // 100 > 100
+    pages = read_all(store.page_reader(), 100)
+    assert [len(page) for page in pages] == [100] * 20
+    ids = [record["id"] for page in reversed(pages) for record in page]
+    assert ids == list(range(2000))
+
+def test_read_page_across_segments_and_compressed_blocks(tmp_path):
+    store = make_store(tmp_path, 3000, segment_max_bytes=100 * 1024)
+    store.maintain()
+    segments = store.segments()
+    assert len(segments) > 2
+    assert segments[0].is_compressed()
+    pages = read_all(store.page_reader(), 128)
+    assert all(len(page) == 128 for page in pages[:-1])
+    ids = [record["id"] for page in reversed(pages) for record in page]
+    assert ids == list(range(3000))
+
+def test_updates_are_applied(tmp_path):
+    store = make_store(tmp_path, 10)
+    store.update(3, is_undone=True)
+    store.update(3, current_location="/b", is_undone=False)
+    store.update(7, current_location="/c")
+    pages = read_all(store.page_reader(), 4)
+    records = {record["id"]: record for page in pages for record in page}
+    assert records[3]["is_undone"] is False
+    assert records[3]["current_location"] == "/b"
+    assert records[7]["current_location"] == "/c"
+    assert [record["id"] for record in store.load()] == list(range(10))
+    assert store.load()[3]["current_location"] == "/b"
+
+def test_query_time_range(tmp_path):
+    store = make_store(tmp_path, 3000, segment_max_bytes=100 * 1024)
+    store.maintain()
+    start = START_TS + 1500
+    assert [record["ts"] for record in store.query(start, start + 9)] == list(range(start, start + 10))
+
+def test_records_after(tmp_path):
+    store = make_store(tmp_path, 3000, segment_max_bytes=100 * 1024)
+    store.maintain()
+    assert [record["id"] for record in store.records_after(2990)] == list(range(2991, 3000))
+
+def test_ids_continue_after_reopening(tmp_path):
+    make_store(tmp_path, 5)
+    store = make_store(tmp_path, 1)
+    assert [record["id"] for record in store.load()] == list(range(6))
+    store.clear()
+    assert store.load() == []
+    assert store.append({"message": "after clear"}) == 6
+
+def test_partial_line_after_a_crash_is_not_joined_to_the_next_record(tmp_path):
+    store = make_store(tmp_path, 3)
+    with open(store.path, 'ab') as f:
+        f.write(b'{"message": "cut off by a cra')
+    reopened = LogStore(directory=str(tmp_path / "logs"), legacy_file=None)
+    reopened.append({"message": "after the crash"})
+    reopened.flush()
+    assert [record["message"] for record in reopened.load()][-1] == "after the crash"
+    assert len(reopened.load()) == 4
+
+def test_lines_are_kept_when_a_write_fails(tmp_path, monkeypatch):
+    store = make_store(tmp_path, 3)
+    store.append({"message": "kept"})
+    def makedirs(*args, **kwargs):
+        raise OSError("disk full")
+    monkeypatch.setattr(os, "makedirs", makedirs)
+    store.flush()
+    assert store.has_pending()
+    monkeypatch.undo()
+    store.flush()
+    assert [record["message"] for record in store.load()][-1] == "kept"
+
+def test_concurrent_flushes_keep_every_record_in_order(tmp_path):
+    store = make_store(tmp_path, 0, segment_max_bytes=20 * 1024)
+
+    def append_many(name):
+        for number in range(500):
+            store.append({"message": f"{name} {number}", "ts": START_TS + number})
+            store.flush()
+
+    threads = [threading.Thread(target=append_many, args=(name,)) for name in "abcd"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    store.flush()
+    store.maintain()
+    ids = [record["id"] for record in store.load()]
+    assert ids == list(range(2000))
+    # Each segment is named after its first record
+    assert all(segment.first_id == next(segment.records())["id"] for segment in store.segments())
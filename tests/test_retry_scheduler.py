@@ -0,0 +1,47 @@
+import json, time
+import pytest
+from retry_scheduler import RetryScheduler
+
+def item(src):
+    return (src, src, "watch", "target", None)
+
+@pytest.fixture
+def scheduler(tmp_path):
+    return RetryScheduler(str(tmp_path / "failed.json"), base_delay=10, max_delay=40, max_attempts=3)
+
+def test_delay_doubles_up_to_the_limit(scheduler):
+    for attempts, delay in [(1, 10), (2, 20), (3, 40), (6, 40)]:
+        for _ in range(20):
+            assert delay / 2 <= scheduler.delay_for(attempts) <= delay
+
+def test_retry_is_due_after_its_delay(scheduler):
+    delay = scheduler.schedule_failure(item("a"), 2, "locked")
+    assert scheduler.is_waiting("a")
+    assert scheduler.pop_due() == []
+    assert 0 < scheduler.seconds_until_next() <= delay
+    assert scheduler.pop_due(time.monotonic() + delay + 1) == [(item("a"), 2)]
+    assert not scheduler.is_waiting("a")
+    assert scheduler.attempts("a") == 1
+    scheduler.succeeded("a")
+    assert scheduler.attempts("a") == 0
+
+def test_only_the_latest_failure_is_retried(scheduler):
+    scheduler.schedule_failure(item("a"), 2, "locked")
+    scheduler.pop_due(time.monotonic() + 100)
+    scheduler.schedule_failure(item("a"), 1, "still locked")
+    assert scheduler.pop_due(time.monotonic() + 1000) == [(item("a"), 1)]
+
+def test_file_is_given_up_on_and_kept_across_restarts(scheduler, tmp_path):
+    for _ in range(2):
+        assert scheduler.schedule_failure(item("a"), 2, "locked") is not None
+    assert scheduler.schedule_failure(item("a"), 2, "locked for good") is None
+    assert scheduler.is_waiting("a")
+    [record] = scheduler.failed_files()
+    assert (record["source"], record["attempts"], record["error"]) == ("a", 3, "locked for good")
+    assert json.load(open(tmp_path / "failed.json"))[0]["source"] == "a"
+
+    reopened = RetryScheduler(str(tmp_path / "failed.json"))
+    assert reopened.is_waiting("a")
+    assert reopened.release("a")["watch"] == "watch"
+    assert not reopened.is_waiting("a")
+    assert RetryScheduler(str(tmp_path / "failed.json")).failed_files() == []
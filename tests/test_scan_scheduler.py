@@ -0,0 +1,52 @@
+import time
+import pytest
+from PyQt5.QtCore import QCoreApplication
+from engine_config import PairConfig
+from idle_audit import wakeup_report
+from scan_scheduler import ScanScheduler
+
+@pytest.fixture(scope="module")
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+def scheduler_with(pairs):
+    scheduler = ScanScheduler()
+    scheduled = []
+    scheduler.scan_due.connect(scheduled.append)
+    scheduler.set_pairs(pairs)
+    return scheduler, scheduled
+
+def test_only_due_pairs_are_scanned(app):
+    fast, slow = PairConfig("in", "out", scan_interval=0.25), PairConfig("archive", "out", scan_interval=3600)
+    scheduler, scheduled = scheduler_with([fast, slow])
+    scheduler.start()
+    assert scheduler.timer.isSingleShot()
+    assert 0 < scheduler.timer.interval() <= 250
+    time.sleep(0.3)
+    scheduler.run_due()
+    assert scheduled == [fast]
+    # The slow pair is next after the fast one has been rescheduled
+    assert scheduler.timer.interval() <= 250
+    scheduler.stop()
+    assert not scheduler.timer.isActive()
+
+def test_set_pairs_keeps_when_unchanged_pairs_are_due(app):
+    pair = PairConfig("in", "out", scan_interval=60)
+    scheduler, _ = scheduler_with([pair])
+    scheduler.start()
+    due = scheduler.heap[0][0]
+    scheduler.set_pairs([PairConfig("in", "out", scan_interval=60), PairConfig("other", "out", scan_interval=30)])
+    assert sorted(when for when, _, _ in scheduler.heap)[1] == due
+    scheduler.set_pairs([PairConfig("in", "out", scan_interval=120)])
+    assert scheduler.heap[0][0] > due
+    scheduler.stop()
+
+def test_wakeup_report_lists_the_rescan_rate(app):
+    scheduler, _ = scheduler_with([PairConfig("a", "out", scan_interval=1), PairConfig("b", "out", scan_interval=60)])
+    assert scheduler.wakeups_per_minute() == 0
+    scheduler.start()
+    assert scheduler.wakeups_per_minute() == pytest.approx(61)
+    assert "Pair rescans: up to 61.00 per minute" in wakeup_report()
+    # The timer only runs once each time, it is not a periodic timer
+    assert not any(line.startswith("Pair rescans (next one due)") for line in wakeup_report())
+    scheduler.stop()
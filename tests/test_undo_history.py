@@ -0,0 +1,91 @@
+import time
+from types import SimpleNamespace
+from tabs.log_store import LogStore
+from tabs.undo_history import UndoRedoManager, UNDO_GROUP_GAP_SECONDS, UNDO_STACK, REDO_STACK
+
+def move(record_id, ts=None):
+    return SimpleNamespace(record_id=record_id, ts=time.time() if ts is None else ts)
+
+def manager(tmp_path):
+    return UndoRedoManager(str(tmp_path / "undo.db"))
+
+def test_undo_and_redo_in_order(tmp_path):
+    history = manager(tmp_path)
+    assert not history.can_undo()
+    history.push_action("/out/a", "/in/a", move(1))
+    history.push_action("/out/b", "/in/b", move(2))
+    organized, original, entry = history.undo()
+    assert (organized, original, entry.record_id) == ("/out/b", "/in/b", 2)
+    assert history.can_redo()
+    assert history.undo()[2].record_id == 1
+    assert history.undo() is None
+    assert history.redo()[2].record_id == 1
+    assert [action[2].record_id for action in history.take_all_redo()] == [2]
+
+def test_new_move_clears_the_redo_stack(tmp_path):
+    history = manager(tmp_path)
+    history.push_action("/out/a", "/in/a", move(1))
+    history.undo()
+    history.push_action("/out/b", "/in/b", move(2))
+    assert not history.can_redo()
+    assert [action[2].record_id for action in history.take_all_undo()] == [2]
+
+def test_find_by_location_follows_the_file(tmp_path):
+    history = manager(tmp_path)
+    history.push_action("/out/a", "/in/a", move(1))
+    _, _, entry = history.find_by_location("/out/a")
+    entry.current_location, entry.is_undone = "/in/a", True
+    history.set_state([entry])
+    assert history.find_by_location("/out/a") is None
+    assert history.find_by_location("/in/a")[2].is_undone
+
+def test_moves_close_in_time_share_a_group(tmp_path):
+    history = manager(tmp_path)
+    now = time.time()
+    for record_id, ts in [(1, now), (2, now + 1), (3, now + UNDO_GROUP_GAP_SECONDS + 2)]:
+        history.push_action(f"/out/{record_id}", f"/in/{record_id}", move(record_id, ts))
+    newer, older = history.groups()
+    assert (older.count, newer.count) == (2, 1)
+    assert [action[2].record_id for action in history.group_actions(older.group_id, UNDO_STACK)] == [2, 1]
+    assert history.group_actions(older.group_id, REDO_STACK) == []
+
+def test_catch_up_reads_moves_from_the_log(tmp_path):
+    store = LogStore(directory=str(tmp_path / "logs"), legacy_file=None)
+    store.append({"message": "Moved a", "original_source": "/in/a", "original_destination": "/out/a",
+                  "current_location": "/out/a"})
+    store.append({"message": "Initial scan complete"})
+    undone = store.append({"message": "Moved b", "original_source": "/in/b", "original_destination": "/out/b",
+                           "current_location": "/out/b"})
+    store.update(undone, current_location="/in/b", is_undone=True)
+    store.append({"message": "Moved back b (Undo)", "original_source": "/out/b", "original_destination": "/in/b"})
+    store.flush()
+
+    history = manager(tmp_path)
+    history.catch_up(store)
+    assert [action[2].record_id for action in history.take_all_undo()] == [0]
+    assert [action[2].record_id for action in history.take_all_redo()] == [undone]
+    assert history.indexed_through() == 3
+    # Caught up history is kept across restarts, and moves are not added twice
+    reopened = manager(tmp_path)
+    reopened.catch_up(store)
+    assert len(reopened.take_all_undo()) == 1
+
+def test_push_actions_matches_pushing_one_by_one(tmp_path):
+    batched, single = manager(tmp_path / "batched"), manager(tmp_path / "single")
+    for history in (batched, single):
+        history.push_action("/out/old", "/in/old", move(1))
+        history.undo()
+    # The second move organizes the file the first one put in /out/x again
+    moves = [("/out/x", "/in/a", move(2), None), ("/out/y", "/out/x", move(3), None), ("/out/z", "/in/z", move(4), None)]
+    batched.push_actions(moves)
+    for organized, original, entry, group_id in moves:
+        single.push_action(organized, original, entry, group_id)
+    for history in (batched, single):
+        assert not history.can_redo()
+        assert [action[2].record_id for action in history.take_all_undo()] == [4, 3]
+
+def test_push_actions_writes_a_burst_in_one_transaction(tmp_path):
+    history = manager(tmp_path)
+    history.push_actions([(f"/out/{number}", f"/in/{number}", move(number), None) for number in range(10000)])
+    assert len(history.take_all_undo()) == 10000
+    assert history.find_by_location("/out/9999")[2].record_id == 9999
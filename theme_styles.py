@@ -0,0 +1,233 @@
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPalette, QColor
+
+# Themes with their own palette and stylesheet, anything else uses Qt's defaults
+THEMES = ("dark", "light")
+
+# Stylesheet of the whole application by theme
+APP_STYLESHEETS = {
+    "dark": """
+    QTabWidget::pane {
+        border: 1px solid #505050;
+        border-top: 0px;
+        border-radius: 4px;
+    }
+    QTabBar::tab {
+        padding: 6px 12px;
+        margin: 2px 2px 0px 2px;
+        border-top-left-radius: 4px;
+        border-top-right-radius: 4px;
+        background-color: #383838;
+        color: #e0e0e0;
+    }
+    QTabBar::tab:selected {
+        font-weight: bold;
+        background-color: #505050;
+    }
+    QPushButton {
+        padding: 6px 12px;
+        border-radius: 4px;
+        border: 1px solid #505050;
+        background-color: #383838;
+        color: #e0e0e0;
+    }
+    QTableWidget {
+        gridline-color: #3a3a3a;
+        selection-background-color: #0078d7;
+        background-color: #2d2d2d;
+        color: #e0e0e0;
+    }
+    QHeaderView::section {
+        padding: 6px;
+        font-weight: bold;
+        background-color: #383838;
+        color: #e0e0e0;
+        border: 1px solid #505050;
+    }
+    QComboBox {
+        border: 1px solid #505050;
+        border-radius: 4px;
+        padding: 4px 8px;
+        background-color: #383838;
+        color: #e0e0e0;
+    }
+    QComboBox::drop-down {
+        border-left: 1px solid #505050;
+    }
+    QComboBox::down-arrow {
+        /* First try to use the white arrow image for dark mode */
+        image: url(icons/dropdown_white.png);
+        width: 12px;
+        height: 12px;
+        /* Fallback styling in case image isn't available */
+        color: #e0e0e0;
+    }
+    QComboBox QAbstractItemView {
+        border: 1px solid #505050;
+        background-color: #2d2d2d;
+        color: #e0e0e0;
+        selection-background-color: #0078d7;
+        selection-color: white;
+    }
+    QComboBox QAbstractItemView::item {
+        min-height: 24px;
+        padding: 4px;
+        color: #e0e0e0;
+    }
+    QComboBox QAbstractItemView::item:hover {
+        background-color: rgba(0, 120, 215, 0.4);
+    }
+    QLineEdit, QTextEdit {
+        border: 1px solid #505050;
+        border-radius: 4px;
+        padding: 4px;
+        background-color: #2d2d2d;
+        color: #e0e0e0;
+    }
+    QCheckBox {
+        color: #e0e0e0;
+    }
+    QLabel {
+        color: #e0e0e0;
+    }
+    QGroupBox {
+        border: 1px solid #505050;
+        border-radius: 4px;
+        margin-top: 8px;
+        color: #e0e0e0;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 5px;
+    }
+
+""",
+    "light": """
+    QTabWidget::pane {
+        border: 1px solid #999;
+        border-top: 0px;
+        border-radius: 4px;
+    }
+    QTabBar::tab {
+        padding: 6px 12px;
+        margin: 2px 2px 0px 2px;
+        border-top-left-radius: 4px;
+        border-top-right-radius: 4px;
+    }
+    QTabBar::tab:selected {
+        font-weight: bold;
+    }
+    QPushButton {
+        padding: 6px 12px;
+        border-radius: 4px;
+        border: 1px solid #999;
+    }
+    QTableWidget {
+        gridline-color: #ccc;
+        selection-background-color: #0078d7;
+    }
+    QHeaderView::section {
+        padding: 6px;
+        font-weight: bold;
+    }
+
+""",
+}
+
+# Start Watching / Stop Watching button, the same in every theme
+START_BUTTON_STYLE = """
+    QPushButton {
+        background-color: #2196F3;
+        color: white;
+        font-weight: bold;
+        font-size: 14px;
+        border-radius: 4px;
+        padding: 8px 16px;
+        border: 2px solid #1976D2;
+        outline: none;
+    }
+    QPushButton:hover {
+        background-color: #0b7dda;
+        border: 2px solid #0D47A1;
+    }
+    QPushButton:pressed {
+        background-color: #1565C0;
+        border: 2px solid #0D47A1;
+    }
+"""
+STOP_BUTTON_STYLE = """
+    QPushButton {
+        background-color: #f44336;
+        color: white;
+        font-weight: bold;
+        font-size: 14px;
+        border-radius: 4px;
+        padding: 8px 16px;
+        border: 2px solid #D32F2F;
+        outline: none;
+    }
+    QPushButton:hover {
+        background-color: #d32f2f;
+        border: 2px solid #B71C1C;
+    }
+    QPushButton:pressed {
+        background-color: #C62828;
+        border: 2px solid #8B0000;
+    }
+"""
+
+_palettes = {}
+
+def theme_palette(theme):
+    """Palette of a theme, built once"""
+    palette = _palettes.get(theme)
+    if palette is not None:
+        return palette
+    palette = QPalette()
+    if theme == "dark":
+        # Dark gray instead of pure black
+        dark_color = QColor(45, 45, 45)
+        darker_color = QColor(35, 35, 35)
+        mid_color = QColor(55, 55, 55)
+
+        palette.setColor(QPalette.Window, darker_color)
+        palette.setColor(QPalette.WindowText, Qt.white)
+        palette.setColor(QPalette.Base, dark_color)
+        palette.setColor(QPalette.AlternateBase, mid_color)
+        palette.setColor(QPalette.ToolTipBase, dark_color)
+        palette.setColor(QPalette.ToolTipText, Qt.white)
+        palette.setColor(QPalette.Text, Qt.white)
+        palette.setColor(QPalette.Button, dark_color)
+        palette.setColor(QPalette.ButtonText, Qt.white)
+        palette.setColor(QPalette.BrightText, Qt.red)
+        palette.setColor(QPalette.Highlight, QColor(42, 130, 218))
+        palette.setColor(QPalette.HighlightedText, Qt.white)
+        palette.setColor(QPalette.Link, QColor(42, 130, 218))
+    elif theme == "light":
+        palette.setColor(QPalette.Window, Qt.white)
+        palette.setColor(QPalette.WindowText, Qt.black)
+        palette.setColor(QPalette.Base, Qt.white)
+        palette.setColor(QPalette.AlternateBase, QColor(240, 240, 240))
+        palette.setColor(QPalette.ToolTipBase, Qt.black)
+        palette.setColor(QPalette.ToolTipText, Qt.white)
+        palette.setColor(QPalette.Text, Qt.black)
+        palette.setColor(QPalette.Button, QColor(240, 240, 240))
+        palette.setColor(QPalette.ButtonText, Qt.black)
+        palette.setColor(QPalette.BrightText, Qt.red)
+        palette.setColor(QPalette.Highlight, QColor(42, 130, 218))
+        palette.setColor(QPalette.HighlightedText, Qt.black)
+        palette.setColor(QPalette.Link, QColor(0, 0, 255))
+    _palettes[theme] = palette
+    return palette
+
+def set_style_sheet(widget, style):
+    """
+    Give widget a stylesheet unless it already has it.
+
+    Qt parses a stylesheet and re-polishes the widget and all its children
+    whenever one is set, even an identical one, which with a full watcher
+    table or log view is most of the cost of a theme change.
+    """
+    if widget.styleSheet() != style:
+        widget.setStyleSheet(style)
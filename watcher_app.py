@@ -1,13 +1,14 @@
-import sys, os, re, json, urllib.request, platform, subprocess, shutil, traceback
+from startup_profile import mark as mark_startup, milestone as startup_milestone
+import sys, os, re, json, platform, subprocess, shutil, traceback
 import socket
+import queue
 import tempfile
 import ctypes
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QSystemTrayIcon, QMenu, QAction, QMessageBox
 )
-from PyQt5.QtGui import QIcon, QPalette, QColor
-from PyQt5.QtCore import QTimer, Qt, pyqtSignal, QThread, QObject
-from queue import Queue
+from PyQt5.QtGui import QIcon
+from PyQt5.QtCore import QTimer, Qt, pyqtSignal, QThread, QObject, QFileSystemWatcher
 import time
 
 # Handle winreg import with better error handling
@@ -27,68 +28,40 @@ for site_path in site.getsitepackages():
     if site_path not in sys.path:
         sys.path.append(site_path)
 
-# Try importing watchdog with detailed error reporting and better fallback
-USE_WATCHDOG = False  # Set default to False
-try:
-    from watchdog.observers import Observer
-    from watchdog.events import FileSystemEventHandler
-    # Test that Observer can actually be instantiated
-    test_observer = Observer()
-    USE_WATCHDOG = True  # Only set to True if import and instantiation succeed
-    print("Successfully imported and tested watchdog")
-except ImportError as e:
-    print(f"Watchdog import error: {str(e)}")
-    print("Python path:", sys.path)
-    print("Falling back to polling method")
-except Exception as e:
-    print(f"Unexpected error importing watchdog: {str(e)}")
-    print(f"Error details: {traceback.format_exc()}")
-    print("Falling back to polling method")
-
 # Import tab modules
 from tabs import MainTab, SettingsTab, LogsTab, AboutTab, load_version
+from dedupe_index import DuplicateIndex, DEDUPE_OFF, DEDUPE_HARDLINK, PARTIAL_HASH_BYTES
+from file_ops import DirectoryCache, VerifyError, verified_move, VERIFY_OFF
+from retry_scheduler import RetryScheduler
+from config_store import ConfigStore
+from idle_audit import periodic_timer, wakeup_report
+from engine_config import EngineConfig, IGNORED_PREFIXES
+from scan_scheduler import ScanScheduler
+from resources import safe_icon, preload_icons
+from theme_styles import THEMES, APP_STYLESHEETS, START_BUTTON_STYLE, STOP_BUTTON_STYLE, theme_palette, set_style_sheet
+from app_logging import LogBuffer, get_logger, setup_logging, set_log_level, DEFAULT_LOG_LEVEL
+from io_throttle import (
+    FileQueue, TargetRateLimiter, set_current_thread_background,
+    PRIORITY_INTERACTIVE, PRIORITY_BACKFILL
+)
+
+mark_startup("imports")
 
 # Constants
 CONFIG_FILE = os.path.expanduser("~/.watcher_pairs_config.json")
 AUTOSTART_PATH = os.path.expanduser("~\\AppData\\Roaming\\Microsoft\\Windows\\Start Menu\\Programs\\Startup\\watcher_app.lnk")
 VERSION_FILE = os.path.join(os.path.dirname(__file__), "version.txt")
 
-def get_resource_path(relative_path):
-    """Get the correct resource path in both development and PyInstaller modes"""
-    try:
-        # PyInstaller creates a temp folder and stores path in _MEIPASS
-        base_path = sys._MEIPASS
-        print(f"Using PyInstaller base path: {base_path}")
-    except Exception:
-        base_path = os.path.abspath(".")
-        print(f"Using development base path: {base_path}")
-
-    full_path = os.path.join(base_path, relative_path)
-    print(f"Loading resource from: {full_path}")
-    return full_path
-
-def safe_icon(icon_path):
-    """Create a QIcon object with fallback to empty icon if file doesn't exist"""
-    path = get_resource_path(icon_path)
-    if os.path.exists(path):
-        print(f"Found icon: {path}")
-        return QIcon(path)
-
-    # Try looking in the icons subdirectory
-    icons_path = get_resource_path(os.path.join("icons", os.path.basename(icon_path)))
-    if os.path.exists(icons_path):
-        print(f"Found icon in icons directory: {icons_path}")
-        return QIcon(icons_path)
-
-    # If icon doesn't exist but icon.ico does, use that instead
-    ico_path = get_resource_path("icons/icon.ico")
-    if os.path.exists(ico_path):
-        print(f"Using fallback icon: {ico_path} for {icon_path}")
-        return QIcon(ico_path)
-
-    # Last resort - empty icon
-    print(f"WARNING: No icon found for {icon_path}")
-    return QIcon()
+# Print the periodic timers and the idle wakeup rate this long after startup (--audit-wakeups)
+WAKEUP_AUDIT_DELAY_MS = 10000
+
+# Longest the idle worker and the instance server block before checking whether to stop
+IDLE_WAIT_SECONDS = 60
+
+# Levelled loggers, see app_logging.get_logger
+worker_log = get_logger("worker")
+watcher_log = get_logger("watcher")
+scan_log = get_logger("scanner")
 
 def set_window_title_bar_theme(hwnd, is_dark):
     """Set the window title bar theme to dark or light mode using Windows DWM API"""
@@ -211,22 +184,29 @@ def is_valid_filename_format(filename):
 
 class FileProcessorWorker(QObject):
     finished = pyqtSignal()
-    progress = pyqtSignal(str, str, str)
     initial_scan_complete = pyqtSignal()
 
-    def __init__(self, queue, batch_size=5, max_file_age_hours=24):
+    def __init__(self, queue, engine_config=None, batch_size=5, rate_limiter=None):
         super().__init__()
         self.queue = queue
         self.batch_size = batch_size
-        self.max_file_age_hours = max_file_age_hours
+        # Read-only settings, replaced as a whole by the UI thread when they change
+        self.engine_config = engine_config or EngineConfig()
+        self.rate_limiter = rate_limiter or TargetRateLimiter()
+        self.dir_cache = DirectoryCache()  # Destination folders known to exist
+        self.dedupe_indexes = {}  # Duplicate index per target root, loaded on first use
+        self.retry_scheduler = RetryScheduler()  # Backoff for files that could not be moved
+        self.retry_error = None  # Set by _process_single_file when a failure is worth retrying
         self.running = True
         self.initial_scan_done = False
         self.processed_files = set()  # Keep track of processed files
+        # Source -> destination that already existed, warned about once instead of on every rescan
+        self.conflicts = {}
 
     def do_initial_scan(self, watch_pairs):
         """Perform initial scan for today's files"""
         try:
-            self.progress.emit("Starting initial scan for today's files...", None, None)
+            worker_log.info("Starting initial scan for today's files...")
             today_start = time.time() - (24 * 3600)  # 24 hours ago
 
             for watch, target in watch_pairs:
@@ -258,48 +238,64 @@ class FileProcessorWorker(QObject):
                     # Process the sorted items
                     for _, item, src in items_with_time:
                         if ',' in item:  # Basic validation before detailed check
-                            self.queue.put((item, src, watch, target, None))
+                            self.queue.put((item, src, watch, target, None), PRIORITY_BACKFILL)
 
                 except Exception as e:
-                    self.progress.emit(f"Error scanning directory {watch}: {str(e)}", None, None)
+                    worker_log.error("Error scanning directory %s: %s", watch, e)
                     continue
 
-            self.progress.emit("Initial scan complete", None, None)
+            worker_log.info("Initial scan complete")
             self.initial_scan_done = True
             self.initial_scan_complete.emit()
 
         except Exception as e:
-            self.progress.emit(f"Error during initial scan: {str(e)}", None, None)
+            worker_log.error("Error during initial scan: %s", e)
             self.initial_scan_done = True
             self.initial_scan_complete.emit()
 
     def process_files(self):
+        # Moving files is background work, keep it from competing with foreground apps
+        set_current_thread_background()
+
         while self.running:
             try:
+                # Requeue files whose retry delay has passed
+                for item, priority in self.retry_scheduler.pop_due():
+                    self.queue.put(item, priority)
+
                 # Process files in smaller batches
                 batch = []
                 temp_batch = []
 
-                # Collect items from queue
+                # Collect items from queue, highest priority first
                 for _ in range(self.batch_size * 2):
                     if not self.queue.empty():
-                        temp_batch.append(self.queue.get())
+                        temp_batch.append(self.queue.get_with_priority())
                     else:
                         break
 
                 if not temp_batch:
-                    # No files to process, sleep briefly
-                    time.sleep(0.5)
+                    # Persist duplicate index changes while idle
+                    self.flush_dedupe_indexes()
+                    self.wait_for_work()
                     continue
 
-                # Sort and filter files by age
+                # Sort and filter files by the age limit of their pair
                 current_time = time.time()
+                config = self.engine_config
                 sorted_batch = []
 
-                for item in temp_batch:
+                for priority, item in temp_batch:
+                    if item is None:
+                        continue  # Wakeup from stop()
                     try:
                         src = item[1]
+                        # Files waiting for a retry are not touched until they are due
+                        if self.retry_scheduler.is_waiting(src):
+                            continue
+
                         if not os.path.exists(src):
+                            self.retry_scheduler.succeeded(src)
                             continue
 
                         # Skip if we've already processed this file recently
@@ -310,48 +306,133 @@ class FileProcessorWorker(QObject):
                         if ',' not in filename:
                             continue
 
+                        pair = config.pair_for(item[2], item[3])
+                        max_age_seconds = config.max_age_seconds if pair is None else pair.max_age_seconds
                         file_mtime = os.path.getmtime(src)
-                        file_age_hours = (current_time - file_mtime) / 3600
-
-                        if file_age_hours <= self.max_file_age_hours:
-                            sorted_batch.append((file_mtime, item))
+                        if max_age_seconds is None or current_time - file_mtime <= max_age_seconds:
+                            sorted_batch.append((priority, file_mtime, item, pair))
 
                     except Exception:
                         continue
 
-                # Sort by modification time (newest first)
-                sorted_batch.sort(key=lambda x: x[0], reverse=True)
-                batch = [item[1] for item in sorted_batch[:self.batch_size]]
+                # Sort by priority, then modification time (newest first)
+                sorted_batch.sort(key=lambda x: (x[0], -x[1]))
+
+                # Take at most `concurrency` files of a pair per batch, so one
+                # busy pair cannot hold up the others
+                batch, rest, taken = [], [], {}
+                for entry in sorted_batch:
+                    limit = entry[3].concurrency if entry[3] is not None else 0
+                    if len(batch) < self.batch_size and (not limit or taken.get(entry[3], 0) < limit):
+                        batch.append((entry[0], entry[2]))
+                        if limit:
+                            taken[entry[3]] = taken.get(entry[3], 0) + 1
+                    else:
+                        rest.append(entry)
 
-                for item in batch:
+                # Put the rest back so lower priority work is not dropped
+                for priority, _, item, _ in rest:
+                    self.queue.put(item, priority)
+
+                for priority, item in batch:
                     if not self.running:
                         break
                     try:
+                        self.retry_error = None
                         if self._process_single_file(*item):
+                            self.retry_scheduler.succeeded(item[1])
                             # Add to processed files set if successfully processed
                             self.processed_files.add(item[1])
 
                             # Limit the size of processed_files set
                             if len(self.processed_files) > 1000:
                                 self.processed_files.clear()
+                        elif self.retry_error is not None:
+                            self.schedule_retry(item, priority, self.retry_error)
                     except Exception as e:
-                        self.progress.emit(f"Error processing {item[0]}: {str(e)}", None, None)
+                        worker_log.error("Error processing %s: %s", item[0], e)
 
                     # Small delay between files
                     time.sleep(0.1)
 
             except Exception as e:
-                self.progress.emit(f"Batch processing error: {str(e)}", None, None)
+                worker_log.error("Batch processing error: %s", e)
                 time.sleep(1)
 
+        self.flush_dedupe_indexes()
         self.finished.emit()
 
+    def schedule_retry(self, item, priority, error):
+        """Retry a failed file later with backoff, or give up after too many attempts"""
+        delay = self.retry_scheduler.schedule_failure(item, priority, error)
+        if delay is None:
+            worker_log.warning("Giving up on %s after %d attempts, see Failed Files in the Logs tab: %s",
+                               item[0], self.retry_scheduler.max_attempts, error)
+        else:
+            worker_log.info("Will retry %s in %.0fs (attempt %d/%d)", item[0], delay,
+                            self.retry_scheduler.attempts(item[1]), self.retry_scheduler.max_attempts)
+
+    def get_dedupe_index(self, target):
+        """Return the duplicate index for a target root, loading it on first use"""
+        index = self.dedupe_indexes.get(target)
+        if index is None:
+            index = DuplicateIndex(target)
+            self.dedupe_indexes[target] = index
+        return index
+
+    def flush_dedupe_indexes(self):
+        """Save any duplicate index with unsaved changes"""
+        for index in self.dedupe_indexes.values():
+            index.flush()
+
+    def _store_duplicate(self, item, src, target, dest, dest_path):
+        """
+        Consult the target's duplicate index before moving src.
+
+        Returns (handled, hashes). handled is None if src is not a duplicate and
+        the caller should move it, otherwise True/False for whether the duplicate
+        was stored. hashes is (size, partial_hash, full_hash) for indexing the moved file.
+        """
+        index = self.get_dedupe_index(target)
+        size = os.path.getsize(src)
+        duplicate, partial, full = index.find_duplicate(src, size)
+        hashes = (size, partial, full)
+        if duplicate is None:
+            return None, hashes
+
+        if self.engine_config.dedupe_mode == DEDUPE_HARDLINK:
+            try:
+                os.link(duplicate, dest)
+            except OSError as link_error:
+                # Hardlinks need the same volume and filesystem support
+                worker_log.warning("Could not hardlink duplicate %s, moving instead: %s", item, link_error)
+                return None, hashes
+            try:
+                os.remove(src)
+            except OSError as remove_error:
+                os.remove(dest)
+                worker_log.error("Error removing duplicate source %s: %s", item, remove_error)
+                return False, hashes
+            index.add(dest, size, partial, full)
+            worker_log.info("Linked duplicate: %s → %s (same as %s)", item, dest_path, duplicate,
+                            extra={"src": src, "dest": dest})
+            return True, hashes
+
+        # Delete mode: the content is already stored in the target
+        try:
+            os.remove(src)
+        except OSError as remove_error:
+            worker_log.error("Error removing duplicate %s: %s", item, remove_error)
+            return False, hashes
+        worker_log.info("Deleted duplicate: %s (already stored at %s)", item, duplicate)
+        return True, hashes
+
     def _process_single_file(self, item, src, watch_dir, target, startupinfo=None):
         """Returns True if file was processed successfully"""
         try:
             # Verify file still exists
             if not os.path.exists(src):
-                self.progress.emit(f"File no longer exists: {src}", None, None)
+                worker_log.debug("File no longer exists: %s", src)
                 return False
 
             # Skip system files
@@ -420,7 +501,7 @@ class FileProcessorWorker(QObject):
             base_name = base_name.rstrip('-').strip()
 
             # Log the base name for debugging
-            self.progress.emit(f"Base name extracted: {base_name}", None, None)
+            worker_log.debug("Base name extracted: %s", base_name)
 
             # Ensure extension is preserved
             final_name = base_name if base_name.lower().endswith(extension.lower()) else base_name + extension
@@ -452,7 +533,7 @@ class FileProcessorWorker(QObject):
                 # Add parentheses tags to subfolders
                 subfolders.extend(paren_tags)
             except Exception as e:
-                self.progress.emit(f"Error processing parentheses in {item}: {str(e)}", None, None)
+                worker_log.warning("Error processing parentheses in %s: %s", item, e)
 
             # Process tags in brackets - improved pattern
             try:
@@ -478,7 +559,7 @@ class FileProcessorWorker(QObject):
                 # Add bracket tags to subfolders
                 subfolders.extend(bracket_tags)
             except Exception as e:
-                self.progress.emit(f"Error processing brackets in {item}: {str(e)}", None, None)
+                worker_log.warning("Error processing brackets in %s: %s", item, e)
 
             # Process tags in dashes - improved pattern to handle dash-separated tags
             try:
@@ -519,25 +600,28 @@ class FileProcessorWorker(QObject):
                     subfolders.extend(filtered_tags)
 
                     # Debug log for dash pattern processing
-                    self.progress.emit(f"Dash pattern extracted: {filtered_tags}", None, None)
+                    worker_log.debug("Dash pattern extracted: %s", filtered_tags)
             except Exception as e:
-                self.progress.emit(f"Error processing dashes in {item}: {str(e)}", None, None)
+                worker_log.warning("Error processing dashes in %s: %s", item, e)
 
             # Debug log for troubleshooting
-            self.progress.emit(f"Processing: {item} with subfolders: {subfolders}", None, None)
+            worker_log.debug("Processing: %s with subfolders: %s", item, subfolders)
 
             # Create destination path
             dest_path = os.path.join(target, main_folder, *subfolders)
 
             try:
-                # Create destination directory with better error handling
+                # Create destination directory with better error handling,
+                # skipping the filesystem when the folder is already known to exist
                 try:
-                    os.makedirs(dest_path, exist_ok=True)
-                except PermissionError:
-                    self.progress.emit(f"Permission denied creating directory: {dest_path}", None, None)
+                    self.dir_cache.ensure(target, dest_path)
+                except PermissionError as dir_error:
+                    worker_log.error("Permission denied creating directory: %s", dest_path)
+                    self.retry_error = dir_error
                     return False
                 except Exception as dir_error:
-                    self.progress.emit(f"Error creating directory {dest_path}: {str(dir_error)}", None, None)
+                    worker_log.error("Error creating directory %s: %s", dest_path, dir_error)
+                    self.retry_error = dir_error
                     return False
 
                 # Full destination path
@@ -545,204 +629,236 @@ class FileProcessorWorker(QObject):
 
                 # Skip if destination already exists
                 if os.path.exists(dest):
-                    self.progress.emit(f"Destination already exists: {dest}", None, None)
+                    if self.conflicts.get(src) == dest:
+                        worker_log.debug("Destination still exists: %s", dest)
+                    else:
+                        worker_log.warning("Destination already exists: %s", dest)
+                        if len(self.conflicts) > 1000:
+                            self.conflicts.clear()
+                        self.conflicts[src] = dest
                     return False
+                self.conflicts.pop(src, None)
+
+                # Don't store a second copy of a file already in the target
+                dedupe_hashes = None
+                if self.engine_config.dedupe_mode != DEDUPE_OFF and not os.path.isdir(src):
+                    try:
+                        handled, dedupe_hashes = self._store_duplicate(item, src, target, dest, dest_path)
+                        if handled is not None:
+                            return handled
+                    except Exception as dedupe_error:
+                        worker_log.warning("Duplicate check failed for %s: %s", item, dedupe_error)
+
+                # Respect the target's bandwidth and operation limits
+                if self.rate_limiter.is_limited(target):
+                    self.rate_limiter.acquire(target, self._move_cost(src, dest_path), lambda: self.running)
 
                 # Move the file
                 try:
-                    if platform.system() == 'Windows' and os.path.isdir(src):
-                        # Use robocopy for directories on Windows with better error handling
-                        try:
-                            # Create startupinfo if not provided
-                            if startupinfo is None:
-                                startupinfo = subprocess.STARTUPINFO()
-                                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                                startupinfo.wShowWindow = 0  # SW_HIDE
-
-                            # Log the move operation
-                            self.progress.emit(f"Moving directory: {src} to {dest}", None, None)
-
-                            cmd = ["robocopy", src, dest, "/E", "/MOVE", "/NFL", "/NDL", "/NJH", "/NJS", "/R:2", "/W:2"]
-                            result = subprocess.run(cmd,
-                                                 startupinfo=startupinfo,
-                                                 stdout=subprocess.PIPE,
-                                                 stderr=subprocess.PIPE,
-                                                 timeout=60)  # Add timeout
-
-                            # Robocopy has special return codes, anything <= 8 is success
-                            if result.returncode > 8:
-                                error_output = result.stderr.decode('utf-8', errors='replace')
-                                raise Exception(f"Robocopy failed with code {result.returncode}: {error_output}")
-                        except subprocess.TimeoutExpired:
-                            self.progress.emit(f"Timeout while moving directory {item}", None, None)
-                            return False
-                        except FileNotFoundError:
-                            # Fallback if robocopy is not available
-                            self.progress.emit("Robocopy not found, falling back to shutil", None, None)
-                            shutil.move(src, dest)
-                    else:
-                        # Use shutil for files or non-Windows platforms
-                        self.progress.emit(f"Moving file: {src} to {dest}", None, None)
-                        shutil.move(src, dest)
+                    try:
+                        moved, checksum = self._move_item(item, src, dest, startupinfo)
+                    except FileNotFoundError:
+                        if not os.path.exists(src):
+                            raise
+                        # The cached destination folder was removed, create it again and retry once
+                        self.dir_cache.invalidate(dest_path)
+                        self.dir_cache.ensure(target, dest_path)
+                        moved, checksum = self._move_item(item, src, dest, startupinfo)
+                    if not moved:
+                        self.retry_error = "Timed out"
+                        return False
 
-                    self.progress.emit(f"Moved: {item} → {dest_path}", src, dest)
+                    # Index the new file so later copies are recognised
+                    if dedupe_hashes is not None:
+                        size, partial, full = dedupe_hashes
+                        if full is None and checksum is not None and size > PARTIAL_HASH_BYTES * 2:
+                            # The verified copy already hashed the whole file
+                            full = checksum
+                        self.get_dedupe_index(target).add(dest, size, partial, full)
+
+                    if checksum is not None:
+                        worker_log.info("Moved: %s → %s (verified, %s)", item, dest_path, checksum[:12],
+                                        extra={"src": src, "dest": dest, "checksum": checksum})
+                    else:
+                        worker_log.info("Moved: %s → %s", item, dest_path, extra={"src": src, "dest": dest})
+                    startup_milestone("first organized file")
                     return True
 
-                except PermissionError:
-                    self.progress.emit(f"Permission denied moving {item}", None, None)
+                except VerifyError as verify_error:
+                    worker_log.error("Copy verification failed, kept original %s: %s", item, verify_error)
+                    self.retry_error = verify_error
+                    return False
+                except PermissionError as move_error:
+                    # Usually the file is still open in another program
+                    worker_log.warning("Permission denied moving %s", item)
+                    self.retry_error = move_error
                     return False
                 except FileNotFoundError:
-                    self.progress.emit(f"File disappeared during move: {item}", None, None)
+                    worker_log.warning("File disappeared during move: %s", item)
                     return False
                 except Exception as move_error:
-                    self.progress.emit(f"Error moving file {item}: {str(move_error)}", None, None)
+                    worker_log.error("Error moving file %s: %s", item, move_error)
                     print(f"Move error details: {traceback.format_exc()}")
+                    self.retry_error = move_error
                     return False
 
             except Exception as e:
-                self.progress.emit(f"Error setting up destination for {item}: {str(e)}", None, None)
+                worker_log.error("Error setting up destination for %s: %s", item, e)
                 return False
 
         except Exception as e:
-            self.progress.emit(f"Error processing {item}: {str(e)}", None, None)
+            worker_log.error("Error processing %s: %s", item, e)
             print(f"Error details for {item}: {traceback.format_exc()}")
             return False
 
-    def stop(self):
-        self.running = False
-
-# Only define FileWatcher if watchdog is available
-if USE_WATCHDOG:
-    class FileWatcher(FileSystemEventHandler):
-        """Watches for file system changes and processes files immediately"""
-
-        def __init__(self, watch_dir, target_dir, file_queue, logging_signal):
-            super().__init__()  # Add super() call to properly initialize FileSystemEventHandler
-            self.watch_dir = watch_dir
-            self.target_dir = target_dir
-            self.file_queue = file_queue
-            self.logging_signal = logging_signal
-            self.observer = Observer()
-            self.observer.schedule(self, watch_dir, recursive=False)
-            self.processed_files = set()  # Track processed files to avoid duplicates
-
-        def start(self):
-            """Start watching the directory"""
-            if not self.observer.is_alive():
-                self.observer.start()
-                self.logging_signal.emit(f"Started watching {self.watch_dir}", None, None)
-
-        def stop(self):
-            """Stop watching the directory"""
-            if self.observer.is_alive():
-                self.observer.stop()
-                self.observer.join()
-                self.logging_signal.emit(f"Stopped watching {self.watch_dir}", None, None)
-
-        def on_created(self, event):
-            """Handle file creation events"""
-            if event.is_directory:
-                return
-            self._process_file(event.src_path)
-
-        def on_modified(self, event):
-            """Handle file modification events"""
-            if event.is_directory:
-                return
-            self._process_file(event.src_path)
-
-        def on_moved(self, event):
-            """Handle file move/rename events"""
-            if event.is_directory:
-                return
-            # Process the destination path since that's where the file ended up
-            self._process_file(event.dest_path)
+    def _move_item(self, item, src, dest, startupinfo=None):
+        """
+        Move a file or directory to dest. Raises on errors.
 
-        def _process_file(self, file_path):
-            """Process a single file"""
+        Returns (moved, checksum); moved is False on timeout and checksum is set
+        when a cross-device file copy was verified.
+        """
+        if platform.system() == 'Windows' and os.path.isdir(src):
+            # Use robocopy for directories on Windows with better error handling
             try:
-                # Get just the filename
-                filename = os.path.basename(file_path)
-
-                # Create a unique identifier for this file event
-                file_id = f"{filename}_{os.path.getmtime(file_path)}"
-
-                # Skip if we've already processed this exact file event
-                if file_id in self.processed_files:
-                    return
+                # Create startupinfo if not provided
+                if startupinfo is None:
+                    startupinfo = subprocess.STARTUPINFO()
+                    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+                    startupinfo.wShowWindow = 0  # SW_HIDE
 
-                # Skip system files and files without commas
-                if filename.startswith('.') or filename.startswith('$'):
-                    self.logging_signal.emit(f"Skipping system file: {filename}", None, None)
-                    return
-
-                if ',' not in filename:
-                    self.logging_signal.emit(f"Skipping file without comma: {filename}", None, None)
-                    return
+                # Log the move operation
+                worker_log.debug("Moving directory: %s to %s", src, dest)
 
-                # Basic validation before queueing
-                try:
-                    prefix, remainder = filename.split(',', 1)
-                    prefix = prefix.strip()
-                    remainder = remainder.strip()
-                    if not prefix or not remainder:
-                        self.logging_signal.emit(f"Skipping file - invalid format (empty prefix or name): {filename}", None, None)
-                        return
-                except:
-                    self.logging_signal.emit(f"Skipping file - error splitting filename: {filename}", None, None)
-                    return
-
-                # Add to processed files set to avoid duplicates
-                self.processed_files.add(file_id)
+                cmd = ["robocopy", src, dest, "/E", "/MOVE", "/NFL", "/NDL", "/NJH", "/NJS", "/R:2", "/W:2"]
+                result = subprocess.run(cmd,
+                                     startupinfo=startupinfo,
+                                     stdout=subprocess.PIPE,
+                                     stderr=subprocess.PIPE,
+                                     timeout=60)  # Add timeout
+
+                # Robocopy has special return codes, anything <= 8 is success
+                if result.returncode > 8:
+                    error_output = result.stderr.decode('utf-8', errors='replace')
+                    raise Exception(f"Robocopy failed with code {result.returncode}: {error_output}")
+            except subprocess.TimeoutExpired:
+                worker_log.warning("Timeout while moving directory %s", item)
+                return False, None
+            except FileNotFoundError:
+                # Fallback if robocopy is not available
+                worker_log.info("Robocopy not found, falling back to shutil")
+                shutil.move(src, dest)
+        elif self.engine_config.verify_mode != VERIFY_OFF and not os.path.isdir(src):
+            # Copy, checksum and compare before the original is deleted
+            worker_log.debug("Moving file: %s to %s", src, dest)
+            return True, verified_move(src, dest, self.engine_config.verify_mode)
+        else:
+            # Use shutil for files or non-Windows platforms
+            worker_log.debug("Moving file: %s to %s", src, dest)
+            shutil.move(src, dest)
+        return True, None
 
-                # Limit the size of processed_files set
-                if len(self.processed_files) > 1000:
-                    self.processed_files.clear()
+    def _move_cost(self, src, dest_dir):
+        """Return the bytes a move will copy, 0 for same-volume renames and directories"""
+        try:
+            if os.path.isdir(src):
+                return 0
+            src_stat = os.stat(src)
+            if src_stat.st_dev == os.stat(dest_dir).st_dev:
+                return 0
+            return src_stat.st_size
+        except OSError:
+            return 0
+
+    def wait_for_work(self):
+        """Sleep until a file is queued, the next retry is due or stop() is called"""
+        wait = self.retry_scheduler.seconds_until_next()
+        timeout = IDLE_WAIT_SECONDS if wait is None else max(0.0, min(wait, IDLE_WAIT_SECONDS))
+        try:
+            priority, item = self.queue.get_with_priority(timeout=timeout)
+        except queue.Empty:
+            return
+        if item is not None:
+            # Handled with the next batch, in priority order
+            self.queue.put(item, priority)
 
-                # Queue the file for processing
-                if os.path.exists(file_path):  # Double check file still exists
-                    self.logging_signal.emit(f"Detected new file: {filename}", None, None)
-                    self.file_queue.put((filename, file_path, self.watch_dir, self.target_dir, None))
+    def stop(self):
+        self.running = False
+        # Wake the worker if it is waiting for files
+        self.queue.put(None, PRIORITY_INTERACTIVE)
 
-            except Exception as e:
-                self.logging_signal.emit(f"Error processing file {file_path}: {str(e)}", None, None)
+def load_folder_watchers():
+    """
+    Import the watchdog based folder watchers, None if watchdog cannot be used.
 
-        def __del__(self):
-            """Ensure observer is stopped when the watcher is destroyed"""
-            try:
-                if hasattr(self, 'observer'):
-                    self.stop()
-            except:
-                pass
+    Importing watchdog is a noticeable part of the startup time, so this runs
+    when watching first starts instead of when the app starts.
+    """
+    try:
+        import folder_watchers
+        # Test that Observer can actually be instantiated
+        folder_watchers.Observer()
+        print("Successfully imported and tested watchdog")
+        return folder_watchers
+    except ImportError as e:
+        print(f"Watchdog import error: {str(e)}")
+        print("Python path:", sys.path)
+        print("Falling back to polling method")
+    except Exception as e:
+        print(f"Unexpected error importing watchdog: {str(e)}")
+        print(f"Error details: {traceback.format_exc()}")
+        print("Falling back to polling method")
+    return None
 
 class WatcherManager:
     """Manages file watching using either watchdog or polling"""
 
-    def __init__(self, file_queue, logging_signal):
+    def __init__(self, file_queue, dir_cache=None):
         self.watchers = []
+        self.target_watcher = None
         self.file_queue = file_queue
-        self.logging_signal = logging_signal
-        self.use_watchdog = USE_WATCHDOG
-        self.polling_timer = None if USE_WATCHDOG else QTimer()
+        self.dir_cache = dir_cache
+        self.folder_watchers = None
+        self.use_watchdog = None  # Decided when watching first starts
+        self.polling_timer = None
         self.watch_pairs = []
 
-        if not USE_WATCHDOG and self.polling_timer:
-            self.polling_timer.timeout.connect(self._poll_directories)
+    def _load_watchers(self):
+        """Choose between watchdog and polling the first time watchers are needed"""
+        if self.use_watchdog is None:
+            self.folder_watchers = load_folder_watchers()
+            self.use_watchdog = self.folder_watchers is not None
+            if not self.use_watchdog:
+                self.polling_timer = periodic_timer("Folder polling (no watchdog)")
+                self.polling_timer.timeout.connect(self._poll_directories)
+        return self.use_watchdog
 
     def update_watchers(self, watch_pairs):
         """Update watchers based on current watch pairs"""
         self.watch_pairs = watch_pairs
 
-        if self.use_watchdog:
+        if self._load_watchers():
             # Stop existing watchers
             self.stop_all()
 
             # Create new watchers for each pair
             for watch_dir, target_dir in watch_pairs:
                 if watch_dir and target_dir:
-                    watcher = FileWatcher(watch_dir, target_dir, self.file_queue, self.logging_signal)
+                    watcher = self.folder_watchers.FileWatcher(watch_dir, target_dir, self.file_queue)
                     watcher.start()
                     self.watchers.append(watcher)
+
+            # Keep the destination folder cache in sync with changes made in the targets
+            if self.dir_cache is not None:
+                target_dirs = sorted({target_dir for watch_dir, target_dir in watch_pairs
+                                      if watch_dir and target_dir and os.path.isdir(target_dir)})
+                try:
+                    self.target_watcher = self.folder_watchers.TargetWatcher(target_dirs, self.dir_cache)
+                    self.target_watcher.start()
+                except Exception as e:
+                    # Without target events the cache still recovers from failed moves
+                    self.target_watcher = None
+                    watcher_log.warning("Could not watch target folders for changes: %s", e)
         else:
             # Using polling method
             if self.polling_timer and not self.polling_timer.isActive():
@@ -779,10 +895,10 @@ class WatcherManager:
                         self.file_queue.put((filename, file_path, watch_dir, target_dir, None))
 
                 except Exception as e:
-                    self.logging_signal.emit(f"Error polling directory {watch_dir}: {str(e)}", None, None)
+                    watcher_log.error("Error polling directory %s: %s", watch_dir, e)
 
         except Exception as e:
-            self.logging_signal.emit(f"Error during polling: {str(e)}", None, None)
+            watcher_log.error("Error during polling: %s", e)
 
     def stop_all(self):
         """Stop all watchers"""
@@ -790,18 +906,29 @@ class WatcherManager:
             for watcher in self.watchers:
                 watcher.stop()
             self.watchers.clear()
+            if self.target_watcher is not None:
+                self.target_watcher.stop()
+                self.target_watcher = None
         else:
             if self.polling_timer and self.polling_timer.isActive():
                 self.polling_timer.stop()
 
 class WatcherApp(QMainWindow):
-    logging_signal = pyqtSignal(str, str, str)
-
     # Create a signal for instance activation
     instance_activation_signal = pyqtSignal()
 
     def __init__(self, instance_checker=None):
         super().__init__()
+
+        # Decode the icons in the background while the rest is set up
+        preload_icons()
+
+        # Log messages from the UI, worker and watcher threads are delivered in batches
+        self.logging_signal = LogBuffer(parent=self)
+        self.logging_signal.batch_ready.connect(self.safe_log_batch)
+        # Connected before the logs tab saves on quit, so the last batch is kept
+        QApplication.instance().aboutToQuit.connect(self.logging_signal.drain)
+
         self.setWindowTitle("Auto Organizer")
         self.setWindowIcon(safe_icon("icons/icon.ico"))  # Updated path
         self.setGeometry(100, 100, 800, 550)  # Slightly larger window
@@ -840,9 +967,6 @@ class WatcherApp(QMainWindow):
                 print(f"Error setting up instance checker activation: {str(e)}")
                 # Continue without monkey patching
 
-        # Register application with Windows
-        self.register_application()
-
         # Set proper window flags to show all buttons
         self.setWindowFlags(Qt.Window | Qt.WindowMinMaxButtonsHint | Qt.WindowCloseButtonHint)
 
@@ -854,33 +978,39 @@ class WatcherApp(QMainWindow):
         self.open_action = None
         self.exit_action = None
         self.watching = False
+        self.applied_theme = None  # Theme the application has, see apply_theme()
+        self.title_bar_theme = None  # (window handle, dark) the title bar was set to
 
         # Load config first as other initializations may need it
+        self.config_store = ConfigStore(CONFIG_FILE)
         self.load_config()
+        setup_logging(self.logging_signal, self.config.get("log_level", DEFAULT_LOG_LEVEL))
+        mark_startup("config")
 
         # Initialize system tray immediately and ensure it's created
         self.setup_tray()
         if not self.tray or not self.tray.isSystemTrayAvailable():
             print("Warning: System tray is not available")
+        mark_startup("tray icon")
 
         # Initialize file processing queue and worker
-        self.file_queue = Queue()
+        self.file_queue = FileQueue()
         self.worker_thread = QThread()
-        max_age = self.config.get("max_file_age_hours", 24)
-        self.file_processor = FileProcessorWorker(self.file_queue, max_file_age_hours=max_age)
+        # The scanner and the worker only read this snapshot, see apply_engine_config()
+        self.engine_config = EngineConfig.from_config(self.config)
+        self.file_processor = FileProcessorWorker(self.file_queue, self.engine_config,
+                                                  rate_limiter=TargetRateLimiter(self.config))
         self.file_processor.moveToThread(self.worker_thread)
-        self.file_processor.progress.connect(self.safe_log)
         self.worker_thread.started.connect(self.file_processor.process_files)
         self.file_processor.finished.connect(self.worker_thread.quit)
 
         # Initialize watcher manager before any potential usage
-        self.watcher_manager = WatcherManager(self.file_queue, self.logging_signal)
+        self.watcher_manager = WatcherManager(self.file_queue, self.file_processor.dir_cache)
+        mark_startup("worker")
 
         # Initialize tabs and UI
         self.init_tabs()
-
-        # Connect the logging signal to the logs tab
-        self.logging_signal.connect(self.safe_log)
+        mark_startup("tabs")
 
         # Setup timers
         self.setup_timers()
@@ -888,14 +1018,8 @@ class WatcherApp(QMainWindow):
         # Connect initial scan complete signal
         self.file_processor.initial_scan_complete.connect(self.on_initial_scan_complete)
 
-        # Start the worker thread
-        self.worker_thread.start()
-
-        # Perform initial scan
-        pairs = self.main_tab.get_watch_pairs()
-        if pairs:
-            QTimer.singleShot(1000, lambda: self.file_processor.do_initial_scan(pairs))
-            self.logging_signal.emit("Starting initial scan for today's files...", None, None)
+        # Start the worker thread at low priority
+        self.worker_thread.start(QThread.LowPriority)
 
         # Apply theme (must be done after UI initialization)
         self.apply_theme(self.config.get("theme", "System Default"))
@@ -907,14 +1031,43 @@ class WatcherApp(QMainWindow):
             super(WatcherApp, self).showEvent(event)
 
         self.showEvent = custom_show_event
+        mark_startup("theme")
 
         # Auto-hide if configured
         if self.config.get("minimize_on_startup", False):
             QTimer.singleShot(0, self.hide_to_tray)
 
-        # Start watching if start on launch is enabled
+        # The rest waits until the window or the tray icon is up
+        QTimer.singleShot(0, self.finish_startup)
+
+        if "--audit-wakeups" in sys.argv:
+            QTimer.singleShot(WAKEUP_AUDIT_DELAY_MS, self.print_wakeup_audit)
+
+    def finish_startup(self):
+        """Startup work that is not needed to show the window, run once the event loop is running"""
+        mark_startup("event loop started")
+
+        # Perform initial scan
+        pairs = self.engine_config.watch_pairs()
+        if pairs:
+            self.logging_signal.emit("Starting initial scan for today's files...", None, None)
+            self.file_processor.do_initial_scan(pairs)
+
+        # Register application with Windows
+        self.register_application()
+
+        # Keep the startup entry if start on launch is enabled
         if self.config.get("start_on_launch", False):
-            QTimer.singleShot(1000, lambda: self.handle_start_on_launch(True))
+            self.handle_start_on_launch(True)
+
+        self.set_tab_icons()
+        mark_startup("tab icons")
+
+    def print_wakeup_audit(self):
+        """Print every periodic timer and how often the idle app wakes up"""
+        print("Periodic timers:")
+        for line in wakeup_report():
+            print(f"  {line}")
 
     def register_application(self):
         """Register the application with Windows with better error handling for Windows 10/11"""
@@ -1004,6 +1157,7 @@ class WatcherApp(QMainWindow):
 
     def on_initial_scan_complete(self):
         """Handle completion of initial scan"""
+        mark_startup("first scan")
         self.logging_signal.emit("Initial scan complete - ready to watch for new files", None, None)
         # Start watching if auto-watch is enabled
         if self.config.get("auto_watch", True):
@@ -1113,7 +1267,7 @@ class WatcherApp(QMainWindow):
 
     def enable_watching(self):
         """Enable watching from tray menu"""
-        pairs = self.main_tab.get_watch_pairs()
+        pairs = self.engine_config.watch_pairs()
         if not pairs:
             self.main_tab.status.setText("Add at least one watcher pair ❗")
             self.main_tab.update_status_style()
@@ -1128,47 +1282,15 @@ class WatcherApp(QMainWindow):
         self.watching = True
         self.watcher_manager.update_watchers(pairs)  # Start real-time watchers
 
-        # Start the timer for regular scanning (every 5 seconds)
-        self.timer.start(5000)
+        # Rescan each pair at its own interval
+        self.scan_scheduler.start()
 
         # Do an immediate scan
-        self.scan_all_pairs()
-
-        self.main_tab.toggle_btn.setText("Stop Watching")
-        self.main_tab.toggle_btn.setIcon(safe_icon("icons/stop.png") if os.path.exists(get_resource_path("icons/stop.png")) else QIcon())
-        self.main_tab.toggle_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #f44336;
-                color: white;
-                font-weight: bold;
-                font-size: 14px;
-                border-radius: 4px;
-                padding: 8px 16px;
-                border: 2px solid #D32F2F;
-                outline: none;
-            }
-            QPushButton:hover {
-                background-color: #d32f2f;
-                border: 2px solid #B71C1C;
-            }
-            QPushButton:pressed {
-                background-color: #C62828;
-                border: 2px solid #8B0000;
-            }
-        """)
+        self.scan_all_pairs(PRIORITY_INTERACTIVE)
+
+        self.update_toggle_button()
         self.main_tab.status.setText("Status: Watching...")
-        self.main_tab.status.setStyleSheet("""
-            QLabel {
-                font-weight: bold;
-                font-size: 14px;
-                padding: 8px;
-                border: 1px solid #4CAF50;
-                border-radius: 4px;
-                background-color: #E8F5E9;
-                color: #2E7D32;
-                margin-top: 10px;
-            }
-        """)
+        self.main_tab.update_status_style()
         self.update_tray_menu()
 
         self.show_notification(
@@ -1182,34 +1304,15 @@ class WatcherApp(QMainWindow):
         """Disable watching from tray menu"""
         self.watching = False
         self.watcher_manager.stop_all()  # Stop all watchers
+        self.report_dir_cache_savings()
 
         # Stop the timer
-        if self.timer.isActive():
-            self.timer.stop()
-
-        self.main_tab.toggle_btn.setText("Start Watching")
-        self.main_tab.toggle_btn.setIcon(safe_icon("icons/play.png") if os.path.exists(get_resource_path("icons/play.png")) else QIcon())
-        self.main_tab.toggle_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #2196F3;
-                color: white;
-                font-weight: bold;
-                font-size: 14px;
-                border-radius: 4px;
-                padding: 8px 16px;
-                border: 2px solid #1976D2;
-                outline: none;
-            }
-            QPushButton:hover {
-                background-color: #0b7dda;
-                border: 2px solid #0D47A1;
-            }
-            QPushButton:pressed {
-                background-color: #1565C0;
-                border: 2px solid #0D47A1;
-            }
-        """)
+        if self.scan_scheduler.is_running():
+            self.scan_scheduler.stop()
+
+        self.update_toggle_button()
         self.main_tab.status.setText("Status: Stopped")
+        self.main_tab.update_status_style()
         self.update_tray_menu()
 
         self.show_notification(
@@ -1219,11 +1322,18 @@ class WatcherApp(QMainWindow):
             2000
         )
 
+    def update_toggle_button(self):
+        """Show Start Watching or Stop Watching on the toggle button"""
+        icon_name = "icons/stop.png" if self.watching else "icons/play.png"
+        self.main_tab.toggle_btn.setText("Stop Watching" if self.watching else "Start Watching")
+        self.main_tab.toggle_btn.setIcon(safe_icon(icon_name, fallback=False))
+        set_style_sheet(self.main_tab.toggle_btn, STOP_BUTTON_STYLE if self.watching else START_BUTTON_STYLE)
+
     def toggle_watch(self):
         """Toggle watching from main UI"""
         if not self.watching:
             # Get watch pairs from the main tab
-            pairs = self.main_tab.get_watch_pairs()
+            pairs = self.engine_config.watch_pairs()
             if not pairs:
                 self.main_tab.status.setText("Add at least one watcher pair ❗")
                 self.main_tab.update_status_style()
@@ -1232,34 +1342,13 @@ class WatcherApp(QMainWindow):
             self.watching = True
             self.watcher_manager.update_watchers(pairs)  # Start real-time watchers
 
-            # Start the timer for regular scanning (every 5 seconds)
-            self.timer.start(5000)
+            # Rescan each pair at its own interval
+            self.scan_scheduler.start()
 
             # Do an immediate scan
-            self.scan_all_pairs()
-
-            self.main_tab.toggle_btn.setText("Stop Watching")
-            self.main_tab.toggle_btn.setIcon(safe_icon("icons/stop.png") if os.path.exists(get_resource_path("icons/stop.png")) else QIcon())
-            self.main_tab.toggle_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #f44336;
-                    color: white;
-                    font-weight: bold;
-                    font-size: 14px;
-                    border-radius: 4px;
-                    padding: 8px 16px;
-                    border: 2px solid #D32F2F;
-                    outline: none;
-                }
-                QPushButton:hover {
-                    background-color: #d32f2f;
-                    border: 2px solid #B71C1C;
-                }
-                QPushButton:pressed {
-                    background-color: #C62828;
-                    border: 2px solid #8B0000;
-                }
-            """)
+            self.scan_all_pairs(PRIORITY_INTERACTIVE)
+
+            self.update_toggle_button()
             self.main_tab.status.setText("Status: Watching...")
             self.main_tab.update_status_style()
 
@@ -1273,33 +1362,13 @@ class WatcherApp(QMainWindow):
         else:
             self.watching = False
             self.watcher_manager.stop_all()  # Stop all watchers
+            self.report_dir_cache_savings()
 
             # Stop the timer
-            if self.timer.isActive():
-                self.timer.stop()
-
-            self.main_tab.toggle_btn.setText("Start Watching")
-            self.main_tab.toggle_btn.setIcon(safe_icon("icons/play.png") if os.path.exists(get_resource_path("icons/play.png")) else QIcon())
-            self.main_tab.toggle_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #2196F3;
-                    color: white;
-                    font-weight: bold;
-                    font-size: 14px;
-                    border-radius: 4px;
-                    padding: 8px 16px;
-                    border: 2px solid #1976D2;
-                    outline: none;
-                }
-                QPushButton:hover {
-                    background-color: #0b7dda;
-                    border: 2px solid #0D47A1;
-                }
-                QPushButton:pressed {
-                    background-color: #1565C0;
-                    border: 2px solid #0D47A1;
-                }
-            """)
+            if self.scan_scheduler.is_running():
+                self.scan_scheduler.stop()
+
+            self.update_toggle_button()
             self.main_tab.status.setText("Status: Stopped")
             self.main_tab.update_status_style()
 
@@ -1314,20 +1383,51 @@ class WatcherApp(QMainWindow):
         # Update tray menu to reflect new state
         self.update_tray_menu()
 
+    def report_dir_cache_savings(self):
+        """Log how many filesystem calls the destination folder cache saved"""
+        dir_cache = self.file_processor.dir_cache
+        if dir_cache.hits or dir_cache.invalidations:
+            self.logging_signal.emit(dir_cache.summary(), None, None)
+
+    def organize_now(self):
+        """Organize everything in the watch folders now, ahead of background scans"""
+        pairs = self.engine_config.watch_pairs()
+        if not pairs:
+            self.main_tab.status.setText("Add at least one watcher pair ❗")
+            self.main_tab.update_status_style()
+            return
+
+        self.scan_all_pairs(PRIORITY_INTERACTIVE)
+        self.statusBar().showMessage("Organizing watch folders now...", 3000)
+
+    def retry_failed_file(self, src):
+        """Take a file off the failed files list and queue it right away"""
+        record = self.file_processor.retry_scheduler.release(src)
+        if record is None:
+            return False
+        self.file_processor.processed_files.discard(src)
+        self.file_queue.put((record["item"], src, record["watch"], record["target"], None), PRIORITY_INTERACTIVE)
+        self.safe_log(f"Retrying {record['item']}")
+        return True
+
     def setup_timers(self):
         """Setup application timers"""
-        # Timer for scanning watch dirs
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.scan_all_pairs)
+        # Rescans each watch pair at its own interval, on one timer
+        self.scan_scheduler = ScanScheduler(self)
+        self.scan_scheduler.scan_due.connect(self.scan_pair)
+        self.scan_scheduler.set_pairs(self.engine_config.pairs)
         self.watching = False
 
-        # Timer to check for version changes
-        self.version_timer = QTimer()
-        self.version_timer.timeout.connect(self.refresh_version)
-        self.version_timer.start(5000)  # Check every 5 seconds
+        # The version is read once below. When running from source, version.txt
+        # can change under the running app (update_version.py), so it is
+        # watched; the file system notifies us and nothing polls
+        self.version_watcher = None
+        if not getattr(sys, 'frozen', False) and os.path.exists(VERSION_FILE):
+            self.version_watcher = QFileSystemWatcher([VERSION_FILE], self)
+            self.version_watcher.fileChanged.connect(self.on_version_file_changed)
 
         # Setup auto-update check timer (hourly = 3600000 ms)
-        self.update_timer = QTimer()
+        self.update_timer = periodic_timer("Update check")
         self.update_timer.timeout.connect(self.auto_check_for_updates)
         if self.config.get("auto_update_check", True):
             self.update_timer.start(3600000)  # Check every hour
@@ -1347,6 +1447,7 @@ class WatcherApp(QMainWindow):
         # Main tab - explicitly pass self as parent
         self.main_tab = MainTab(self)
         self.main_tab.toggle_btn.clicked.connect(self.toggle_watch)
+        self.main_tab.organize_now_btn.clicked.connect(self.organize_now)
         self.main_tab.load_settings(self.config)
 
         # Setup auto-save for main tab
@@ -1355,8 +1456,7 @@ class WatcherApp(QMainWindow):
         except Exception as e:
             print(f"Error connecting table itemChanged signal: {str(e)}")
 
-        # Use safe_icon for tab icons
-        self.tabs.addTab(self.main_tab, safe_icon("icons/watch.png"), "Watchers")
+        self.tabs.addTab(self.main_tab, "Watchers")
 
         # Settings tab - explicitly pass self as parent
         self.settings_tab = SettingsTab(self)
@@ -1372,16 +1472,29 @@ class WatcherApp(QMainWindow):
             print(f"Error loading settings tab: {str(e)}")
             print(f"Error details: {traceback.format_exc()}")
 
-        self.tabs.addTab(self.settings_tab, safe_icon("icons/settings.png"), "Settings")
+        self.tabs.addTab(self.settings_tab, "Settings")
 
         # Logs tab - explicitly pass self as parent
         self.logs_tab = LogsTab(self)
-        self.tabs.addTab(self.logs_tab, safe_icon("icons/logs.png"), "Logs")
+        self.tabs.addTab(self.logs_tab, "Logs")
 
         # About tab - explicitly pass self as parent
         self.about_tab = AboutTab(self, VERSION_FILE)
         self.about_tab.update_auto_update_status(self.config.get("auto_update_check", True))
-        self.tabs.addTab(self.about_tab, safe_icon("icons/info.png"), "About")
+        self.tabs.addTab(self.about_tab, "About")
+
+        # Tab icons are large images, they get set once the window is up, see set_tab_icons()
+        self.tab_icons = [
+            (self.main_tab, "icons/watch.png"),
+            (self.settings_tab, "icons/settings.png"),
+            (self.logs_tab, "icons/logs.png"),
+            (self.about_tab, "icons/info.png"),
+        ]
+
+    def set_tab_icons(self):
+        """Give the tabs their icons, read in the background by preload_icons() meanwhile"""
+        for tab, icon_path in self.tab_icons:
+            self.tabs.setTabIcon(self.tabs.indexOf(tab), safe_icon(icon_path))
 
     def auto_save_settings(self):
         """Auto-save settings when any setting is changed"""
@@ -1398,33 +1511,14 @@ class WatcherApp(QMainWindow):
                 # Stop the timer if auto-update is disabled
                 self.update_timer.stop()
 
-            # Update worker with new max age setting if it changed
-            new_max_age = self.config.get("max_file_age_hours", 24)
-            if hasattr(self, 'file_processor'):
-                self.file_processor.max_file_age_hours = new_max_age
+            self.apply_engine_config()
+            set_log_level(self.config.get("log_level", DEFAULT_LOG_LEVEL))
 
             # Update about tab display
             self.about_tab.update_auto_update_status(self.config.get("auto_update_check", True))
 
-            # Save to file
-            try:
-                # Make sure the directory exists
-                config_dir = os.path.dirname(CONFIG_FILE)
-                if config_dir and not os.path.exists(config_dir):
-                    os.makedirs(config_dir, exist_ok=True)
-
-                # Save the config file
-                with open(CONFIG_FILE, 'w') as f:
-                    json.dump(self.config, f)
-
-                # Print debug info
-                print(f"Settings saved to {CONFIG_FILE}")
-                print(f"Config contents: {self.config}")
-            except Exception as file_error:
-                print(f"Error saving config file: {str(file_error)}")
-                print(f"Error details: {traceback.format_exc()}")
-                self.statusBar().showMessage(f"Error saving settings: {str(file_error)}", 3000)
-                return
+            # Written shortly, once for a series of changes
+            self.config_store.schedule_save(self.config)
 
             # Show a brief notification in the status bar instead of a popup
             # Only show generic message if not already showing a specific message
@@ -1442,10 +1536,13 @@ class WatcherApp(QMainWindow):
         self.auto_save_settings()
 
     def apply_theme(self, theme):
+        """
+        Apply a theme to the application, the tabs and the title bar.
+
+        Runs whenever the window is shown, so only what changed is applied:
+        restoring the window with the theme it already has does nothing.
+        """
         theme = theme.lower()
-        app = QApplication.instance()
-        palette = QPalette()
-        is_dark_mode = False
 
         if theme == "system default":
             if platform.system() == "Windows":
@@ -1453,181 +1550,25 @@ class WatcherApp(QMainWindow):
             else:
                 theme = "light"
 
-        if theme == "dark":
-            is_dark_mode = True
-            app.setStyle("Fusion")
-            # Dark gray instead of pure black
-            dark_color = QColor(45, 45, 45)
-            darker_color = QColor(35, 35, 35)
-            mid_color = QColor(55, 55, 55)
-
-            palette.setColor(QPalette.Window, darker_color)
-            palette.setColor(QPalette.WindowText, Qt.white)
-            palette.setColor(QPalette.Base, dark_color)
-            palette.setColor(QPalette.AlternateBase, mid_color)
-            palette.setColor(QPalette.ToolTipBase, dark_color)
-            palette.setColor(QPalette.ToolTipText, Qt.white)
-            palette.setColor(QPalette.Text, Qt.white)
-            palette.setColor(QPalette.Button, dark_color)
-            palette.setColor(QPalette.ButtonText, Qt.white)
-            palette.setColor(QPalette.BrightText, Qt.red)
-            palette.setColor(QPalette.Highlight, QColor(42, 130, 218))
-            palette.setColor(QPalette.HighlightedText, Qt.white)
-            palette.setColor(QPalette.Link, QColor(42, 130, 218))
-        elif theme == "light":
-            is_dark_mode = False
-            app.setStyle("Fusion")
-            palette.setColor(QPalette.Window, Qt.white)
-            palette.setColor(QPalette.WindowText, Qt.black)
-            palette.setColor(QPalette.Base, Qt.white)
-            palette.setColor(QPalette.AlternateBase, QColor(240, 240, 240))
-            palette.setColor(QPalette.ToolTipBase, Qt.black)
-            palette.setColor(QPalette.ToolTipText, Qt.white)
-            palette.setColor(QPalette.Text, Qt.black)
-            palette.setColor(QPalette.Button, QColor(240, 240, 240))
-            palette.setColor(QPalette.ButtonText, Qt.black)
-            palette.setColor(QPalette.BrightText, Qt.red)
-            palette.setColor(QPalette.Highlight, QColor(42, 130, 218))
-            palette.setColor(QPalette.HighlightedText, Qt.black)
-            palette.setColor(QPalette.Link, QColor(0, 0, 255))
-
-        app.setPalette(palette)
-
-        # Apply some additional styling to improve the GUI
-        if is_dark_mode:
-            app.setStyleSheet("""
-                QTabWidget::pane {
-                    border: 1px solid #505050;
-                    border-top: 0px;
-                    border-radius: 4px;
-                }
-                QTabBar::tab {
-                    padding: 6px 12px;
-                    margin: 2px 2px 0px 2px;
-                    border-top-left-radius: 4px;
-                    border-top-right-radius: 4px;
-                    background-color: #383838;
-                    color: #e0e0e0;
-                }
-                QTabBar::tab:selected {
-                    font-weight: bold;
-                    background-color: #505050;
-                }
-                QPushButton {
-                    padding: 6px 12px;
-                    border-radius: 4px;
-                    border: 1px solid #505050;
-                    background-color: #383838;
-                    color: #e0e0e0;
-                }
-                QTableWidget {
-                    gridline-color: #3a3a3a;
-                    selection-background-color: #0078d7;
-                    background-color: #2d2d2d;
-                    color: #e0e0e0;
-                }
-                QHeaderView::section {
-                    padding: 6px;
-                    font-weight: bold;
-                    background-color: #383838;
-                    color: #e0e0e0;
-                    border: 1px solid #505050;
-                }
-                QComboBox {
-                    border: 1px solid #505050;
-                    border-radius: 4px;
-                    padding: 4px 8px;
-                    background-color: #383838;
-                    color: #e0e0e0;
-                }
-                QComboBox::drop-down {
-                    border-left: 1px solid #505050;
-                }
-                QComboBox::down-arrow {
-                    /* First try to use the white arrow image for dark mode */
-                    image: url(icons/dropdown_white.png);
-                    width: 12px;
-                    height: 12px;
-                    /* Fallback styling in case image isn't available */
-                    color: #e0e0e0;
-                }
-                QComboBox QAbstractItemView {
-                    border: 1px solid #505050;
-                    background-color: #2d2d2d;
-                    color: #e0e0e0;
-                    selection-background-color: #0078d7;
-                    selection-color: white;
-                }
-                QComboBox QAbstractItemView::item {
-                    min-height: 24px;
-                    padding: 4px;
-                    color: #e0e0e0;
-                }
-                QComboBox QAbstractItemView::item:hover {
-                    background-color: rgba(0, 120, 215, 0.4);
-                }
-                QLineEdit, QTextEdit {
-                    border: 1px solid #505050;
-                    border-radius: 4px;
-                    padding: 4px;
-                    background-color: #2d2d2d;
-                    color: #e0e0e0;
-                }
-                QCheckBox {
-                    color: #e0e0e0;
-                }
-                QLabel {
-                    color: #e0e0e0;
-                }
-                QGroupBox {
-                    border: 1px solid #505050;
-                    border-radius: 4px;
-                    margin-top: 8px;
-                    color: #e0e0e0;
-                }
-                QGroupBox::title {
-                    subcontrol-origin: margin;
-                    left: 10px;
-                    padding: 0 5px;
-                }
-            """)
-        else:
-            app.setStyleSheet("""
-                QTabWidget::pane {
-                    border: 1px solid #999;
-                    border-top: 0px;
-                    border-radius: 4px;
-                }
-                QTabBar::tab {
-                    padding: 6px 12px;
-                    margin: 2px 2px 0px 2px;
-                    border-top-left-radius: 4px;
-                    border-top-right-radius: 4px;
-                }
-                QTabBar::tab:selected {
-                    font-weight: bold;
-                }
-                QPushButton {
-                    padding: 6px 12px;
-                    border-radius: 4px;
-                    border: 1px solid #999;
-                }
-                QTableWidget {
-                    gridline-color: #ccc;
-                    selection-background-color: #0078d7;
-                }
-                QHeaderView::section {
-                    padding: 6px;
-                    font-weight: bold;
-                }
-            """)
-
-        # Update the tabs' dark mode setting
-        if hasattr(self, 'main_tab'):
-            self.main_tab.set_dark_mode(is_dark_mode)
-
-        if hasattr(self, 'settings_tab'):
-            self.settings_tab.set_dark_mode(is_dark_mode)
+        is_dark_mode = theme == "dark"
+
+        if theme != self.applied_theme:
+            app = QApplication.instance()
+            if theme in THEMES and self.applied_theme not in THEMES:
+                app.setStyle("Fusion")
+            app.setPalette(theme_palette(theme))
+
+            # Apply some additional styling to improve the GUI
+            app.setStyleSheet(APP_STYLESHEETS["dark" if is_dark_mode else "light"])
+
+            # Update the tabs' dark mode setting
+            if hasattr(self, 'main_tab'):
+                self.main_tab.set_dark_mode(is_dark_mode)
+
+            if hasattr(self, 'settings_tab'):
+                self.settings_tab.set_dark_mode(is_dark_mode)
+
+            self.applied_theme = theme
 
         # Apply theme to window title bar (Windows 10/11 only)
         if platform.system() == 'Windows':
@@ -1635,13 +1576,15 @@ class WatcherApp(QMainWindow):
                 # Get the window handle
                 hwnd = int(self.winId())
 
-                # Set the title bar theme
-                success = set_window_title_bar_theme(hwnd, is_dark_mode)
+                # Set the title bar theme, again only if the window handle changed
+                if self.title_bar_theme != (hwnd, is_dark_mode):
+                    success = set_window_title_bar_theme(hwnd, is_dark_mode)
 
-                if success:
-                    print(f"Successfully applied {'dark' if is_dark_mode else 'light'} theme to window title bar")
-                else:
-                    print("Failed to apply theme to window title bar")
+                    if success:
+                        self.title_bar_theme = (hwnd, is_dark_mode)
+                        print(f"Successfully applied {'dark' if is_dark_mode else 'light'} theme to window title bar")
+                    else:
+                        print("Failed to apply theme to window title bar")
             except Exception as e:
                 print(f"Error applying theme to window title bar: {str(e)}")
                 print(f"Error details: {traceback.format_exc()}")
@@ -1738,32 +1681,11 @@ class WatcherApp(QMainWindow):
 
         # Only start watching if setting was just enabled
         if enabled and not self.watching:
-            pairs = self.main_tab.get_watch_pairs()
+            pairs = self.engine_config.watch_pairs()
             if pairs:
                 self.watching = True
                 self.watcher_manager.update_watchers(pairs)
-                self.main_tab.toggle_btn.setText("Stop Watching")
-                self.main_tab.toggle_btn.setIcon(safe_icon("icons/stop.png") if os.path.exists(get_resource_path("icons/stop.png")) else QIcon())
-                self.main_tab.toggle_btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #f44336;
-                        color: white;
-                        font-weight: bold;
-                        font-size: 14px;
-                        border-radius: 4px;
-                        padding: 8px 16px;
-                        border: 2px solid #D32F2F;
-                        outline: none;
-                    }
-                    QPushButton:hover {
-                        background-color: #d32f2f;
-                        border: 2px solid #B71C1C;
-                    }
-                    QPushButton:pressed {
-                        background-color: #C62828;
-                        border: 2px solid #8B0000;
-                    }
-                """)
+                self.update_toggle_button()
                 self.main_tab.status.setText("Status: Watching...")
                 self.main_tab.update_status_style()
                 self.update_tray_menu()
@@ -1828,6 +1750,16 @@ class WatcherApp(QMainWindow):
             # Still try to apply theme
             self.apply_theme(self.config.get("theme", "System Default"))
 
+    def apply_engine_config(self):
+        """Give the scanner and the worker a new snapshot of the settings and watch pairs"""
+        self.engine_config = EngineConfig.from_config(self.config)
+        if hasattr(self, 'file_processor'):
+            # Replacing the reference is atomic, a running batch keeps the snapshot it took
+            self.file_processor.engine_config = self.engine_config
+            self.file_processor.rate_limiter.configure(self.config)
+        if hasattr(self, 'scan_scheduler'):
+            self.scan_scheduler.set_pairs(self.engine_config.pairs)
+
     def save_settings(self):
         # Save settings from all tabs
         self.main_tab.save_settings(self.config)
@@ -1841,52 +1773,22 @@ class WatcherApp(QMainWindow):
             # Stop the timer if auto-update is disabled
             self.update_timer.stop()
 
-        # Update worker with new max age setting if it changed
-        new_max_age = self.config.get("max_file_age_hours", 24)
-        if hasattr(self, 'file_processor'):
-            self.file_processor.max_file_age_hours = new_max_age
+        self.apply_engine_config()
+        set_log_level(self.config.get("log_level", DEFAULT_LOG_LEVEL))
 
         # Update about tab display
         self.about_tab.update_auto_update_status(self.config["auto_update_check"])
 
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(self.config, f)
-        QMessageBox.information(self, "Saved", "Settings saved successfully.")
+        if self.config_store.save_now(self.config):
+            QMessageBox.information(self, "Saved", "Settings saved successfully.")
+        else:
+            QMessageBox.warning(self, "Save Failed", f"Settings could not be written to {CONFIG_FILE}.")
 
     def load_config(self):
         """Load configuration with defaults for Windows 10/11 compatibility"""
         try:
             print(f"Loading config from: {CONFIG_FILE}")
-            if os.path.exists(CONFIG_FILE):
-                try:
-                    with open(CONFIG_FILE, 'r') as f:
-                        config_content = f.read()
-                        print(f"Config file content: {config_content}")
-                        if not config_content.strip():
-                            print("Config file is empty, using defaults")
-                            self.config = {}
-                        else:
-                            self.config = json.loads(config_content)
-                            print(f"Loaded config: {self.config}")
-                except json.JSONDecodeError as json_error:
-                    print(f"Error: Config file {CONFIG_FILE} is corrupted: {str(json_error)}")
-                    print(f"Error details: {traceback.format_exc()}")
-                    self.config = {}
-                    # Backup the corrupted file
-                    if os.path.exists(CONFIG_FILE):
-                        backup_path = CONFIG_FILE + ".bak"
-                        try:
-                            shutil.copy2(CONFIG_FILE, backup_path)
-                            print(f"Backed up corrupted config to {backup_path}")
-                        except Exception as backup_error:
-                            print(f"Error backing up config: {str(backup_error)}")
-                except Exception as read_error:
-                    print(f"Error reading config file: {str(read_error)}")
-                    print(f"Error details: {traceback.format_exc()}")
-                    self.config = {}
-            else:
-                print(f"Config file does not exist: {CONFIG_FILE}")
-                self.config = {}
+            self.config = self.config_store.load()
 
             # Set defaults for all configuration options
             self.config.setdefault("version", load_version(VERSION_FILE))
@@ -1897,16 +1799,20 @@ class WatcherApp(QMainWindow):
             self.config.setdefault("theme", "System Default")
             self.config.setdefault("start_on_launch", False)
             self.config.setdefault("verbose_logging", False)
+            # Older configs only had the verbose flag
+            self.config.setdefault("log_level", "debug" if self.config["verbose_logging"] else DEFAULT_LOG_LEVEL)
             self.config.setdefault("process_directories", True)
             self.config.setdefault("max_file_age_hours", 24)
             self.config.setdefault("auto_watch", True)
+            self.config.setdefault("dedupe_mode", DEDUPE_OFF)
+            self.config.setdefault("verify_mode", VERIFY_OFF)
+            self.config.setdefault("io_bytes_per_sec", 0)
+            self.config.setdefault("io_ops_per_sec", 0)
+            self.config.setdefault("target_io_limits", {})
+            self.config.setdefault("pair_profiles", {})
 
-            # Save config to ensure all defaults are written
-            try:
-                with open(CONFIG_FILE, 'w') as f:
-                    json.dump(self.config, f)
-            except Exception as save_error:
-                print(f"Error saving config defaults: {str(save_error)}")
+            # Write any defaults that were added, nothing if the file already had them all
+            self.config_store.schedule_save(self.config)
 
         except Exception as e:
             print(f"Error loading config: {str(e)}")
@@ -1918,135 +1824,136 @@ class WatcherApp(QMainWindow):
                 "show_notifications": True
             }
 
-    def scan_all_pairs(self):
-        """Scan all watch pairs for files to organize with improved reliability for Windows 10/11"""
-        # No need to import shutil here as it's already imported at the top
-
-        def process_pair(watch, target):
-            if not watch or not target:
-                self.logging_signal.emit("Invalid watch/target pair", None, None)
+    def scan_all_pairs(self, priority=None):
+        """Scan all watch pairs for files to organize, at priority or else each pair's own"""
+        try:
+            # One snapshot for the whole scan, the settings may change while it runs
+            config = self.engine_config
+            if not config.pairs:
+                scan_log.info("No watch pairs configured")
                 return
 
-            try:
-                # Validate directories with better error handling
-                try:
-                    if not os.path.exists(watch):
-                        self.logging_signal.emit(f"Watch directory does not exist: {watch}", None, None)
-                        return
-                    if not os.path.isdir(watch):
-                        self.logging_signal.emit(f"Watch path is not a directory: {watch}", None, None)
-                        return
-                    if not os.path.exists(target):
-                        self.logging_signal.emit(f"Target directory does not exist: {target}", None, None)
-                        return
-                    if not os.path.isdir(target):
-                        self.logging_signal.emit(f"Target path is not a directory: {target}", None, None)
-                        return
-                except Exception as path_error:
-                    self.logging_signal.emit(f"Error validating paths: {str(path_error)}", None, None)
-                    return
+            # Process each pair
+            for pair in config.pairs:
+                self.scan_pair(pair, priority)
 
-                # Set startupinfo to hide command window on Windows
-                startupinfo = None
-                if platform.system() == 'Windows':
-                    try:
-                        startupinfo = subprocess.STARTUPINFO()
-                        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                        startupinfo.wShowWindow = 0  # SW_HIDE
-                    except Exception as e:
-                        self.logging_signal.emit(f"Error setting up subprocess: {str(e)}", None, None)
+        except Exception as e:
+            scan_log.error("Error in scan_all_pairs: %s", e)
+            print(f"Error details for scan_all_pairs: {traceback.format_exc()}")
 
-                # Get all items in directory with better error handling
-                try:
-                    items = os.listdir(watch)
-                except PermissionError:
-                    self.logging_signal.emit(f"Permission denied accessing directory: {watch}", None, None)
+    def scan_pair(self, pair, priority=None):
+        """Queue the files of one watch pair that are ready to organize, with improved reliability for Windows 10/11"""
+        watch, target = pair.watch, pair.target
+        if priority is None:
+            priority = pair.priority
+        max_age_seconds = pair.max_age_seconds
+        process_directories = pair.process_directories
+        now = time.time()
+        is_waiting = self.file_processor.retry_scheduler.is_waiting
+        # Files already queued at this priority are not looked at again
+        is_pending = self.file_queue.is_pending
+
+        try:
+            # Validate directories with better error handling
+            try:
+                if not os.path.exists(watch):
+                    scan_log.warning("Watch directory does not exist: %s", watch)
                     return
-                except FileNotFoundError:
-                    self.logging_signal.emit(f"Directory disappeared during scan: {watch}", None, None)
+                if not os.path.isdir(watch):
+                    scan_log.warning("Watch path is not a directory: %s", watch)
                     return
-                except Exception as e:
-                    self.logging_signal.emit(f"Error scanning directory {watch}: {str(e)}", None, None)
+                if not os.path.exists(target):
+                    scan_log.warning("Target directory does not exist: %s", target)
+                    return
+                if not os.path.isdir(target):
+                    scan_log.warning("Target path is not a directory: %s", target)
                     return
+            except Exception as path_error:
+                scan_log.error("Error validating paths: %s", path_error)
+                return
 
-                # First do a pre-check of all files
-                valid_items = []
-                for item in items:
-                    try:
-                        src = os.path.join(watch, item)
+            # Set startupinfo to hide command window on Windows
+            startupinfo = None
+            if platform.system() == 'Windows':
+                try:
+                    startupinfo = subprocess.STARTUPINFO()
+                    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+                    startupinfo.wShowWindow = 0  # SW_HIDE
+                except Exception as e:
+                    scan_log.error("Error setting up subprocess: %s", e)
 
-                        # Skip if file doesn't exist or is system/hidden file
-                        if not os.path.exists(src) or item.startswith('.') or item.startswith('$'):
-                            continue
+            # Get all items in directory with better error handling
+            try:
+                items = os.listdir(watch)
+            except PermissionError:
+                scan_log.error("Permission denied accessing directory: %s", watch)
+                return
+            except FileNotFoundError:
+                scan_log.warning("Directory disappeared during scan: %s", watch)
+                return
+            except Exception as e:
+                scan_log.error("Error scanning directory %s: %s", watch, e)
+                return
 
-                        # Skip directories if configured to do so
-                        if os.path.isdir(src) and not self.config.get("process_directories", True):
-                            continue
+            # First do a pre-check of all files
+            valid_items = []
+            for item in items:
+                try:
+                    src = os.path.join(watch, item)
 
-                        # Do basic comma validation before queueing
-                        if ',' not in item:
-                            # Only log this at debug level to avoid spamming logs
-                            if self.config.get("verbose_logging", False):
-                                self.logging_signal.emit(f"Not processing - no comma in filename: {item}", None, None)
-                            continue
+                    # Skip if file doesn't exist or is system/hidden file
+                    if item.startswith(IGNORED_PREFIXES) or not os.path.exists(src):
+                        continue
 
-                        # Split and check parts
-                        try:
-                            prefix, remainder = item.split(',', 1)
-                            if not prefix.strip() or not remainder.strip():
-                                if self.config.get("verbose_logging", False):
-                                    self.logging_signal.emit(f"Not processing - invalid format: {item}", None, None)
-                                continue
-                        except:
-                            if self.config.get("verbose_logging", False):
-                                self.logging_signal.emit(f"Not processing - invalid split: {item}", None, None)
-                            continue
+                    # Leave files alone while they wait for a retry or in the queue
+                    if is_waiting(src) or is_pending(src, priority):
+                        continue
 
-                        # Check file age if configured
-                        try:
-                            if self.config.get("max_file_age_hours", 24) > 0:
-                                file_mtime = os.path.getmtime(src)
-                                file_age_hours = (time.time() - file_mtime) / 3600
-                                if file_age_hours > self.config.get("max_file_age_hours", 24):
-                                    continue
-                        except Exception as age_error:
-                            if self.config.get("verbose_logging", False):
-                                self.logging_signal.emit(f"Error checking file age for {item}: {str(age_error)}", None, None)
-                            continue
+                    # Skip directories if configured to do so
+                    if not process_directories and os.path.isdir(src):
+                        continue
 
-                        valid_items.append((item, src))
-                    except Exception as item_error:
-                        if self.config.get("verbose_logging", False):
-                            self.logging_signal.emit(f"Error processing item {item}: {str(item_error)}", None, None)
+                    # Do basic comma validation before queueing
+                    if ',' not in item:
+                        scan_log.debug("Not processing - no comma in filename: %s", item)
                         continue
 
-                # Then queue valid items
-                for item, src in valid_items:
+                    # Split and check parts
                     try:
-                        # Double check file still exists before queueing
-                        if os.path.exists(src):
-                            self.file_queue.put((item, src, watch, target, startupinfo))
-                    except Exception as e:
-                        self.logging_signal.emit(f"Error queueing {item}: {str(e)}", None, None)
+                        prefix, remainder = item.split(',', 1)
+                        if not prefix.strip() or not remainder.strip():
+                            scan_log.debug("Not processing - invalid format: %s", item)
+                            continue
+                    except:
+                        scan_log.debug("Not processing - invalid split: %s", item)
+                        continue
 
-            except Exception as e:
-                self.logging_signal.emit(f"Error in process_pair: {str(e)}", None, None)
-                print(f"Error details for process_pair: {traceback.format_exc()}")
+                    # Check file age if configured
+                    try:
+                        if max_age_seconds is not None:
+                            if now - os.path.getmtime(src) > max_age_seconds:
+                                continue
+                    except Exception as age_error:
+                        scan_log.debug("Error checking file age for %s: %s", item, age_error)
+                        continue
 
-        try:
-            pairs = self.main_tab.get_watch_pairs()
-            if not pairs:
-                self.logging_signal.emit("No watch pairs configured", None, None)
-                return
+                    valid_items.append((item, src))
+                except Exception as item_error:
+                    scan_log.debug("Error processing item %s: %s", item, item_error)
+                    continue
 
-            # Process each pair
-            for watch, target in pairs:
-                if watch and target:
-                    process_pair(watch, target)
+            # Then queue valid items
+            for item, src in valid_items:
+                try:
+                    # Double check file still exists before queueing
+                    if os.path.exists(src):
+                        self.file_queue.put((item, src, watch, target, startupinfo), priority)
+                except Exception as e:
+                    scan_log.error("Error queueing %s: %s", item, e)
 
         except Exception as e:
-            self.logging_signal.emit(f"Error in scan_all_pairs: {str(e)}", None, None)
-            print(f"Error details for scan_all_pairs: {traceback.format_exc()}")
+            scan_log.error("Error in scan_pair: %s", e)
+            print(f"Error details for scan_pair: {traceback.format_exc()}")
 
     def reset_settings(self):
         """Reset all settings to defaults and reload the UI"""
@@ -2067,8 +1974,8 @@ class WatcherApp(QMainWindow):
             if self.watching:
                 self.watching = False
                 self.watcher_manager.stop_all()
-                if self.timer.isActive():
-                    self.timer.stop()
+                if self.scan_scheduler.is_running():
+                    self.scan_scheduler.stop()
 
             # Reset config to defaults
             self.config = {
@@ -2080,20 +1987,23 @@ class WatcherApp(QMainWindow):
                 "theme": "System Default",
                 "start_on_launch": False,
                 "verbose_logging": False,
+                "log_level": DEFAULT_LOG_LEVEL,
                 "process_directories": True,
                 "max_file_age_hours": 24,
                 "auto_watch": True,
+                "dedupe_mode": DEDUPE_OFF,
+                "verify_mode": VERIFY_OFF,
+                "io_bytes_per_sec": 0,
+                "io_ops_per_sec": 0,
+                "target_io_limits": {},
+                "pair_profiles": {},
                 "watch_pairs": []
             }
 
             # Save the reset config
-            try:
-                with open(CONFIG_FILE, 'w') as f:
-                    json.dump(self.config, f)
+            if self.config_store.save_now(self.config):
                 print(f"Reset config saved to {CONFIG_FILE}")
-            except Exception as save_error:
-                print(f"Error saving reset config: {str(save_error)}")
-                print(f"Error details: {traceback.format_exc()}")
+            self.apply_engine_config()
 
             # Reload the UI
             # Clear the main tab
@@ -2108,8 +2018,7 @@ class WatcherApp(QMainWindow):
             self.apply_theme("System Default")
 
             # Update UI state
-            self.main_tab.toggle_btn.setText("Start Watching")
-            self.main_tab.toggle_btn.setIcon(safe_icon("icons/play.png"))
+            self.update_toggle_button()
             self.main_tab.status.setText("Status: Stopped")
             self.main_tab.update_status_style()
 
@@ -2150,6 +2059,13 @@ class WatcherApp(QMainWindow):
                 3000
             )
 
+    def on_version_file_changed(self, path):
+        """Show the new version after version.txt was edited"""
+        self.refresh_version()
+        # Editors and scripts often replace the file, which ends the watch
+        if path not in self.version_watcher.files() and os.path.exists(path):
+            self.version_watcher.addPath(path)
+
     def refresh_version(self):
         """Refresh the version display if version.txt has changed with better interrupt handling"""
         try:
@@ -2180,13 +2096,7 @@ class WatcherApp(QMainWindow):
 
             # Save config to file to persist the version change if needed
             if need_save:
-                try:
-                    with open(CONFIG_FILE, 'w') as f:
-                        json.dump(self.config, f)
-                except KeyboardInterrupt:
-                    print("Config save interrupted by user")
-                except Exception as save_error:
-                    print(f"Error saving config during version refresh: {str(save_error)}")
+                self.config_store.schedule_save(self.config)
 
         except KeyboardInterrupt:
             # Handle keyboard interrupt gracefully
@@ -2209,6 +2119,7 @@ class WatcherApp(QMainWindow):
             return
 
         try:
+            import urllib.request  # Only needed here, kept off the startup path
             with urllib.request.urlopen("https://api.github.com/repos/EyadElshaer/Auto-Organize/releases/latest") as res:
                 data = json.load(res)
                 latest_version = data["tag_name"]
@@ -2275,9 +2186,13 @@ class WatcherApp(QMainWindow):
         self.setVisible(False)  # This is more reliable than hide() for system tray apps
 
     def safe_log(self, message, src=None, dest=None):
-        """Thread-safe logging method"""
+        """Log a message right away, only call from the UI thread"""
         self.logs_tab.log(message, src, dest)
 
+    def safe_log_batch(self, records):
+        """Add a batch of (message, src, dest, fields) records from the log buffer"""
+        self.logs_tab.log_batch(records)
+
 class SingleInstanceChecker:
     """
     Ensures only one instance of the application is running.
@@ -2936,8 +2851,8 @@ class SingleInstanceChecker:
             try:
                 while self.running and self.socket:
                     try:
-                        # Accept connections with timeout
-                        self.socket.settimeout(1.0)
+                        # Accept connections, waking up now and then to check whether to stop
+                        self.socket.settimeout(IDLE_WAIT_SECONDS)
                         try:
                             client, _ = self.socket.accept()
                             # Received connection from another instance
@@ -3336,6 +3251,7 @@ if __name__ == "__main__":
             print("Using existing instance checker from force_continue flow")
 
         # Create main window and pass the instance checker
+        mark_startup("application and instance check")
         window = WatcherApp(instance_checker)
 
         # Only show the window if minimize_on_startup is False
@@ -3351,6 +3267,7 @@ if __name__ == "__main__":
                 QSystemTrayIcon.Information,
                 2000
             )
+        mark_startup("window shown")
 
         # Set up signal handler for Ctrl+C in console
         def signal_handler(sig, _):  # Use underscore for unused frame parameter
@@ -3363,10 +3280,12 @@ if __name__ == "__main__":
             signal.signal(signal.SIGINT, signal_handler)
 
             # Allow Python interpreter to catch Ctrl-C every 500ms
-            # This is needed because Qt blocks Python's signal handling
-            timer = QTimer()
-            timer.start(500)
-            timer.timeout.connect(lambda: None)  # Let the interpreter run
+            # This is needed because Qt blocks Python's signal handling. Only
+            # when started from a terminal, where Ctrl+C can be pressed
+            if sys.stdin is not None and sys.stdin.isatty():
+                timer = periodic_timer("Console Ctrl+C check")
+                timer.start(500)
+                timer.timeout.connect(lambda: None)  # Let the interpreter run
         except (ImportError, AttributeError):
             # Signal handling might not be available on all platforms
             print("Signal handling not available on this platform")